@@ -1,5 +1,7 @@
+from .cache import HTTPCache
 from .extract import FIRDSExtractor
 from .load import FIRDSLoader
+from .retry import RetryPolicy
 from .transform import FIRDSTransformer
 
 __version__ = '0.2.2'
@@ -8,4 +10,6 @@ __all__ = [
     'FIRDSExtractor',
     'FIRDSTransformer',
     'FIRDSLoader',
+    'HTTPCache',
+    'RetryPolicy',
 ]
@@ -0,0 +1,362 @@
+"""Implementation of the on-disk HTTP cache of the FIRDS files."""
+
+import hashlib
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import IO
+
+import httpx
+from pydantic import TypeAdapter, ValidationError
+
+from etl_processor.files import atomic_write_json
+from etl_processor.logger import logger
+from etl_processor.models import HTTPCacheEntry
+
+HTTP_CACHE_INDEX_ADAPTER = TypeAdapter(dict[str, HTTPCacheEntry])
+
+
+class HTTPCacheWriter:
+    """
+    Writer of a response content to the HTTP cache.
+    It hashes the content while it is written, so the cache entry is committed without a second pass over the data.
+
+    Attributes
+    ----------
+    http_cache : HTTPCache
+        The HTTP cache to commit the response content to.
+    entry : HTTPCacheEntry
+        The cache entry of the response, completed with the content digest and size on commit.
+    """
+
+    def __init__(self, http_cache: 'HTTPCache', entry: HTTPCacheEntry, tmp_file: IO[bytes]) -> None:
+        self.http_cache = http_cache
+        self.entry = entry
+
+        self._tmp_path = Path(tmp_file.name)
+        self._tmp_file = tmp_file
+        self._hash = hashlib.sha256()
+        self._size = 0
+
+    def write(self, chunk: bytes) -> None:
+        """
+        Write a chunk of the response content.
+
+        Parameters
+        ----------
+        chunk : bytes
+            The chunk of the response content.
+        """
+        self._tmp_file.write(chunk)
+        self._hash.update(chunk)
+        self._size += len(chunk)
+
+    def commit(self) -> HTTPCacheEntry:
+        """
+        Commit the response content to the HTTP cache.
+
+        Returns
+        -------
+        HTTPCacheEntry
+            The committed cache entry.
+        """
+        self._tmp_file.close()
+        self.entry.digest = self._hash.hexdigest()
+        self.entry.size = self._size
+        self.http_cache._commit(self.entry, self._tmp_path)
+        return self.entry
+
+    def abort(self) -> None:
+        """Discard the response content written so far."""
+        self._tmp_file.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+class HTTPCache:
+    """
+    On-disk cache of HTTP responses keyed by URL and checksum.
+    The response contents are addressed by their SHA-256 digest, which is verified whenever a content is read.
+    The cached responses are revalidated with the ETag and Last-Modified validators (conditional requests),
+    and the least recently used entries are evicted once the cache exceeds its maximum size.
+
+    The cache is meant to be used by a single process at a time, but by several threads of it,
+    so the contents are read and committed off the event loop of the asynchronous extraction.
+
+    Attributes
+    ----------
+    cache_dir : Path
+        The directory of the cache.
+    max_size : int
+        The maximum size in bytes of the cached contents.
+
+    Examples
+    --------
+    >>> http_cache = HTTPCache(
+    ...     cache_dir='cache',
+    ...     max_size=10 * 1024**3,
+    ... )
+    """
+
+    def __init__(self, cache_dir: str | Path, max_size: int = 10 * 1024**3) -> None:
+        """
+        Initialize the HTTP cache.
+
+        Parameters
+        ----------
+        cache_dir : str | Path
+            The directory of the cache.
+        max_size : int, optional
+            The maximum size in bytes of the cached contents, by default 10 GiB.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+
+        self.objects_dir = self.cache_dir / 'objects'
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.cache_dir / 'index.json'
+
+        self._entries = self._load_index()
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def key(url: str, checksum: str = '') -> str:
+        """
+        Return the cache key of a URL and checksum.
+
+        Parameters
+        ----------
+        url : str
+            The response URL.
+        checksum : str, optional
+            The checksum of the document published along with the URL, by default ''.
+
+        Returns
+        -------
+        str
+            The cache key.
+        """
+        return hashlib.sha256(f'{url}\n{checksum}'.encode()).hexdigest()
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _load_index(self) -> dict[str, HTTPCacheEntry]:
+        if not self.index_path.exists():
+            return {}
+
+        try:
+            return HTTP_CACHE_INDEX_ADAPTER.validate_json(self.index_path.read_bytes())
+
+        except ValidationError:
+            logger.warning(f'Invalid HTTP cache index {self.index_path}, starting an empty cache')
+            return {}
+
+    def _save_index(self) -> None:
+        atomic_write_json(self.index_path, HTTP_CACHE_INDEX_ADAPTER.dump_json(self._entries, indent=2))
+
+    @property
+    def size(self) -> int:
+        """
+        Return the size in bytes of the cached contents.
+
+        Returns
+        -------
+        int
+            The size in bytes of the cached contents.
+        """
+        with self._lock:
+            contents = {entry.digest: entry.size for entry in self._entries.values()}
+
+        return sum(contents.values())
+
+    def lookup(self, url: str, checksum: str = '') -> HTTPCacheEntry | None:
+        """
+        Look up the cache entry of a URL and checksum.
+
+        Parameters
+        ----------
+        url : str
+            The response URL.
+        checksum : str, optional
+            The checksum of the document published along with the URL, by default ''.
+
+        Returns
+        -------
+        HTTPCacheEntry | None
+            The cache entry, or None if the response is not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(self.key(url, checksum))
+            if entry is None:
+                return None
+
+            if not self._object_path(entry.digest).exists():
+                self.evict(url, checksum)
+                return None
+
+            return entry
+
+    def conditional_headers(self, entry: HTTPCacheEntry) -> dict[str, str]:
+        """
+        Return the headers of a conditional request revalidating a cache entry.
+
+        Parameters
+        ----------
+        entry : HTTPCacheEntry
+            The cache entry.
+
+        Returns
+        -------
+        dict[str, str]
+            The If-None-Match and If-Modified-Since headers of the request.
+        """
+        headers = {}
+        if entry.etag is not None:
+            headers['If-None-Match'] = entry.etag
+
+        if entry.last_modified is not None:
+            headers['If-Modified-Since'] = entry.last_modified
+
+        return headers
+
+    def read_into(self, entry: HTTPCacheEntry, f: IO[bytes], chunk_size: int = 1024**2) -> bool:
+        """
+        Copy the cached content of an entry to a file, verifying its digest on the way.
+        If the digest does not match, the entry is evicted.
+
+        Parameters
+        ----------
+        entry : HTTPCacheEntry
+            The cache entry.
+        f : IO[bytes]
+            The file to copy the cached content to.
+        chunk_size : int, optional
+            The size of the chunks copied at once, by default 1 MiB.
+
+        Returns
+        -------
+        bool
+            Whether the cached content was copied and verified.
+        """
+        content_hash = hashlib.sha256()
+        start = f.tell()
+
+        try:
+            with self._object_path(entry.digest).open('rb') as cached_file:
+                while chunk := cached_file.read(chunk_size):
+                    content_hash.update(chunk)
+                    f.write(chunk)
+
+        except FileNotFoundError:
+            content_hash = hashlib.sha256(b'missing')
+
+        if content_hash.hexdigest() != entry.digest:
+            logger.warning(f'The cached content of {entry.url} is corrupted, evicting it from the HTTP cache')
+            f.seek(start)
+            f.truncate()
+            self.evict(entry.url, entry.checksum)
+            return False
+
+        with self._lock:
+            entry.accessed_at = time.time()
+            self._save_index()
+
+        return True
+
+    def writer(self, url: str, checksum: str, response: httpx.Response) -> HTTPCacheWriter:
+        """
+        Return a writer of a response content to the cache.
+
+        Parameters
+        ----------
+        url : str
+            The response URL.
+        checksum : str
+            The checksum of the document published along with the URL.
+        response : httpx.Response
+            The response, whose ETag and Last-Modified headers are cached to revalidate the entry.
+
+        Returns
+        -------
+        HTTPCacheWriter
+            The writer of the response content.
+        """
+        entry = HTTPCacheEntry(
+            url=url,
+            checksum=checksum,
+            digest='',
+            size=0,
+            etag=response.headers.get('ETag'),
+            last_modified=response.headers.get('Last-Modified'),
+            accessed_at=time.time(),
+        )
+        # the temporary file is unique, so the concurrent downloads of the same response do not collide
+        tmp_file = NamedTemporaryFile(
+            dir=self.objects_dir,
+            prefix=f'{self.key(url, checksum)}.',
+            suffix='.tmp',
+            delete=False,
+        )
+        return HTTPCacheWriter(self, entry, tmp_file)
+
+    def _commit(self, entry: HTTPCacheEntry, tmp_path: Path) -> None:
+        with self._lock:
+            object_path = self._object_path(entry.digest)
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_path, object_path)
+
+            self._entries[self.key(entry.url, entry.checksum)] = entry
+            self._evict_least_recently_used()
+            self._save_index()
+
+    def _remove_unreferenced_object(self, digest: str) -> None:
+        # the contents are shared by the entries with the same digest
+        if all(entry.digest != digest for entry in self._entries.values()):
+            self._object_path(digest).unlink(missing_ok=True)
+
+    def _evict_least_recently_used(self) -> None:
+        # the size is computed once and decreased as the contents are removed,
+        # counting the references of the contents shared by the entries with the same digest
+        references = Counter(entry.digest for entry in self._entries.values())
+        contents = {entry.digest: entry.size for entry in self._entries.values()}
+        size = sum(contents.values())
+
+        for key, entry in sorted(self._entries.items(), key=lambda item: item[1].accessed_at):
+            if size <= self.max_size:
+                break
+
+            del self._entries[key]
+            references[entry.digest] -= 1
+            if not references[entry.digest]:
+                self._object_path(entry.digest).unlink(missing_ok=True)
+                size -= contents[entry.digest]
+
+            logger.info(f'Evicted {entry.url} from the HTTP cache')
+
+    def evict(self, url: str, checksum: str = '') -> None:
+        """
+        Evict the cache entry of a URL and checksum.
+
+        Parameters
+        ----------
+        url : str
+            The response URL.
+        checksum : str, optional
+            The checksum of the document published along with the URL, by default ''.
+        """
+        with self._lock:
+            entry = self._entries.pop(self.key(url, checksum), None)
+            if entry is None:
+                return
+
+            self._remove_unreferenced_object(entry.digest)
+            self._save_index()
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
@@ -1,23 +1,295 @@
 """Implementation of the FIRDS extractor tool."""
 
+import asyncio
 import csv
+import hashlib
+import io
+import os
+import queue
+import shutil
+import threading
+import time
 import xml.etree.ElementTree as ET
-from io import BytesIO
+from collections import deque
+from collections.abc import (
+    AsyncGenerator,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Coroutine,
+    Iterable,
+    Iterator,
+    Mapping,
+)
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import AbstractContextManager, ExitStack, aclosing, nullcontext
+from functools import partial
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import IO
+from tempfile import SpooledTemporaryFile
+from typing import IO, TYPE_CHECKING, Any, Literal, Protocol, TypeVar
 from zipfile import ZipFile
 
 import httpx
-from pydantic import ValidationError
-from tqdm import tqdm
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import ErrorDetails
+from tqdm.asyncio import tqdm
 
-from etl_processor.exceptions import NetworkError
+from etl_processor.cache import HTTPCache, HTTPCacheWriter
+from etl_processor.exceptions import ExtractionError, NetworkError
 from etl_processor.exceptions import ValidationError as ETLValidationError
+from etl_processor.files import atomic_write_json
 from etl_processor.logger import logger
-from etl_processor.models import FIRDS, FIRDSDoc
+from etl_processor.models import (
+    FIRDS,
+    FIRDSDataset,
+    FIRDSDoc,
+    FIRDSFileRows,
+    FIRDSManifest,
+    FIRDSPartition,
+    FIRDSZipMember,
+    HTTPAttempt,
+    HTTPCacheEntry,
+)
+from etl_processor.parquet import FIRDSParquetWriter, import_pyarrow
+from etl_processor.quarantine import FIRDSQuarantine, firds_error_codes
+from etl_processor.ranges import CONTENT_RANGE_PATTERN, HTTPRangeFile, open_http_range_file, open_zip_member
+from etl_processor.retry import RetryPolicy, RetryTransport
+from etl_processor.snapshot import FIRDSSnapshot
 from etl_processor.tool import Tool
+from etl_processor.transform import FIRDSTransformer, FIRDSTransformWriter
+
+if TYPE_CHECKING:
+    from collections.abc import Buffer
 
 FIRDS_NAMESPACE = '{urn:iso:std:iso:20022:tech:xsd:auth.036.001.02}'
+FIRDS_INSTRUMENT_TAG = f'{FIRDS_NAMESPACE}FinInstrm'
+FIRDS_XML_CHUNK_SIZE = 1024**2
+
+# a tree of the fully qualified tags of a financial instrument record,
+# where the leaves are the record keys of the FIRDS model fields
+FIRDSTags = dict[str, 'str | FIRDSTags']
+
+
+def _compile_firds_tags(namespace: str) -> FIRDSTags:
+    # compile the lookup table of the financial instrument record tags once from the FIRDS model fields
+    firds_tags: FIRDSTags = {}
+    for record_key, record_path in FIRDS.record_paths().items():
+        node = firds_tags
+        for tag in record_path[:-1]:
+            child = node.setdefault(f'{namespace}{tag}', {})
+            if not isinstance(child, dict):
+                raise ValueError(f'The FIRDS record tag {tag} is both a field and a group of fields.')
+
+            node = child
+
+        node[f'{namespace}{record_path[-1]}'] = record_key
+
+    return firds_tags
+
+
+FIRDS_RECORD_TAGS = _compile_firds_tags(FIRDS_NAMESPACE)
+
+
+def _collect_firds_fields(elem: ET.Element, firds_tags: FIRDSTags, firds_dict: dict[str, str | None]) -> None:
+    # the tags out of the lookup table are skipped without any string work
+    for child in elem:
+        node = firds_tags.get(child.tag)
+        if node is None:
+            continue
+
+        if isinstance(node, str):
+            firds_dict[node] = child.text
+        else:
+            _collect_firds_fields(child, node, firds_dict)
+
+
+def _response_validator(response: httpx.Response) -> str | None:
+    # the validator of a response, which resumes its content with a range request only if the content did not change
+    validator: str | None = response.headers.get('ETag') or response.headers.get('Last-Modified')
+    return validator
+
+
+# validate the financial instruments in batches of records and get their values in the csv header order
+FIRDS_BATCH_ADAPTER: TypeAdapter[list[dict[str, Any]]] = TypeAdapter(list[FIRDS.record_type()])  # type: ignore[arg-type,misc]
+FIRDS_ROW_GETTER = itemgetter(*FIRDS.record_aliases())
+
+T = TypeVar('T')
+
+
+class _RowWriter(Protocol):
+    # a writer of rows of values, such as a csv writer
+    def writerows(self, rows: Iterable[Iterable[Any]], /) -> None: ...
+
+
+class _DictRowWriter(Protocol):
+    # a writer of rows of values keyed by column, such as a csv dict writer
+    def writerow(self, row: Mapping[str, Any], /) -> Any: ...
+
+
+class _TeeWriter:
+    # a writer of the same rows to the firds csv and to the streaming transformation
+    def __init__(self, writer: Any, transform_writer: FIRDSTransformWriter) -> None:
+        self._writer = writer
+        self._transform_writer = transform_writer
+
+    def writerows(self, rows: Iterable[Iterable[Any]]) -> None:
+        rows = list(rows)
+        self._writer.writerows(rows)
+        self._transform_writer.writerows(rows)
+
+    def writerow(self, row: Mapping[str, Any]) -> None:
+        self._writer.writerow(row)
+        self._transform_writer.writerow(row)
+
+
+class _BoundedReader:
+    # a file-like reader of the next size bytes of a binary file
+    def __init__(self, f: IO[bytes], size: int) -> None:
+        self._f = f
+        self._remaining = size
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+
+        data = self._f.read(size)
+        self._remaining -= len(data)
+        return data
+
+
+class _PrefetchedReader(io.RawIOBase):
+    # a raw reader of a binary file read ahead by a worker thread through a bounded buffer of chunks.
+    # the worker stops as soon as the reader is closed, even if it is waiting for room in the buffer
+    def __init__(
+        self,
+        executor: Executor,
+        open_file: Callable[[], IO[bytes]],
+        chunk_size: int,
+        max_chunks: int,
+    ) -> None:
+        super().__init__()
+        self._chunks: queue.Queue[bytes | BaseException] = queue.Queue(maxsize=max_chunks)
+        self._stopped = threading.Event()
+        self._chunk = b''
+        self._offset = 0
+        self._eof = False
+        self._future = executor.submit(self._prefetch, open_file, chunk_size)
+
+    def _prefetch(self, open_file: Callable[[], IO[bytes]], chunk_size: int) -> None:
+        try:
+            with open_file() as f:
+                while not self._stopped.is_set():
+                    chunk = f.read(chunk_size)
+                    self._put(chunk)
+                    if not chunk:
+                        return
+
+        except BaseException as exc:
+            self._put(exc)
+
+    def _put(self, item: bytes | BaseException) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._chunks.put(item, timeout=0.1)
+                return
+
+            except queue.Full:
+                continue
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: 'Buffer') -> int:
+        if self._offset >= len(self._chunk):
+            if self._eof:
+                return 0
+
+            item = self._chunks.get()
+            if isinstance(item, BaseException):
+                raise item
+
+            if not item:
+                self._eof = True
+                return 0
+
+            self._chunk = item
+            self._offset = 0
+
+        view = memoryview(buffer).cast('B')
+        size = min(len(view), len(self._chunk) - self._offset)
+        view[:size] = self._chunk[self._offset : self._offset + size]
+        self._offset += size
+        return size
+
+    def close(self) -> None:
+        self._stopped.set()
+        super().close()
+
+
+async def _aiter(items: Iterable[T]) -> AsyncGenerator[T, None]:
+    # iterate over the items asynchronously
+    for item in items:
+        yield item
+
+
+async def _aprepend(item: T | None, iterator: AsyncIterator[T]) -> AsyncGenerator[T, None]:
+    # iterate over the item, if any, and then over the items of the iterator
+    if item is not None:
+        yield item
+
+    async for next_item in iterator:
+        yield next_item
+
+
+async def _anext_or_none(iterator: AsyncIterator[T]) -> T | None:
+    return await anext(iterator, None)
+
+
+async def _aiter_in_order(
+    coros: AsyncIterable[Coroutine[Any, Any, T]],
+    window: int,
+    discard: Callable[[T], object],
+) -> AsyncGenerator[T, None]:
+    # run the coroutines as tasks in a sliding window, but yield their results in order.
+    # the next coroutine is awaited alongside the head task, so a slow source of coroutines does not hold back the results.
+    # the results of the tasks still pending when the iteration stops early are discarded
+    pending_coros = aiter(coros)
+    tasks: deque[asyncio.Task[T]] = deque()
+    next_coro: asyncio.Task[Coroutine[Any, Any, T] | None] | None = asyncio.create_task(_anext_or_none(pending_coros))
+
+    try:
+        while tasks or next_coro is not None:
+            if next_coro is not None and len(tasks) < window:
+                await asyncio.wait([next_coro, *islice(tasks, 1)], return_when=asyncio.FIRST_COMPLETED)
+
+                if next_coro.done():
+                    coro = next_coro.result()
+                    if coro is None:
+                        next_coro = None
+                    else:
+                        tasks.append(asyncio.create_task(coro))
+                        next_coro = asyncio.create_task(_anext_or_none(pending_coros))
+
+                    continue
+
+            result = await tasks.popleft()
+            yield result
+
+    finally:
+        if next_coro is not None:
+            next_coro.cancel()
+            for pending_coro in await asyncio.gather(next_coro, return_exceptions=True):
+                if isinstance(pending_coro, Coroutine):
+                    pending_coro.close()
+
+        for task in tasks:
+            task.cancel()
+
+        for pending_result in await asyncio.gather(*tasks, return_exceptions=True):
+            if not isinstance(pending_result, BaseException):
+                discard(pending_result)
 
 
 class FIRDSExtractor(Tool):
@@ -31,6 +303,56 @@ class FIRDSExtractor(Tool):
         The URL to the FIRDS database by ESMA.
     data_dir : str | Path
         The directory to save the extracted FIRDS documents.
+    max_concurrency : int
+        The maximum number of FIRDS zip files downloaded concurrently by the asynchronous extraction.
+    spool_max_size : int
+        The maximum number of bytes of a FIRDS zip file download kept in memory before spilling it to disk.
+    max_workers : int
+        The number of worker processes parsing the FIRDS zip files. A single worker parses the files in-process.
+    batch_size : int
+        The number of financial instruments validated and written to the FIRDS CSV at once.
+    strict : bool
+        Whether to validate and write the financial instruments one by one.
+    incremental : bool
+        Whether to only fetch and parse the FIRDS reference documents that are new or changed since the last extraction.
+    http_cache : HTTPCache | None
+        The on-disk HTTP cache of the FIRDS zip files, if any.
+    ref_doc_page_size : int
+        The number of FIRDS reference documents fetched per page.
+    retry_policy : RetryPolicy
+        The retry policy of the synchronous extraction requests.
+    http2 : bool
+        Whether the synchronous extraction negotiates HTTP/2.
+    timeout : float
+        The timeout in seconds of the connections and reads of the synchronous extraction.
+    max_connections : int
+        The maximum number of pooled connections of the synchronous extraction.
+    http_attempts : list[HTTPAttempt]
+        The attempts of the requests of the last synchronous extraction, with their latencies.
+    resume : bool
+        Whether to resume the last extraction if it did not complete.
+    decompress_workers : int
+        The number of threads decompressing the XML files of a FIRDS zip file ahead of the parser.
+    decompress_buffer_size : int
+        The maximum number of decompressed bytes of an XML file buffered ahead of the parser.
+    checksum_attempts : int
+        The maximum number of downloads of a FIRDS zip file whose digest does not match its checksum.
+    snapshot : Literal['memory', 'disk'] | None
+        Where to keep the index of the latest-wins snapshot of the FIRDS CSV, if any.
+    output_format : Literal['csv', 'parquet']
+        The format of the extracted financial instruments.
+    parquet_row_group_size : int
+        The number of rows of every row group of the Parquet files.
+    partitioned : bool
+        Whether to extract every FIRDS reference document to its own partition of the FIRDS dataset.
+    range_requests : bool
+        Whether to read the FIRDS zip files with HTTP range requests instead of downloading them in full.
+    range_block_size : int
+        The minimum number of bytes of a FIRDS zip file fetched by a range request.
+    transformer : FIRDSTransformer | None
+        The transformer of the streaming transformation of the financial instruments, if any.
+    raw_csv : bool
+        Whether to write the FIRDS CSV.
 
     Examples
     --------
@@ -48,6 +370,30 @@ class FIRDSExtractor(Tool):
         self,
         firds_url: str,
         data_dir: str | Path,
+        max_concurrency: int = 4,
+        spool_max_size: int = 32 * 1024**2,
+        max_workers: int = 1,
+        batch_size: int = 10**3,
+        strict: bool = False,
+        incremental: bool = False,
+        http_cache: HTTPCache | None = None,
+        ref_doc_page_size: int = 100,
+        retry_policy: RetryPolicy | None = None,
+        http2: bool = False,
+        timeout: float = 30.0,
+        max_connections: int = 10,
+        resume: bool = True,
+        decompress_workers: int = 2,
+        decompress_buffer_size: int = 8 * 1024**2,
+        checksum_attempts: int = 3,
+        snapshot: Literal['memory', 'disk'] | None = None,
+        output_format: Literal['csv', 'parquet'] = 'csv',
+        parquet_row_group_size: int = 10**5,
+        partitioned: bool = False,
+        range_requests: bool = False,
+        range_block_size: int = 1024**2,
+        transformer: FIRDSTransformer | None = None,
+        raw_csv: bool = True,
     ) -> None:
         """
         Initialize the FIRDS extractor tool.
@@ -58,29 +404,238 @@ class FIRDSExtractor(Tool):
             The URL to the FIRDS database by ESMA.
         data_dir : str | Path
             The directory to save the extracted FIRDS documents.
+        max_concurrency : int, optional
+            The maximum number of FIRDS zip files downloaded concurrently by the asynchronous extraction, by default 4.
+        spool_max_size : int, optional
+            The maximum number of bytes of a FIRDS zip file download kept in memory before spilling it to disk, by default 32 MiB.
+            The downloads are streamed to a temporary file in the data directory, so the peak memory of the extraction is
+            bounded by spool_max_size times the number of concurrent downloads.
+        max_workers : int, optional
+            The number of worker processes parsing the FIRDS zip files, by default 1.
+            A single worker parses the files in-process. Otherwise, each worker parses a file into its own CSV shard,
+            and the shards are appended to the FIRDS CSV in the reference document order.
+        batch_size : int, optional
+            The number of financial instruments validated and written to the FIRDS CSV at once, by default 10**3.
+        strict : bool, optional
+            Whether to validate and write the financial instruments one by one, by default False.
+            The strict mode dumps every validated financial instrument to a dictionary written by a csv.DictWriter.
+            Otherwise, the financial instruments are validated in batches and written as rows of values.
+        incremental : bool, optional
+            Whether to only fetch and parse the FIRDS reference documents that are new or changed since the last extraction,
+            by default False. The extracted documents are recorded with their checksums and rows in a manifest next to
+            the FIRDS CSV. The rows of new documents are appended, while the rows of changed documents are replaced.
+        http_cache : HTTPCache | None, optional
+            The on-disk HTTP cache of the FIRDS zip files, by default None.
+            The zip files are cached by download link and checksum, and the cached files are revalidated with conditional
+            requests, so unchanged files are not downloaded again.
+        ref_doc_page_size : int, optional
+            The number of FIRDS reference documents fetched per page, by default 100. The asynchronous extraction
+            fetches the pages of the solr query concurrently, and downloads the FIRDS zip files as soon as their pages
+            arrive. The start and rows of the solr query of the firds_url bound the pages, so both
+            extractions fetch the same FIRDS reference documents.
+        retry_policy : RetryPolicy | None, optional
+            The retry policy of the synchronous extraction requests, by default an exponential backoff of 5 attempts.
+            The FIRDS zip files whose connection is lost while they are downloaded are also retried with it, resuming
+            from the bytes received with a range request.
+        http2 : bool, optional
+            Whether the synchronous extraction negotiates HTTP/2, by default False. It requires the httpx[http2] extra.
+        timeout : float, optional
+            The timeout in seconds of the connections and reads of the synchronous extraction, by default 30.
+        max_connections : int, optional
+            The maximum number of pooled connections of the synchronous extraction, by default 10.
+            A single client keeps its connections alive across the requests of an extraction.
+        resume : bool, optional
+            Whether to resume the last extraction if it did not complete, by default True.
+            Every FIRDS reference document is checkpointed in the manifest once its rows are appended to the FIRDS CSV,
+            so a restarted extraction skips the documents extracted before and discards any rows left uncommitted.
+        decompress_workers : int, optional
+            The number of threads decompressing the XML files of a FIRDS zip file ahead of the parser, by default 2.
+            Every XML file of a FIRDS zip file is parsed, in the order of the zip file.
+        decompress_buffer_size : int, optional
+            The maximum number of decompressed bytes of an XML file buffered ahead of the parser, by default 8 MiB.
+        checksum_attempts : int, optional
+            The maximum number of downloads of a FIRDS zip file whose MD5 digest does not match the checksum of its
+            FIRDS reference document, by default 3. The digest is computed while the file is streamed, before parsing.
+        snapshot : Literal['memory', 'disk'] | None, optional
+            Where to keep the index of the latest-wins snapshot of the FIRDS CSV, by default None.
+            Every DLTINS file is a delta, so the FIRDS CSV holds a row per file recording a financial instrument.
+            The snapshot keeps the latest row of every financial instrument by publication date of its FIRDS reference
+            document, and writes one current row per financial instrument to the snapshot CSV after the extraction.
+            Without a snapshot, no snapshot CSV is written.
+        output_format : Literal['csv', 'parquet'], optional
+            The format of the extracted financial instruments, by default 'csv'.
+            The parquet format writes every XML file of the FIRDS zip files to a Parquet file of the firds_parquet
+            dataset, typed by the schema of the FIRDS model and dictionary encoding the low-cardinality columns.
+            It requires pyarrow, and the FIRDS CSV only keeps its header, while the manifest records the format, so
+            the transformation reads the Parquet dataset instead. It does not support the snapshot.
+        parquet_row_group_size : int, optional
+            The number of rows of every row group of the Parquet files, by default 10**5.
+        partitioned : bool, optional
+            Whether to extract every FIRDS reference document to its own partition of the FIRDS dataset, by default False.
+            The partitions are hive-style directories of the firds dataset keyed by the publication date and the file name
+            of the documents (e.g. firds/publication_date=2021-01-17/file_name=DLTINS_20210117_01of01), listed with their
+            checksums and rows in the dataset manifest firds/_manifest.json. A partition is written to a staging directory
+            and moved in place once complete, so partitions are replaced independently instead of rewriting the FIRDS CSV.
+            It does not support the snapshot.
+        range_requests : bool, optional
+            Whether to read the FIRDS zip files with HTTP range requests instead of downloading them in full,
+            by default False. The central directory of a FIRDS zip file is read from its tail, fetched along with its
+            size by a single range request, and only its XML files are fetched, each through its own range requests by
+            the decompression workers. The FIRDS zip files are parsed in-process and bypass the HTTP cache, and their
+            checksums are not verified, while the CRC-32 of every XML file is. The FIRDS zip files whose servers do not
+            support range requests are downloaded in full.
+        range_block_size : int, optional
+            The minimum number of bytes of a FIRDS zip file fetched by a range request, by default 1 MiB.
+        transformer : FIRDSTransformer | None, optional
+            The transformer of the streaming transformation of the financial instruments, by default None.
+            The validated batches of financial instruments are transformed in memory by the chunks and the pipeline of
+            the transformer, and written to its transformed FIRDS data, so the FIRDS CSV is neither written nor parsed
+            back by the transformation. The transformed file is only moved in place once the extraction completes.
+            It requires a single worker and the csv output format, and it does not support the partitioned and
+            incremental modes. The streaming extraction always starts over, so it is not resumed.
+        raw_csv : bool, optional
+            Whether to write the FIRDS CSV, by default True. Only the streaming transformation can skip it,
+            in which case neither the FIRDS CSV nor its manifest are written, and the snapshot is not supported.
         """
+        if max_concurrency < 1:
+            raise ValueError('The maximum concurrency must be at least 1.')
+
+        if max_workers < 1:
+            raise ValueError('The maximum number of workers must be at least 1.')
+
+        if batch_size < 1:
+            raise ValueError('The batch size must be at least 1.')
+
+        if decompress_workers < 1:
+            raise ValueError('The number of decompression workers must be at least 1.')
+
+        if checksum_attempts < 1:
+            raise ValueError('The number of checksum attempts must be at least 1.')
+
+        if ref_doc_page_size < 1:
+            raise ValueError('The reference document page size must be at least 1.')
+
+        if snapshot not in (None, 'memory', 'disk'):
+            raise ValueError("The snapshot must be either 'memory' or 'disk'.")
+
+        if output_format not in ('csv', 'parquet'):
+            raise ValueError("The output format must be either 'csv' or 'parquet'.")
+
+        if output_format == 'parquet' and snapshot is not None:
+            raise ValueError('The snapshot is only supported by the csv output format.')
+
+        if partitioned and snapshot is not None:
+            raise ValueError('The snapshot is not supported by the partitioned output.')
+
+        if parquet_row_group_size < 1:
+            raise ValueError('The Parquet row group size must be at least 1.')
+
+        if range_block_size < 1:
+            raise ValueError('The range block size must be at least 1.')
+
+        if range_requests and max_workers > 1:
+            raise ValueError('The range requests are only supported by a single worker.')
+
+        if transformer is None and not raw_csv:
+            raise ValueError('The FIRDS CSV can only be skipped by the streaming transformation.')
+
+        if transformer is not None:
+            if max_workers > 1:
+                raise ValueError('The streaming transformation is only supported by a single worker.')
+
+            if output_format != 'csv':
+                raise ValueError('The streaming transformation is only supported by the csv output format.')
+
+            if partitioned or transformer.partitioned:
+                raise ValueError('The streaming transformation is not supported by the partitioned output.')
+
+            if incremental:
+                raise ValueError('The streaming transformation is not supported by the incremental extraction.')
+
+        if snapshot is not None and not raw_csv:
+            raise ValueError('The snapshot is only supported with the FIRDS CSV.')
+
+        if output_format == 'parquet':
+            # fail early if the optional dependency is missing
+            import_pyarrow()
+
         self.firds_url = firds_url
+        self.max_concurrency = max_concurrency
+        self.spool_max_size = spool_max_size
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.strict = strict
+        self.incremental = incremental
+        self.http_cache = http_cache
+        self.ref_doc_page_size = ref_doc_page_size
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.http2 = http2
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.resume = resume
+        self.decompress_workers = decompress_workers
+        self.decompress_buffer_size = decompress_buffer_size
+        self.checksum_attempts = checksum_attempts
+        self.snapshot = snapshot
+        self.output_format = output_format
+        self.parquet_row_group_size = parquet_row_group_size
+        self.partitioned = partitioned
+        self.range_requests = range_requests
+        self.range_block_size = range_block_size
+        self.transformer = transformer
+        self.raw_csv = raw_csv
+        self.http_attempts: list[HTTPAttempt] = []
 
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
         self.firds_csv_path = self.data_dir / 'firds.csv'
+        self.firds_shards_dir = self.data_dir / 'firds_shards'
+        self.firds_manifest_path = self.data_dir / 'firds_manifest.json'
+        self.firds_quarantine_path = self.data_dir / 'firds_quarantine.jsonl'
+        self.firds_parquet_dir = self.data_dir / 'firds_parquet'
+        self.firds_dataset_dir = self.data_dir / 'firds'
+        self.firds_dataset_path = self.firds_dataset_dir / '_manifest.json'
+        self.firds_staging_dir = self.firds_dataset_dir / '_staging'
+        self.firds_snapshot_path = self.data_dir / 'firds_snapshot.csv'
+        self.firds_snapshot_index_path = self.data_dir / 'firds_snapshot.sqlite'
 
-    def _fetch_and_parse_firds_ref_doc(self) -> list[FIRDSDoc]:
-        # get the firds reference doc from the firds_url
-        try:
-            logger.info(f'Fetching the FIRDS reference document from {self.firds_url}')
+        # the manifests of the FIRDS CSV and the FIRDS dataset are only maintained while running the extraction
+        self._firds_manifest: FIRDSManifest | None = None
+        self._firds_dataset: FIRDSDataset | None = None
+        self._firds_transform_writer: FIRDSTransformWriter | None = None
 
-            firds_ref_doc_response = httpx.get(self.firds_url)
-            firds_ref_doc_response.raise_for_status()
+    def __getstate__(self) -> dict[str, Any]:
+        # the worker processes only parse the files, so they need neither the http cache nor the state of the extraction
+        state = self.__dict__.copy()
+        state['http_cache'] = None
+        state['_firds_manifest'] = None
+        state['_firds_dataset'] = None
+        state['_firds_transform_writer'] = None
+        state['http_attempts'] = []
+        return state
 
-        except httpx.HTTPError as exc:
-            logger.error(f'Error fetching the FIRDS reference document from {self.firds_url}')
-            logger.error(str(exc))
-            raise NetworkError('Error fetching the FIRDS reference document.') from exc
+    def _range_client(self) -> AbstractContextManager[httpx.Client | None]:
+        # the client of the range requests of the asynchronous extraction, if any
+        if not self.range_requests:
+            return nullcontext()
+
+        return self._http_client()
+
+    def _http_client(self) -> httpx.Client:
+        # a single client pools the connections of the extraction and retries the failed requests
+        transport = httpx.HTTPTransport(
+            http2=self.http2,
+            limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+        )
+        return httpx.Client(
+            transport=RetryTransport(transport, self.retry_policy, attempts=self.http_attempts),
+            timeout=self.timeout,
+        )
 
-        # iterate over the list of docs to get the firds zip
-        firds_ref_doc_content = firds_ref_doc_response.text.encode('utf-8')
+    def _parse_firds_ref_doc_page(self, firds_ref_doc_content: bytes) -> tuple[int | None, list[FIRDSDoc]]:
+        # iterate over the list of docs to get the firds zip.
+        # the response bytes are parsed as they are, and the number of documents found is read from the solr result
         firds_ref_doc_tree = ET.fromstring(firds_ref_doc_content)
         firds_ref_docs = []
         for ref_doc_element in firds_ref_doc_tree.iter('doc'):
@@ -99,105 +654,1281 @@ class FIRDSExtractor(Tool):
 
             firds_ref_docs.append(ref_doc)
 
+        firds_ref_doc_result = next(firds_ref_doc_tree.iter('result'), None)
+        if firds_ref_doc_result is None or 'numFound' not in firds_ref_doc_result.attrib:
+            return None, firds_ref_docs
+
+        return int(firds_ref_doc_result.attrib['numFound']), firds_ref_docs
+
+    def _fetch_firds_ref_doc_page(
+        self,
+        client: httpx.Client,
+        start: int,
+        rows: int,
+    ) -> tuple[int | None, list[FIRDSDoc]]:
+        # get a page of the firds reference doc, overriding the start and rows of the solr query.
+        # the params are merged into the query of the firds_url, keeping its filters
+        try:
+            logger.info(f'Fetching the FIRDS reference documents from {start} at {self.firds_url}')
+
+            firds_ref_doc_url = httpx.URL(self.firds_url).copy_merge_params({'start': start, 'rows': rows})
+            firds_ref_doc_response = client.get(firds_ref_doc_url)
+            firds_ref_doc_response.raise_for_status()
+
+        except httpx.HTTPError as exc:
+            logger.error(f'Error fetching the FIRDS reference documents from {start} at {self.firds_url}')
+            logger.error(str(exc))
+            raise NetworkError('Error fetching the FIRDS reference document.') from exc
+
+        return self._parse_firds_ref_doc_page(firds_ref_doc_response.content)
+
+    def _fetch_and_parse_firds_ref_doc(self, client: httpx.Client) -> list[FIRDSDoc]:
+        # the first page tells the number of documents found, so the remaining pages are fetched in order
+        start, end = self._firds_ref_doc_bounds()
+        num_found, firds_ref_docs = self._fetch_firds_ref_doc_page(client, start, self._firds_ref_doc_rows(start, end))
+        if num_found is None:
+            num_found = start + len(firds_ref_docs)
+
+        end = num_found if end is None else min(end, num_found)
+        for page_start in range(start + self.ref_doc_page_size, end, self.ref_doc_page_size):
+            _, page_firds_ref_docs = self._fetch_firds_ref_doc_page(
+                client,
+                page_start,
+                self._firds_ref_doc_rows(page_start, end),
+            )
+            firds_ref_docs.extend(page_firds_ref_docs)
+
         logger.info(f'Fetched {len(firds_ref_docs)} FIRDS reference documents from {self.firds_url}')
         return firds_ref_docs
 
-    def _parse_firds_xml_file(self, firds_xml: IO[bytes]) -> None:
-        with self.firds_csv_path.open('a', newline='', encoding='utf-8') as f:
-            fieldnames = FIRDS.csv_header()
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-
-            # iterate over the xml file to get the financial instruments
-            firds_zip_iterable = ET.iterparse(firds_xml, ('end',))
-            for _, elem in firds_zip_iterable:
-                # find the financial instrument tag
-                elem_tag = elem.tag.replace(FIRDS_NAMESPACE, '')
-                if 'FinInstrm' != elem_tag:
-                    continue
+    def _firds_ref_doc_bounds(self) -> tuple[int, int | None]:
+        # the start and rows of the solr query of the firds_url, if any, bound the pages of the firds reference docs
+        # fetched by both extractions
+        params = httpx.URL(self.firds_url).params
+        start = int(params.get('start', 0))
+        rows = params.get('rows')
+        return start, None if rows is None else start + int(rows)
 
-                # parse the financial instrument attributes
-                firds_dict = {}
-                for attr in elem[0][0].findall('./'):
-                    attr_tag = attr.tag.replace(FIRDS_NAMESPACE, '')
-                    firds_dict[attr_tag] = attr.text
+    def _firds_ref_doc_rows(self, page_start: int, end: int | None) -> int:
+        # the rows of a page of the firds reference docs, up to the end of the bounds
+        if end is None:
+            return self.ref_doc_page_size
 
-                # parse the financial instrument issuer
-                firds_dict['Issr'] = elem[0][1].text
+        return max(0, min(self.ref_doc_page_size, end - page_start))
 
-                # validate the financial instrument
-                try:
-                    firds = FIRDS.model_validate(firds_dict)
+    async def _afetch_firds_ref_doc_page(
+        self,
+        client: httpx.AsyncClient,
+        start: int,
+        rows: int,
+    ) -> tuple[int | None, list[FIRDSDoc]]:
+        # get a page of the firds reference doc, overriding the start and rows of the solr query.
+        # the params are merged into the query of the firds_url, keeping its filters
+        try:
+            logger.info(f'Fetching the FIRDS reference documents from {start} at {self.firds_url}')
 
-                except ValidationError as exc:
-                    # log the error and continue
-                    logger.error(f'Error validating the FIRDS document: {firds_dict}')
-                    logger.error(str(exc))
-                    continue
+            firds_ref_doc_url = httpx.URL(self.firds_url).copy_merge_params({'start': start, 'rows': rows})
+            firds_ref_doc_response = await client.get(firds_ref_doc_url)
+            firds_ref_doc_response.raise_for_status()
+
+        except httpx.HTTPError as exc:
+            logger.error(f'Error fetching the FIRDS reference documents from {start} at {self.firds_url}')
+            logger.error(str(exc))
+            raise NetworkError('Error fetching the FIRDS reference document.') from exc
 
-                firds_validated_dict = firds.model_dump(by_alias=True)
-                writer.writerow(firds_validated_dict)
+        return self._parse_firds_ref_doc_page(firds_ref_doc_response.content)
 
-        return
+    async def _afetch_and_parse_firds_ref_docs(self, client: httpx.AsyncClient) -> AsyncGenerator[FIRDSDoc, None]:
+        # the first page tells the number of documents found, so the remaining pages are fetched concurrently.
+        # the documents are yielded as their pages arrive, but in the reference document order
+        start, end = self._firds_ref_doc_bounds()
+        num_found, firds_ref_docs = await self._afetch_firds_ref_doc_page(
+            client,
+            start,
+            self._firds_ref_doc_rows(start, end),
+        )
+        for firds_ref_doc in firds_ref_docs:
+            yield firds_ref_doc
+
+        if num_found is None:
+            num_found = start + len(firds_ref_docs)
+
+        end = num_found if end is None else min(end, num_found)
+        firds_ref_doc_pages = _aiter_in_order(
+            _aiter(
+                self._afetch_firds_ref_doc_page(client, page_start, self._firds_ref_doc_rows(page_start, end))
+                for page_start in range(start + self.ref_doc_page_size, end, self.ref_doc_page_size)
+            ),
+            window=self.max_concurrency,
+            discard=lambda firds_ref_doc_page: None,
+        )
+        async with aclosing(firds_ref_doc_pages):
+            async for _, firds_ref_docs in firds_ref_doc_pages:
+                for firds_ref_doc in firds_ref_docs:
+                    yield firds_ref_doc
+
+        logger.info(f'Fetched {max(0, end - start)} FIRDS reference documents from {self.firds_url}')
+
+    def _iter_firds_dicts(self, firds_xml: IO[bytes]) -> Iterator[dict[str, str | None]]:
+        # iterate over the xml file to get the financial instruments.
+        # the open elements are tracked in a stack, so that every parsed financial instrument is detached from its parent.
+        # otherwise, the whole xml tree would accumulate in memory while the file is read
+        open_elems: list[ET.Element] = []
+        firds_zip_iterable = ET.iterparse(firds_xml, ('start', 'end'))
+        for event, elem in firds_zip_iterable:
+            if event == 'start':
+                open_elems.append(elem)
+                continue
+
+            open_elems.pop()
+
+            # find the financial instrument tag
+            if elem.tag != FIRDS_INSTRUMENT_TAG:
+                continue
+
+            # parse the financial instrument record (e.g. new, modified or terminated record) fields
+            firds_dict: dict[str, str | None] = {}
+            for firds_record in elem:
+                _collect_firds_fields(firds_record, FIRDS_RECORD_TAGS, firds_dict)
+
+            # free the financial instrument subtree
+            open_elems[-1].remove(elem)
+
+            yield firds_dict
+
+    def _write_firds_dicts_strict(
+        self,
+        firds_dicts: Iterator[dict[str, str | None]],
+        writer: _DictRowWriter,
+        quarantine: FIRDSQuarantine,
+    ) -> int:
+        row_count = 0
+
+        for firds_dict in firds_dicts:
+            # validate the financial instrument
+            try:
+                firds = FIRDS.model_validate(firds_dict)
+
+            except ValidationError as exc:
+                # quarantine the financial instrument and continue
+                quarantine.reject(firds_dict, firds_error_codes(exc.errors(include_url=False, include_input=False)))
+                continue
+
+            firds_validated_dict = firds.model_dump(by_alias=True)
+            writer.writerow(firds_validated_dict)
+            row_count += 1
+
+        return row_count
+
+    def _validate_firds_batch(
+        self,
+        firds_dicts: list[dict[str, str | None]],
+        quarantine: FIRDSQuarantine,
+    ) -> list[dict[str, Any]]:
+        try:
+            return FIRDS_BATCH_ADAPTER.validate_python(firds_dicts)
+
+        except ValidationError as exc:
+            errors = exc.errors(include_url=False, include_input=False)
+
+        # quarantine the invalid financial instruments with their errors located by record key,
+        # and validate the remaining ones
+        firds_dicts_errors: dict[int, list[ErrorDetails]] = {}
+        for error in errors:
+            firds_dicts_errors.setdefault(int(error['loc'][0]), []).append(error | {'loc': error['loc'][1:]})
+
+        for index, firds_dict_errors in sorted(firds_dicts_errors.items()):
+            quarantine.reject(firds_dicts[index], firds_error_codes(firds_dict_errors))
+
+        invalid_indexes = firds_dicts_errors.keys()
+
+        valid_firds_dicts = [firds_dict for index, firds_dict in enumerate(firds_dicts) if index not in invalid_indexes]
+        return FIRDS_BATCH_ADAPTER.validate_python(valid_firds_dicts)
+
+    def _write_firds_dicts(
+        self,
+        firds_dicts: Iterator[dict[str, str | None]],
+        writer: _RowWriter,
+        quarantine: FIRDSQuarantine,
+    ) -> int:
+        row_count = 0
+
+        while firds_dicts_batch := list(islice(firds_dicts, self.batch_size)):
+            firds_batch = self._validate_firds_batch(firds_dicts_batch, quarantine)
+            writer.writerows(FIRDS_ROW_GETTER(firds) for firds in firds_batch)
+            row_count += len(firds_batch)
+
+        return row_count
+
+    def _firds_parquet_path(self, firds_xml_name: str, firds_csv_path: Path) -> Path:
+        # the parquet file of an xml file is named after it, in the parquet dataset or in the partition of its document
+        firds_parquet_dir = firds_csv_path.parent if self.partitioned else self.firds_parquet_dir
+        return firds_parquet_dir / f'{Path(firds_xml_name).stem or "firds"}.parquet'
+
+    def _firds_parquet_writer(self, firds_xml_name: str, firds_csv_path: Path) -> FIRDSParquetWriter:
+        firds_parquet_path = self._firds_parquet_path(firds_xml_name, firds_csv_path)
+        return FIRDSParquetWriter(firds_parquet_path, row_group_size=self.parquet_row_group_size)
+
+    def _firds_parquet_files(self, firds_zip_file: IO[bytes] | HTTPRangeFile, firds_csv_path: Path) -> list[str]:
+        # the parquet files written by the xml files of the zip file to the parquet dataset, recorded in the manifest
+        # so they are removed along with the rows of a changed file, whose xml files may be renamed.
+        # the partitions are replaced as a whole, so the parquet files of their documents are not recorded
+        if self.output_format != 'parquet' or self.partitioned:
+            return []
+
+        with ZipFile(firds_zip_file, 'r') as firds_zip:
+            return [
+                self._firds_parquet_path(firds_file_path, firds_csv_path).name
+                for firds_file_path in firds_zip.namelist()
+                if firds_file_path.endswith('.xml')
+            ]
+
+    def _firds_quarantine_path(self, firds_csv_path: Path) -> Path:
+        # the invalid records of a csv shard are quarantined next to the shard, until the shard is committed
+        if firds_csv_path == self.firds_csv_path:
+            return self.firds_quarantine_path
+
+        if self.partitioned:
+            return firds_csv_path.with_name(self.firds_quarantine_path.name)
+
+        return firds_csv_path.with_suffix('.jsonl')
+
+    def _parse_firds_xml_file(
+        self,
+        firds_xml: IO[bytes],
+        firds_csv_path: Path | None = None,
+        firds_xml_name: str = '',
+    ) -> int:
+        if firds_csv_path is None:
+            firds_csv_path = self.firds_csv_path
+
+        quarantine = FIRDSQuarantine(self._firds_quarantine_path(firds_csv_path), source=firds_xml_name)
+        firds_dicts = self._iter_firds_dicts(firds_xml)
+
+        if self.output_format == 'parquet':
+            # every xml file is written to its own parquet file of the parquet dataset,
+            # so the worker processes write their parquet files in place, without csv shards
+            with self._firds_parquet_writer(firds_xml_name, firds_csv_path) as writer, quarantine:
+                if self.strict:
+                    return self._write_firds_dicts_strict(firds_dicts, writer, quarantine)
+
+                return self._write_firds_dicts(firds_dicts, writer, quarantine)
+
+        transform_writer = self._firds_transform_writer
+        if transform_writer is not None and not self.raw_csv:
+            # the validated financial instruments are only written to the streaming transformation
+            with quarantine:
+                if self.strict:
+                    return self._write_firds_dicts_strict(firds_dicts, transform_writer, quarantine)
+
+                return self._write_firds_dicts(firds_dicts, transform_writer, quarantine)
+
+        with firds_csv_path.open('a', newline='', encoding='utf-8') as f, quarantine:
+            if self.strict:
+                dict_writer: _DictRowWriter = csv.DictWriter(f, fieldnames=FIRDS.csv_header())
+                if transform_writer is not None:
+                    dict_writer = _TeeWriter(dict_writer, transform_writer)
+
+                return self._write_firds_dicts_strict(firds_dicts, dict_writer, quarantine)
+
+            row_writer: _RowWriter = csv.writer(f)
+            if transform_writer is not None:
+                row_writer = _TeeWriter(row_writer, transform_writer)
+
+            return self._write_firds_dicts(firds_dicts, row_writer, quarantine)
+
+    def _parse_firds_zip_file(
+        self,
+        firds_zip_file: IO[bytes] | HTTPRangeFile,
+        firds_csv_path: Path | None = None,
+    ) -> int:
+        # note that the zip file itself is light but the xml files inside it can be heavy.
+        # every xml file is decompressed by a worker thread ahead of the parser through a bounded buffer,
+        # while the xml files are parsed in the zip order. zlib releases the gil, so the inflate overlaps the parser
+        max_chunks = max(1, self.decompress_buffer_size // FIRDS_XML_CHUNK_SIZE)
+        row_count = 0
+
+        with (
+            ZipFile(firds_zip_file, 'r') as firds_zip,
+            ThreadPoolExecutor(max_workers=self.decompress_workers) as executor,
+        ):
+            # the xml files of a remote zip file are fetched through their own range requests, so they are fetched in parallel
+            open_firds_xml: Callable[[str], IO[bytes]]
+            if isinstance(firds_zip_file, HTTPRangeFile):
+                open_firds_xml = partial(open_zip_member, firds_zip_file)
+            else:
+                open_firds_xml = firds_zip.open
+
+            # find the xml files in the zip
+            firds_file_paths = (
+                firds_file_path for firds_file_path in firds_zip.namelist() if firds_file_path.endswith('.xml')
+            )
+            firds_xmls: deque[tuple[str, _PrefetchedReader]] = deque()
+            try:
+                while True:
+                    # open the next xml files without extracting them, decompressing up to decompress_workers at once
+                    while len(firds_xmls) < self.decompress_workers:
+                        firds_file_path = next(firds_file_paths, None)
+                        if firds_file_path is None:
+                            break
+
+                        firds_xml_reader = _PrefetchedReader(
+                            executor,
+                            partial(open_firds_xml, firds_file_path),
+                            chunk_size=FIRDS_XML_CHUNK_SIZE,
+                            max_chunks=max_chunks,
+                        )
+                        firds_xmls.append((firds_file_path, firds_xml_reader))
+
+                    if not firds_xmls:
+                        break
+
+                    firds_xml_name, firds_xml_reader = firds_xmls.popleft()
+                    with io.BufferedReader(firds_xml_reader) as firds_xml:
+                        row_count += self._parse_firds_xml_file(
+                            firds_xml=firds_xml,
+                            firds_csv_path=firds_csv_path,
+                            firds_xml_name=firds_xml_name,
+                        )
+
+            finally:
+                # stop the workers decompressing the xml files left unparsed
+                for _, firds_xml_reader in firds_xmls:
+                    firds_xml_reader.close()
+
+        return row_count
+
+    def _firds_shard_paths(self, index: int, firds_ref_doc: FIRDSDoc) -> tuple[Path, Path]:
+        # the zip file and the csv shard of the index-th firds reference document.
+        # the partitions are written in place by the workers, so the csv shard is the csv of the staged partition
+        firds_shard_path = self.firds_shards_dir / f'{index:05d}.csv'
+        if self.partitioned:
+            return firds_shard_path.with_suffix('.zip'), self._stage_firds_partition(firds_ref_doc)
+
+        return firds_shard_path.with_suffix('.zip'), firds_shard_path
+
+    def _parse_firds_ref_doc_file(
+        self,
+        firds_ref_doc: FIRDSDoc,
+        firds_zip_file: IO[bytes] | HTTPRangeFile,
+    ) -> tuple[int, list[str]]:
+        # parse the firds zip file into the firds csv, or into the staged partition of its firds reference document
+        if not self.partitioned:
+            row_count = self._parse_firds_zip_file(firds_zip_file)
+            return row_count, self._firds_parquet_files(firds_zip_file, self.firds_csv_path)
+
+        firds_csv_path = self._stage_firds_partition(firds_ref_doc)
+        return self._parse_firds_zip_file(firds_zip_file, firds_csv_path=firds_csv_path), []
+
+    def _parse_firds_zip_shard(self, firds_zip_path: Path, firds_shard_path: Path) -> tuple[Path, int, list[str]]:
+        # it runs in a worker process, so it parses the zip file on disk into its own csv shard
+        with firds_zip_path.open('rb') as firds_zip_file:
+            row_count = self._parse_firds_zip_file(firds_zip_file, firds_csv_path=firds_shard_path)
+            parquet_files = self._firds_parquet_files(firds_zip_file, firds_shard_path)
+
+        firds_zip_path.unlink()
+        return firds_shard_path, row_count, parquet_files
+
+    def _commit_firds_shard(
+        self,
+        firds_ref_doc: FIRDSDoc,
+        firds_shard_path: Path,
+        row_count: int,
+        parquet_files: list[str],
+    ) -> None:
+        if self.partitioned:
+            return self._commit_firds_file(firds_ref_doc, row_count)
+
+        # append the csv shard to the firds csv file
+        self._start_firds_file(firds_ref_doc)
+        if firds_shard_path.exists():
+            with self.firds_csv_path.open('ab') as f, firds_shard_path.open('rb') as firds_shard:
+                shutil.copyfileobj(firds_shard, f)
+
+            firds_shard_path.unlink()
+
+        # append the quarantined records of the csv shard to the quarantine file
+        firds_shard_quarantine_path = self._firds_quarantine_path(firds_shard_path)
+        if firds_shard_quarantine_path.exists():
+            with self.firds_quarantine_path.open('ab') as f, firds_shard_quarantine_path.open('rb') as firds_shard:
+                shutil.copyfileobj(firds_shard, f)
+
+            firds_shard_quarantine_path.unlink()
+
+        return self._commit_firds_file(firds_ref_doc, row_count, parquet_files)
+
+    def _save_firds_manifest(self, firds_manifest: FIRDSManifest) -> None:
+        atomic_write_json(self.firds_manifest_path, firds_manifest)
+
+    def _load_firds_manifest(self) -> FIRDSManifest | None:
+        if not self.firds_manifest_path.exists() or not self.firds_csv_path.exists():
+            return None
+
+        try:
+            firds_manifest = FIRDSManifest.model_validate_json(self.firds_manifest_path.read_bytes())
+
+        except ValidationError:
+            logger.warning(f'Invalid FIRDS manifest {self.firds_manifest_path}, extracting all FIRDS files')
+            return None
 
-    def _parse_firds_zip_file(self, firds_zip_content: bytes) -> None:
-        # zip files are light, so we can read them in memory
-        # otherwise, we should stream the zip file in chunks and save it to disk to avoid memory issues.
-        # note that the zip file itself is light but the xml files inside it can be heavy
+        if firds_manifest.columns != FIRDS.csv_header():
+            logger.warning('The FIRDS CSV header changed since the last extraction, extracting all FIRDS files')
+            return None
 
-        firds_zip_io = BytesIO(firds_zip_content)
-        with ZipFile(firds_zip_io, 'r') as firds_zip:
-            # find the xml file in the zip
-            for firds_file_path in firds_zip.namelist():
-                if not firds_file_path.endswith('.xml'):
+        if firds_manifest.format != self.output_format:
+            logger.warning('The output format changed since the last extraction, extracting all FIRDS files')
+            return None
+
+        # the files of another query may no longer be listed, so they are not kept along with the files of this one
+        if firds_manifest.firds_url != self.firds_url:
+            logger.warning('The FIRDS URL changed since the last extraction, extracting all FIRDS files')
+            return None
+
+        firds_csv_size = self.firds_csv_path.stat().st_size
+        if firds_csv_size < firds_manifest.byte_end:
+            logger.warning(
+                f'The FIRDS CSV {self.firds_csv_path} does not match its manifest, extracting all FIRDS files'
+            )
+            return None
+
+        if firds_csv_size > firds_manifest.byte_end:
+            # the rows appended after the last checkpoint were never committed
+            logger.warning(f'Discarding {firds_csv_size - firds_manifest.byte_end} uncommitted bytes of the FIRDS CSV')
+            os.truncate(self.firds_csv_path, firds_manifest.byte_end)
+
+        return firds_manifest
+
+    def _remove_firds_files(self, firds_manifest: FIRDSManifest) -> FIRDSManifest:
+        # rewrite the firds csv once without the rows of the changed files, which are superseded by the rows
+        # appended later for the same file name, copying the byte ranges of the remaining files
+        superseded = {
+            index
+            for index, firds_file in enumerate(firds_manifest.files)
+            if any(later.file_name == firds_file.file_name for later in firds_manifest.files[index + 1 :])
+        }
+        if not superseded:
+            return firds_manifest
+
+        # and remove the parquet files of the changed files, unless rewritten by the remaining files
+        remaining_parquet_files = {
+            parquet_file
+            for index, firds_file in enumerate(firds_manifest.files)
+            if index not in superseded
+            for parquet_file in firds_file.parquet_files
+        }
+        for index in superseded:
+            for parquet_file in firds_manifest.files[index].parquet_files:
+                if parquet_file not in remaining_parquet_files:
+                    (self.firds_parquet_dir / parquet_file).unlink(missing_ok=True)
+
+        logger.info(f'Removing the rows of {len(superseded)} changed FIRDS files')
+        firds_csv_tmp_path = self.firds_csv_path.with_suffix('.csv.tmp')
+        remaining_firds_manifest = firds_manifest.model_copy(update={'files': []})
+
+        with self.firds_csv_path.open('rb') as src, firds_csv_tmp_path.open('wb') as dst:
+            dst.write(src.read(firds_manifest.header_size))
+
+            for index, firds_file in enumerate(firds_manifest.files):
+                if index in superseded:
                     continue
 
-                # open xml file without extracting it
-                with firds_zip.open(firds_file_path) as firds_xml:
-                    return self._parse_firds_xml_file(firds_xml=firds_xml)
+                src.seek(firds_file.byte_start)
+                byte_start = dst.tell()
+                shutil.copyfileobj(_BoundedReader(src, firds_file.byte_end - firds_file.byte_start), dst)
 
-        return
+                remaining_firds_manifest.files.append(
+                    firds_file.model_copy(
+                        update={
+                            'row_start': remaining_firds_manifest.row_end,
+                            'byte_start': byte_start,
+                            'byte_end': dst.tell(),
+                        },
+                    ),
+                )
+
+        os.replace(firds_csv_tmp_path, self.firds_csv_path)
+        return remaining_firds_manifest
+
+    def _start_firds_csv(self) -> None:
+        if self.partitioned:
+            return self._start_firds_dataset()
+
+        if self.transformer is not None:
+            self._start_firds_transform()
+            if not self.raw_csv:
+                return None
+
+        # write the csv header, unless the files extracted before are kept in the incremental mode
+        # or the last extraction did not complete and is resumed.
+        # the streaming extraction starts over, since its transformed file is only moved in place once complete
+        resume = self.resume and self.transformer is None
+        firds_manifest = self._load_firds_manifest() if self.incremental or resume else None
+
+        if firds_manifest is not None and not self.incremental and firds_manifest.complete:
+            firds_manifest = None
+
+        if firds_manifest is not None and not firds_manifest.complete:
+            logger.info(f'Resuming the FIRDS extraction after {len(firds_manifest.files)} FIRDS files')
+
+        if firds_manifest is None:
+            # write the csv header
+            with self.firds_csv_path.open('w', newline='', encoding='utf-8') as f:
+                fieldnames = FIRDS.csv_header()
+                writer = csv.DictWriter(f, fieldnames=fieldnames)
+                writer.writeheader()
+
+            firds_manifest = FIRDSManifest(
+                columns=FIRDS.csv_header(),
+                header_size=self.firds_csv_path.stat().st_size,
+                format=self.output_format,
+                firds_url=self.firds_url,
+            )
+            self.firds_quarantine_path.unlink(missing_ok=True)
+            shutil.rmtree(self.firds_parquet_dir, ignore_errors=True)
+
+        # the extraction is only marked complete once every firds reference document is committed
+        firds_manifest.complete = False
+        self._firds_manifest = firds_manifest
+        self._save_firds_manifest(self._firds_manifest)
+        return None
+
+    def _start_firds_transform(self) -> None:
+        # the records quarantined by the last extraction are discarded with the firds csv, if it is written
+        if not self.raw_csv:
+            self.firds_quarantine_path.unlink(missing_ok=True)
+
+        if self.transformer is not None:
+            self._firds_transform_writer = self.transformer.open_writer()
+
+    def _stop_firds_transform(self) -> None:
+        # discard the transformed file of an extraction that did not complete
+        if self._firds_transform_writer is not None:
+            self._firds_transform_writer.abort()
+            self._firds_transform_writer = None
+
+    def _plan_firds_file(self, firds_ref_doc: FIRDSDoc) -> bool:
+        # whether to fetch and parse the firds reference document.
+        # the documents are identified by file name and their content by checksum
+        if self._firds_dataset is not None:
+            firds_files: list[FIRDSFileRows] | list[FIRDSPartition] = self._firds_dataset.partitions
+
+        elif self._firds_manifest is not None:
+            firds_files = self._firds_manifest.files
+
+        else:
+            return True
+
+        for firds_file in firds_files:
+            if firds_file.file_name == firds_ref_doc.file_name and firds_file.checksum == firds_ref_doc.checksum:
+                logger.info(f'Skipping the FIRDS file {firds_ref_doc.file_name} extracted before')
+                return False
+
+        return True
+
+    def _start_firds_file(self, firds_ref_doc: FIRDSDoc) -> None:
+        # discard the uncommitted rows before the rows of the firds reference document are appended to the firds csv
+        if self._firds_manifest is None:
+            return
+
+        # discard the rows left uncommitted by a failed firds reference document
+        if self.firds_csv_path.stat().st_size != self._firds_manifest.byte_end:
+            os.truncate(self.firds_csv_path, self._firds_manifest.byte_end)
+
+        # and discard the records quarantined by it
+        if self._firds_quarantine_size() > self._firds_manifest.quarantine_size:
+            os.truncate(self.firds_quarantine_path, self._firds_manifest.quarantine_size)
+
+        # the old rows of a changed firds reference document are removed once the extraction completes
+        if any(firds_file.file_name == firds_ref_doc.file_name for firds_file in self._firds_manifest.files):
+            logger.info(f'Replacing the rows of the changed FIRDS file {firds_ref_doc.file_name}')
+
+    def _firds_quarantine_size(self) -> int:
+        if not self.firds_quarantine_path.exists():
+            return 0
+
+        return self.firds_quarantine_path.stat().st_size
+
+    def _commit_firds_file(
+        self,
+        firds_ref_doc: FIRDSDoc,
+        row_count: int,
+        parquet_files: list[str] | None = None,
+    ) -> None:
+        # record the rows appended to the firds csv by the firds reference document in the manifest.
+        # the rows are flushed to disk before the checkpoint, so a committed document is never lost
+        if self._firds_dataset is not None:
+            return self._commit_firds_partition(firds_ref_doc, row_count)
+
+        if self._firds_manifest is None:
+            return None
+
+        with self.firds_csv_path.open('rb+') as f:
+            os.fsync(f.fileno())
+
+        # count the records of the firds reference document quarantined since the last checkpoint
+        reject_count = 0
+        if self._firds_quarantine_size() != self._firds_manifest.quarantine_size:
+            with self.firds_quarantine_path.open('rb') as f:
+                f.seek(self._firds_manifest.quarantine_size)
+                reject_count = sum(chunk.count(b'\n') for chunk in iter(partial(f.read, FIRDS_XML_CHUNK_SIZE), b''))
+
+            self._firds_manifest.quarantine_size = self._firds_quarantine_size()
+
+        self._firds_manifest.files.append(
+            FIRDSFileRows(
+                file_name=firds_ref_doc.file_name,
+                checksum=firds_ref_doc.checksum,
+                version=firds_ref_doc.version,
+                publication_date=firds_ref_doc.publication_date,
+                row_start=self._firds_manifest.row_end,
+                row_count=row_count,
+                reject_count=reject_count,
+                byte_start=self._firds_manifest.byte_end,
+                byte_end=self.firds_csv_path.stat().st_size,
+                parquet_files=parquet_files or [],
+            ),
+        )
+        self._save_firds_manifest(self._firds_manifest)
+        return None
+
+    def _finish_firds_csv(self) -> None:
+        # move the transformed file of the streaming transformation in place
+        if self._firds_transform_writer is not None:
+            self._firds_transform_writer.close()
+            self._firds_transform_writer = None
+
+        # mark the extraction complete, so the next extraction starts over unless in the incremental mode
+        if self._firds_dataset is not None:
+            self._firds_dataset.complete = True
+            self._save_firds_dataset(self._firds_dataset)
+            shutil.rmtree(self.firds_staging_dir, ignore_errors=True)
+
+        if self._firds_manifest is None:
+            return
+
+        self._firds_manifest = self._remove_firds_files(self._firds_manifest)
+        self._firds_manifest.complete = True
+        self._save_firds_manifest(self._firds_manifest)
+
+    def _save_firds_dataset(self, firds_dataset: FIRDSDataset) -> None:
+        atomic_write_json(self.firds_dataset_path, firds_dataset)
+
+    def _load_firds_dataset(self) -> FIRDSDataset | None:
+        if not self.firds_dataset_path.exists():
+            return None
+
+        try:
+            firds_dataset = FIRDSDataset.model_validate_json(self.firds_dataset_path.read_bytes())
+
+        except ValidationError:
+            logger.warning(f'Invalid FIRDS dataset manifest {self.firds_dataset_path}, extracting all FIRDS files')
+            return None
+
+        if firds_dataset.format != self.output_format or firds_dataset.columns != FIRDS.csv_header():
+            logger.warning(f'The FIRDS dataset {self.firds_dataset_dir} has another format, extracting all FIRDS files')
+            return None
+
+        # the partitions of another query may no longer be listed, so they are not kept along with the ones of this one
+        if firds_dataset.firds_url != self.firds_url:
+            logger.warning('The FIRDS URL changed since the last extraction, extracting all FIRDS files')
+            return None
+
+        # the partitions removed since the last extraction are extracted again
+        firds_dataset.partitions = [
+            partition for partition in firds_dataset.partitions if (self.firds_dataset_dir / partition.path).is_dir()
+        ]
+        return firds_dataset
+
+    def _start_firds_dataset(self) -> None:
+        # keep the partitions extracted before in the incremental mode or if the last extraction is resumed.
+        # the partitions left staged by a failed extraction were never committed
+        firds_dataset = self._load_firds_dataset() if self.incremental or self.resume else None
+
+        if firds_dataset is not None and not self.incremental and firds_dataset.complete:
+            firds_dataset = None
+
+        if firds_dataset is not None and not firds_dataset.complete:
+            logger.info(f'Resuming the FIRDS extraction after {len(firds_dataset.partitions)} FIRDS files')
+
+        if firds_dataset is None:
+            shutil.rmtree(self.firds_dataset_dir, ignore_errors=True)
+            firds_dataset = FIRDSDataset(
+                format=self.output_format,
+                columns=FIRDS.csv_header(),
+                firds_url=self.firds_url,
+            )
+
+        shutil.rmtree(self.firds_staging_dir, ignore_errors=True)
+        self.firds_dataset_dir.mkdir(parents=True, exist_ok=True)
+
+        # the extraction is only marked complete once every firds reference document is committed
+        firds_dataset.complete = False
+        self._firds_dataset = firds_dataset
+        self._save_firds_dataset(self._firds_dataset)
+
+    def _firds_partition_path(self, firds_ref_doc: FIRDSDoc) -> str:
+        # the hive-style path of the partition of the firds reference document
+        publication_date = firds_ref_doc.publication_date.date().isoformat()
+        return f'publication_date={publication_date}/file_name={Path(firds_ref_doc.file_name).stem}'
+
+    def _stage_firds_partition(self, firds_ref_doc: FIRDSDoc) -> Path:
+        # create an empty staging directory for the partition, returning the path to its csv
+        firds_staging_dir = self.firds_staging_dir / self._firds_partition_path(firds_ref_doc)
+        shutil.rmtree(firds_staging_dir, ignore_errors=True)
+        firds_staging_dir.mkdir(parents=True)
+
+        firds_partition_csv_path = firds_staging_dir / self.firds_csv_path.name
+        if self.output_format == 'csv':
+            with firds_partition_csv_path.open('w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerow(FIRDS.csv_header())
+
+        return firds_partition_csv_path
+
+    def _commit_firds_partition(self, firds_ref_doc: FIRDSDoc, row_count: int) -> None:
+        # move the staged partition in place, replacing the partitions of the same file, and record it in the manifest
+        if self._firds_dataset is None:
+            return
+
+        partition_path = self._firds_partition_path(firds_ref_doc)
+        firds_staging_dir = self.firds_staging_dir / partition_path
+        firds_staging_dir.mkdir(parents=True, exist_ok=True)
+
+        reject_count = 0
+        firds_partition_quarantine_path = firds_staging_dir / self.firds_quarantine_path.name
+        if firds_partition_quarantine_path.exists():
+            with firds_partition_quarantine_path.open('rb') as f:
+                reject_count = sum(chunk.count(b'\n') for chunk in iter(partial(f.read, FIRDS_XML_CHUNK_SIZE), b''))
+
+        partitions = []
+        for partition in self._firds_dataset.partitions:
+            if partition.file_name == firds_ref_doc.file_name or partition.path == partition_path:
+                logger.info(f'Replacing the partition {partition.path} of the changed FIRDS file {partition.file_name}')
+                shutil.rmtree(self.firds_dataset_dir / partition.path, ignore_errors=True)
+                continue
+
+            partitions.append(partition)
+
+        firds_partition_dir = self.firds_dataset_dir / partition_path
+        firds_partition_dir.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(firds_staging_dir, firds_partition_dir)
+
+        partitions.append(
+            FIRDSPartition(
+                path=partition_path,
+                file_name=firds_ref_doc.file_name,
+                checksum=firds_ref_doc.checksum,
+                version=firds_ref_doc.version,
+                publication_date=firds_ref_doc.publication_date,
+                row_count=row_count,
+                reject_count=reject_count,
+            ),
+        )
+        self._firds_dataset.partitions = partitions
+        self._save_firds_dataset(self._firds_dataset)
+
+    def _write_firds_snapshot(self) -> None:
+        # index the latest row of every financial instrument and copy the indexed rows to the snapshot csv
+        if self.snapshot is None or self._firds_manifest is None:
+            return
+
+        index_path = self.firds_snapshot_index_path if self.snapshot == 'disk' else None
+        with FIRDSSnapshot(self.firds_csv_path, index_path=index_path) as firds_snapshot:
+            firds_snapshot.index(self._firds_manifest)
+            firds_snapshot.write(self.firds_snapshot_path)
+
+    def _spool_firds_zip_file(self) -> SpooledTemporaryFile[bytes]:
+        # the zip file is kept in memory up to spool_max_size bytes and rolled over to disk afterwards
+        return SpooledTemporaryFile(max_size=self.spool_max_size, mode='w+b', dir=str(self.data_dir))
+
+    def _lookup_firds_file(self, firds_ref_doc: FIRDSDoc) -> tuple[HTTPCacheEntry | None, dict[str, str]]:
+        # the cache entry of the firds zip file and the headers revalidating it
+        if self.http_cache is None:
+            return None, {}
+
+        firds_cache_entry = self.http_cache.lookup(firds_ref_doc.download_link, firds_ref_doc.checksum)
+        if firds_cache_entry is None:
+            return None, {}
+
+        return firds_cache_entry, self.http_cache.conditional_headers(firds_cache_entry)
+
+    def _read_cached_firds_file(
+        self,
+        firds_cache_entry: HTTPCacheEntry | None,
+        firds_zip_response: httpx.Response,
+        firds_zip_file: IO[bytes],
+    ) -> bool:
+        # copy the cached firds zip file if the server did not modify it
+        if firds_cache_entry is None or self.http_cache is None:
+            return False
+
+        if firds_zip_response.status_code != httpx.codes.NOT_MODIFIED:
+            return False
+
+        logger.info(f'Reading the FIRDS zip file {firds_cache_entry.url} from the HTTP cache')
+        return self.http_cache.read_into(firds_cache_entry, firds_zip_file)
+
+    def _cache_firds_file(self, firds_ref_doc: FIRDSDoc, firds_zip_response: httpx.Response) -> HTTPCacheWriter | None:
+        if self.http_cache is None:
+            return None
+
+        return self.http_cache.writer(firds_ref_doc.download_link, firds_ref_doc.checksum, firds_zip_response)
+
+    def _verify_firds_file(
+        self,
+        firds_ref_doc: FIRDSDoc,
+        firds_zip_digest: str,
+        firds_cache_writer: HTTPCacheWriter | None,
+    ) -> bool:
+        # the firds zip file is only cached once its checksum matches the firds reference document
+        if firds_zip_digest == firds_ref_doc.checksum.lower():
+            if firds_cache_writer is not None:
+                firds_cache_writer.commit()
+
+            return True
+
+        logger.warning(
+            f'Checksum mismatch of the FIRDS zip file {firds_ref_doc.download_link}: '
+            f'expected {firds_ref_doc.checksum}, got {firds_zip_digest}'
+        )
+        if firds_cache_writer is not None:
+            firds_cache_writer.abort()
+
+        return False
+
+    def _checksum_error(self, firds_ref_doc: FIRDSDoc) -> ExtractionError:
+        logger.error(f'Error verifying the FIRDS zip file from {firds_ref_doc.download_link}')
+        return ExtractionError(
+            f'Checksum mismatch of the FIRDS zip file {firds_ref_doc.file_name} after {self.checksum_attempts} attempts.'
+        )
+
+    def _download_firds_file(self, client: httpx.Client, firds_ref_doc: FIRDSDoc, firds_zip_file: IO[bytes]) -> None:
+        # the firds zip file is downloaded again while its checksum does not match, up to checksum_attempts times
+        firds_zip_start = firds_zip_file.tell()
+        for _ in range(self.checksum_attempts):
+            if self._download_firds_file_attempt(client, firds_ref_doc, firds_zip_file):
+                return
+
+            firds_zip_file.seek(firds_zip_start)
+            firds_zip_file.truncate()
+
+        raise self._checksum_error(firds_ref_doc)
+
+    def _download_firds_file_attempt(
+        self,
+        client: httpx.Client,
+        firds_ref_doc: FIRDSDoc,
+        firds_zip_file: IO[bytes],
+    ) -> bool:
+        firds_cache_entry, headers = self._lookup_firds_file(firds_ref_doc)
+        try:
+            # log the request
+            logger.info(f'Fetching the FIRDS zip file from {firds_ref_doc.download_link}')
+
+            # stream the firds zip file in chunks
+            with client.stream('GET', firds_ref_doc.download_link, headers=headers) as firds_zip_response:
+                # the cached firds zip file was verified before it was cached
+                if self._read_cached_firds_file(firds_cache_entry, firds_zip_response, firds_zip_file):
+                    return True
+
+                if firds_cache_entry is None or firds_zip_response.status_code != httpx.codes.NOT_MODIFIED:
+                    firds_zip_response.raise_for_status()
+                    return self._stream_firds_file(client, firds_ref_doc, firds_zip_response, firds_zip_file)
+
+        except httpx.HTTPError as exc:
+            logger.error(f'Error fetching the FIRDS zip file from {firds_ref_doc.download_link}')
+            raise NetworkError('Error fetching the FIRDS zip file.') from exc
+
+        # the cached firds zip file was corrupted and evicted, so it is downloaded again
+        return self._download_firds_file_attempt(client, firds_ref_doc, firds_zip_file)
+
+    def _stream_firds_file(
+        self,
+        client: httpx.Client,
+        firds_ref_doc: FIRDSDoc,
+        firds_zip_response: httpx.Response,
+        firds_zip_file: IO[bytes],
+    ) -> bool:
+        # the checksum is computed while the firds zip file is streamed, without a second pass.
+        # the retry transport only retries the attempts before the response arrives, so the connections lost while
+        # the content is read are retried here, resuming from the bytes received unless the firds zip file changed
+        firds_zip_start = firds_zip_file.tell()
+        firds_zip_hash = hashlib.md5(usedforsecurity=False)
+        firds_cache_writer = self._cache_firds_file(firds_ref_doc, firds_zip_response)
+        validator = _response_validator(firds_zip_response)
+
+        attempt = 1
+        try:
+            with ExitStack() as stack:
+                while True:
+                    try:
+                        for chunk in firds_zip_response.iter_bytes():
+                            firds_zip_file.write(chunk)
+                            firds_zip_hash.update(chunk)
+
+                            if firds_cache_writer is not None:
+                                firds_cache_writer.write(chunk)
+
+                        break
+
+                    except httpx.TransportError as exc:
+                        if attempt >= self.retry_policy.max_attempts:
+                            raise
+
+                        delay = self.retry_policy.backoff(attempt)
+                        logger.warning(
+                            f'Error reading the FIRDS zip file from {firds_ref_doc.download_link} ({exc!r}), '
+                            f'resuming in {delay:.2f}s'
+                        )
+                        firds_zip_response.close()
+                        time.sleep(delay)
+                        attempt += 1
+
+                    # the range is only served if the firds zip file did not change since the first response
+                    firds_zip_size = firds_zip_file.tell() - firds_zip_start
+                    headers = {'Range': f'bytes={firds_zip_size}-', 'If-Range': validator} if validator else {}
+                    firds_zip_response = stack.enter_context(
+                        client.stream('GET', firds_ref_doc.download_link, headers=headers),
+                    )
+                    firds_zip_response.raise_for_status()
+                    if firds_zip_response.status_code == httpx.codes.PARTIAL_CONTENT:
+                        content_range = CONTENT_RANGE_PATTERN.fullmatch(
+                            firds_zip_response.headers.get('Content-Range', ''),
+                        )
+                        if content_range is None or int(content_range.group(1)) != firds_zip_size:
+                            raise NetworkError(
+                                f'The server did not resume the FIRDS zip file {firds_ref_doc.download_link} '
+                                f'at byte {firds_zip_size}.'
+                            )
+
+                        continue
+
+                    # otherwise, the firds zip file is downloaded again from the start
+                    logger.warning(f'Downloading the FIRDS zip file {firds_ref_doc.download_link} again')
+                    firds_zip_file.seek(firds_zip_start)
+                    firds_zip_file.truncate()
+                    firds_zip_hash = hashlib.md5(usedforsecurity=False)
+                    if firds_cache_writer is not None:
+                        firds_cache_writer.abort()
+
+                    firds_cache_writer = self._cache_firds_file(firds_ref_doc, firds_zip_response)
+                    validator = _response_validator(firds_zip_response)
+
+        except BaseException:
+            if firds_cache_writer is not None:
+                firds_cache_writer.abort()
+
+            raise
+
+        return self._verify_firds_file(firds_ref_doc, firds_zip_hash.hexdigest(), firds_cache_writer)
+
+    def _open_firds_range_file(self, client: httpx.Client, firds_ref_doc: FIRDSDoc) -> HTTPRangeFile | None:
+        # open the remote firds zip file if its server supports range requests
+        try:
+            logger.info(f'Reading the FIRDS zip file from {firds_ref_doc.download_link} with range requests')
+            firds_range_file = open_http_range_file(
+                client,
+                firds_ref_doc.download_link,
+                block_size=self.range_block_size,
+            )
+
+        except httpx.HTTPError as exc:
+            logger.error(f'Error fetching the FIRDS zip file from {firds_ref_doc.download_link}')
+            raise NetworkError('Error fetching the FIRDS zip file.') from exc
+
+        if firds_range_file is None:
+            logger.info(f'The server of {firds_ref_doc.download_link} does not support range requests')
+
+        return firds_range_file
+
+    def _fetch_firds_file(self, client: httpx.Client, firds_ref_doc: FIRDSDoc) -> IO[bytes] | HTTPRangeFile:
+        # read the firds zip file with range requests, falling back to a full download
+        if self.range_requests:
+            firds_range_file = self._open_firds_range_file(client, firds_ref_doc)
+            if firds_range_file is not None:
+                return firds_range_file
+
+        return self._spool_firds_file(client, firds_ref_doc)
+
+    def _spool_firds_file(self, client: httpx.Client, firds_ref_doc: FIRDSDoc) -> IO[bytes]:
+        firds_zip_file = self._spool_firds_zip_file()
+        try:
+            self._download_firds_file(client, firds_ref_doc, firds_zip_file)
+
+        except BaseException:
+            firds_zip_file.close()
+            raise
+
+        firds_zip_file.seek(0)
+        return firds_zip_file
+
+    def _fetch_and_parse_firds_files(self, client: httpx.Client, firds_ref_docs: list[FIRDSDoc]) -> None:
+        if self.max_workers > 1:
+            return self._fetch_and_parse_firds_shards(client, firds_ref_docs)
 
-    def _fetch_and_parse_firds_files(self, firds_ref_docs: list[FIRDSDoc]) -> None:
         # download the firds zip files
         for firds_ref_doc in firds_ref_docs:
-            try:
-                # log the request
-                logger.info(f'Fetching the FIRDS zip file from {firds_ref_doc.download_link}')
+            # parse the firds zip file
+            with self._fetch_firds_file(client, firds_ref_doc) as firds_zip_file:
+                self._start_firds_file(firds_ref_doc)
+                row_count, parquet_files = self._parse_firds_ref_doc_file(firds_ref_doc, firds_zip_file)
+
+            self._commit_firds_file(firds_ref_doc, row_count, parquet_files)
+
+        return
 
-                # fetch the firds zip file
-                firds_zip_response = httpx.get(firds_ref_doc.download_link)
-                firds_zip_response.raise_for_status()
+    def _fetch_and_parse_firds_shards(self, client: httpx.Client, firds_ref_docs: list[FIRDSDoc]) -> None:
+        # the zip files are downloaded to disk and parsed by the worker processes,
+        # while the main process downloads the next files
+        self.firds_shards_dir.mkdir(parents=True, exist_ok=True)
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        firds_shards: deque[tuple[FIRDSDoc, Future[tuple[Path, int, list[str]]]]] = deque()
+        try:
+            for index, firds_ref_doc in enumerate(firds_ref_docs):
+                firds_zip_path, firds_shard_path = self._firds_shard_paths(index, firds_ref_doc)
+                with firds_zip_path.open('wb') as firds_zip_file:
+                    self._download_firds_file(client, firds_ref_doc, firds_zip_file)
 
-            except httpx.HTTPError as exc:
-                logger.error(f'Error fetching the FIRDS zip file from {firds_ref_doc.download_link}')
+                firds_shard = executor.submit(self._parse_firds_zip_shard, firds_zip_path, firds_shard_path)
+                firds_shards.append((firds_ref_doc, firds_shard))
 
-                raise NetworkError('Error fetching the FIRDS zip file.') from exc
+                # commit the parsed shards in order, keeping at most max_workers files waiting for a worker
+                while firds_shards and (firds_shards[0][1].done() or len(firds_shards) > self.max_workers):
+                    firds_ref_doc, firds_shard = firds_shards.popleft()
+                    self._commit_firds_shard(firds_ref_doc, *firds_shard.result())
 
-            # parse the firds zip file
-            self._parse_firds_zip_file(firds_zip_response.content)
+            while firds_shards:
+                firds_ref_doc, firds_shard = firds_shards.popleft()
+                self._commit_firds_shard(firds_ref_doc, *firds_shard.result())
+
+        finally:
+            executor.shutdown(cancel_futures=True)
+            shutil.rmtree(self.firds_shards_dir, ignore_errors=True)
 
         return
 
-    async def _afetch_and_parse_firds_files(self, firds_ref_docs: list[FIRDSDoc]) -> None:
-        # async client to pool several requests to download the firds zip files
-        async with httpx.AsyncClient() as client:
-            for firds_ref_doc in tqdm(firds_ref_docs):
-                try:
-                    logger.info(f'Fetching the FIRDS zip file from {firds_ref_doc.download_link}')
+    async def _adownload_firds_file(
+        self,
+        client: httpx.AsyncClient,
+        firds_ref_doc: FIRDSDoc,
+        firds_zip_file: IO[bytes],
+    ) -> None:
+        # the firds zip file is downloaded again while its checksum does not match, up to checksum_attempts times
+        firds_zip_start = firds_zip_file.tell()
+        for _ in range(self.checksum_attempts):
+            if await self._adownload_firds_file_attempt(client, firds_ref_doc, firds_zip_file):
+                return
+
+            firds_zip_file.seek(firds_zip_start)
+            firds_zip_file.truncate()
+
+        raise self._checksum_error(firds_ref_doc)
+
+    async def _adownload_firds_file_attempt(
+        self,
+        client: httpx.AsyncClient,
+        firds_ref_doc: FIRDSDoc,
+        firds_zip_file: IO[bytes],
+    ) -> bool:
+        firds_cache_entry, headers = self._lookup_firds_file(firds_ref_doc)
+        try:
+            logger.info(f'Fetching the FIRDS zip file from {firds_ref_doc.download_link}')
+
+            # stream the firds zip file in chunks
+            async with client.stream('GET', firds_ref_doc.download_link, headers=headers) as firds_zip_response:
+                # the cached firds zip file was verified before it was cached.
+                # the cache is read and committed in a worker thread, so the disk copy does not block the event loop
+                if await asyncio.to_thread(
+                    self._read_cached_firds_file,
+                    firds_cache_entry,
+                    firds_zip_response,
+                    firds_zip_file,
+                ):
+                    return True
 
-                    # fetch the firds zip file
-                    firds_zip_response = await client.get(firds_ref_doc.download_link)
+                if firds_cache_entry is None or firds_zip_response.status_code != httpx.codes.NOT_MODIFIED:
                     firds_zip_response.raise_for_status()
 
-                except httpx.HTTPError as exc:
-                    logger.error(f'Error fetching the FIRDS zip file from {firds_ref_doc.download_link}')
-                    raise NetworkError('Error fetching the FIRDS zip file.') from exc
+                    # the checksum is computed while the firds zip file is streamed, without a second pass
+                    firds_zip_hash = hashlib.md5(usedforsecurity=False)
+                    firds_cache_writer = await asyncio.to_thread(
+                        self._cache_firds_file,
+                        firds_ref_doc,
+                        firds_zip_response,
+                    )
+                    try:
+                        async for chunk in firds_zip_response.aiter_bytes():
+                            firds_zip_file.write(chunk)
+                            firds_zip_hash.update(chunk)
+
+                            if firds_cache_writer is not None:
+                                firds_cache_writer.write(chunk)
+
+                    except BaseException:
+                        if firds_cache_writer is not None:
+                            firds_cache_writer.abort()
+
+                        raise
+
+                    return await asyncio.to_thread(
+                        self._verify_firds_file,
+                        firds_ref_doc,
+                        firds_zip_hash.hexdigest(),
+                        firds_cache_writer,
+                    )
+
+        except httpx.HTTPError as exc:
+            logger.error(f'Error fetching the FIRDS zip file from {firds_ref_doc.download_link}')
+            raise NetworkError('Error fetching the FIRDS zip file.') from exc
+
+        # the cached firds zip file was corrupted and evicted, so it is downloaded again
+        return await self._adownload_firds_file_attempt(client, firds_ref_doc, firds_zip_file)
+
+    async def _afetch_firds_file(
+        self,
+        client: httpx.AsyncClient,
+        firds_ref_doc: FIRDSDoc,
+        range_client: httpx.Client | None = None,
+    ) -> IO[bytes] | HTTPRangeFile:
+        # the range requests are sent by a synchronous client, since the parser reads the remote file in a worker thread
+        if range_client is not None:
+            firds_range_file = await asyncio.to_thread(self._open_firds_range_file, range_client, firds_ref_doc)
+            if firds_range_file is not None:
+                return firds_range_file
+
+        firds_zip_file = self._spool_firds_zip_file()
+        try:
+            await self._adownload_firds_file(client, firds_ref_doc, firds_zip_file)
+
+        except BaseException:
+            # the spooled file is also released if the download is cancelled
+            firds_zip_file.close()
+            raise
+
+        firds_zip_file.seek(0)
+        return firds_zip_file
+
+    async def _afetch_and_parse_firds_shard(
+        self,
+        client: httpx.AsyncClient,
+        executor: Executor,
+        downloads: asyncio.Semaphore,
+        index: int,
+        firds_ref_doc: FIRDSDoc,
+    ) -> tuple[Path, int, list[str]]:
+        firds_zip_path, firds_shard_path = self._firds_shard_paths(index, firds_ref_doc)
+        async with downloads:
+            with firds_zip_path.open('wb') as firds_zip_file:
+                await self._adownload_firds_file(client, firds_ref_doc, firds_zip_file)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self._parse_firds_zip_shard, firds_zip_path, firds_shard_path)
+
+    async def _afetch_and_parse_firds_files(self, firds_ref_docs: AsyncIterable[FIRDSDoc]) -> None:
+        if self.max_workers > 1:
+            return await self._afetch_and_parse_firds_shards(firds_ref_docs)
+
+        # async client to pool several requests to download the firds zip files.
+        # downloads run ahead of the parser in a window of max_concurrency files,
+        # but the files are parsed in the reference document order, so the csv rows are written deterministically
+        pending_firds_ref_docs: deque[FIRDSDoc] = deque()
+        async with httpx.AsyncClient() as client:
+            with self._range_client() as range_client:
+
+                async def fetch_firds_files() -> AsyncGenerator[Coroutine[Any, Any, IO[bytes] | HTTPRangeFile], None]:
+                    async for firds_ref_doc in firds_ref_docs:
+                        pending_firds_ref_docs.append(firds_ref_doc)
+                        yield self._afetch_firds_file(client, firds_ref_doc, range_client)
+
+                firds_zip_files = _aiter_in_order(
+                    fetch_firds_files(),
+                    window=self.max_concurrency,
+                    discard=lambda firds_zip_file: firds_zip_file.close(),
+                )
+                async with aclosing(firds_zip_files):
+                    async for firds_zip_file in tqdm(firds_zip_files):
+                        firds_ref_doc = pending_firds_ref_docs.popleft()
+
+                        # parse the firds zip file in a worker thread while the next files are downloaded
+                        with firds_zip_file:
+                            self._start_firds_file(firds_ref_doc)
+                            row_count, parquet_files = await asyncio.to_thread(
+                                self._parse_firds_ref_doc_file,
+                                firds_ref_doc,
+                                firds_zip_file,
+                            )
 
-                # parse the firds zip file
-                self._parse_firds_zip_file(firds_zip_response.content)
+                        self._commit_firds_file(firds_ref_doc, row_count, parquet_files)
 
         return
 
+    async def _afetch_and_parse_firds_shards(self, firds_ref_docs: AsyncIterable[FIRDSDoc]) -> None:
+        # the downloads are bounded by max_concurrency, while the worker processes parse the downloaded files.
+        # the csv shards are committed in the reference document order
+        self.firds_shards_dir.mkdir(parents=True, exist_ok=True)
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        downloads = asyncio.Semaphore(self.max_concurrency)
+        pending_firds_ref_docs: deque[FIRDSDoc] = deque()
+        try:
+            async with httpx.AsyncClient() as client:
+
+                async def fetch_firds_shards() -> (
+                    AsyncGenerator[Coroutine[Any, Any, tuple[Path, int, list[str]]], None]
+                ):
+                    index = 0
+                    async for firds_ref_doc in firds_ref_docs:
+                        pending_firds_ref_docs.append(firds_ref_doc)
+                        yield self._afetch_and_parse_firds_shard(client, executor, downloads, index, firds_ref_doc)
+                        index += 1
+
+                firds_shards = _aiter_in_order(
+                    fetch_firds_shards(),
+                    window=self.max_concurrency + self.max_workers,
+                    discard=lambda firds_shard: None,
+                )
+                async with aclosing(firds_shards):
+                    async for firds_shard_path, row_count, parquet_files in tqdm(firds_shards):
+                        firds_ref_doc = pending_firds_ref_docs.popleft()
+                        self._commit_firds_shard(firds_ref_doc, firds_shard_path, row_count, parquet_files)
+
+        finally:
+            executor.shutdown(cancel_futures=True)
+            shutil.rmtree(self.firds_shards_dir, ignore_errors=True)
+
+        return
+
+    def list_firds_members(self, firds_ref_doc: FIRDSDoc) -> list[FIRDSZipMember]:
+        """
+        List the members of a FIRDS zip file from its central directory, without downloading the members.
+        The FIRDS zip file is read with HTTP range requests, or downloaded in full if its server does not support them.
+
+        Parameters
+        ----------
+        firds_ref_doc : FIRDSDoc
+            The FIRDS reference document of the FIRDS zip file.
+
+        Returns
+        -------
+        list[FIRDSZipMember]
+            The members of the FIRDS zip file, in the zip order.
+
+        Raises
+        ------
+        NetworkError
+            If an error occurs during the fetch of the FIRDS zip file.
+        """
+        with self._http_client() as client:
+            firds_range_file = self._open_firds_range_file(client, firds_ref_doc)
+            if firds_range_file is None:
+                firds_zip_file: IO[bytes] | HTTPRangeFile = self._spool_firds_file(client, firds_ref_doc)
+            else:
+                firds_zip_file = firds_range_file
+
+            with firds_zip_file, ZipFile(firds_zip_file, 'r') as firds_zip:
+                return [
+                    FIRDSZipMember(name=info.filename, file_size=info.file_size, compress_size=info.compress_size)
+                    for info in firds_zip.infolist()
+                ]
+
     async def arun(self) -> None:
         """
         Extract data from the FIRDS database by ESMA asynchronously.
@@ -211,17 +1942,30 @@ class FIRDSExtractor(Tool):
         """
         logger.info(f'Extracting data from the FIRDS database at {self.firds_url}')
 
-        # get the firds reference docs
-        firds_ref_docs = self._fetch_and_parse_firds_ref_doc()
+        async with httpx.AsyncClient() as client:
+            firds_ref_docs = self._afetch_and_parse_firds_ref_docs(client)
+            async with aclosing(firds_ref_docs):
+                # fetch and validate the first page of the firds reference docs before the files extracted before
+                # are touched, like the synchronous extraction
+                first_firds_ref_doc = await anext(firds_ref_docs, None)
+
+                # write the csv header or keep the files extracted before
+                self._start_firds_csv()
 
-        # write the csv header
-        with self.firds_csv_path.open('w', newline='', encoding='utf-8') as f:
-            fieldnames = FIRDS.csv_header()
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+                # stream the firds reference docs to the download of the firds zip files
+                try:
+                    await self._afetch_and_parse_firds_files(
+                        firds_ref_doc
+                        async for firds_ref_doc in _aprepend(first_firds_ref_doc, firds_ref_docs)
+                        if self._plan_firds_file(firds_ref_doc)
+                    )
+                    self._finish_firds_csv()
+                    await asyncio.to_thread(self._write_firds_snapshot)
 
-        # fetch the firds zip files
-        await self._afetch_and_parse_firds_files(firds_ref_docs)
+                finally:
+                    self._stop_firds_transform()
+                    self._firds_manifest = None
+                    self._firds_dataset = None
 
         logger.info(f'Extracted data from the FIRDS database at {self.firds_url}')
         return
@@ -237,17 +1981,26 @@ class FIRDSExtractor(Tool):
         """
         logger.info(f'Extracting data from the FIRDS database at {self.firds_url}')
 
-        # get the firds reference docs
-        firds_ref_docs = self._fetch_and_parse_firds_ref_doc()
+        # a single client pools the connections of the extraction
+        self.http_attempts.clear()
+        with self._http_client() as client:
+            # get the firds reference docs
+            firds_ref_docs = self._fetch_and_parse_firds_ref_doc(client)
+
+            # write the csv header or skip the files extracted before
+            self._start_firds_csv()
+            firds_ref_docs = [firds_ref_doc for firds_ref_doc in firds_ref_docs if self._plan_firds_file(firds_ref_doc)]
 
-        # write the csv header
-        with self.firds_csv_path.open('w', newline='', encoding='utf-8') as f:
-            fieldnames = FIRDS.csv_header()
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+            # fetch the firds zip files
+            try:
+                self._fetch_and_parse_firds_files(client, firds_ref_docs)
+                self._finish_firds_csv()
+                self._write_firds_snapshot()
 
-        # fetch the firds zip files
-        self._fetch_and_parse_firds_files(firds_ref_docs)
+            finally:
+                self._stop_firds_transform()
+                self._firds_manifest = None
+                self._firds_dataset = None
 
         logger.info(f'Extracted data from the FIRDS database at {self.firds_url}')
         return
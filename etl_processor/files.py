@@ -0,0 +1,46 @@
+"""Implementation of the atomic writes of the JSON files of the ETL processor."""
+
+import os
+from pathlib import Path
+
+from pydantic import BaseModel
+
+
+def atomic_write_json(path: Path, data: BaseModel | bytes) -> None:
+    """
+    Write a JSON file atomically.
+    The JSON is written to a temporary file next to the path, flushed to disk and moved in place,
+    so the file is never left half-written, even if the process or the machine crashes.
+
+    Parameters
+    ----------
+    path : Path
+        The path to the JSON file.
+    data : BaseModel | bytes
+        The model dumped to the JSON file, indented by two spaces, or the JSON bytes.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> from etl_processor.models import FIRDSManifest
+    >>> manifest_path = Path(tempfile.mkdtemp()) / 'firds_manifest.json'
+    >>> atomic_write_json(manifest_path, FIRDSManifest(columns=['Issr'], header_size=5))
+    >>> FIRDSManifest.model_validate_json(manifest_path.read_bytes()).header_size
+    5
+    """
+    if isinstance(data, BaseModel):
+        data = data.model_dump_json(indent=2).encode('utf-8')
+
+    tmp_path = path.with_name(f'{path.name}.tmp')
+    with tmp_path.open('wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+    os.replace(tmp_path, path)
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
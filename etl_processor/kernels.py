@@ -0,0 +1,145 @@
+"""Implementation of the vectorized kernels of the FIRDS transformation."""
+
+from collections.abc import Sequence
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+
+def utf8_buffer(values: pd.Series) -> tuple[npt.NDArray[np.uint8], npt.NDArray[np.int64]]:
+    """
+    Return the contiguous UTF-8 buffer of a series of strings.
+    The buffer of the arrow strings is read without copies if pyarrow is installed. Otherwise, the strings are encoded
+    and joined. The missing strings are empty.
+
+    Parameters
+    ----------
+    values : pd.Series
+        The series of strings.
+
+    Returns
+    -------
+    tuple[npt.NDArray[np.uint8], npt.NDArray[np.int64]]
+        The UTF-8 buffer of the strings and the offsets of the strings in the buffer, with the end of the last string.
+
+    Examples
+    --------
+    >>> data, offsets = utf8_buffer(pd.Series(['ab', None, 'KFW']))
+    >>> bytes(data), offsets.tolist()
+    (b'abKFW', [0, 2, 2, 5])
+    """
+    try:
+        import pyarrow as pa
+
+    except ImportError:
+        encoded = [value.encode('utf-8') if isinstance(value, str) else b'' for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets
+
+    # the arrow strings of pandas may be chunked, so their chunks are combined into a single buffer
+    array = pa.array(values.array, type=pa.large_string(), from_pandas=True)
+    if isinstance(array, pa.ChunkedArray):
+        array = array.combine_chunks()
+
+    if array.null_count:
+        array = array.fill_null('')
+
+    # the array may be a slice of its buffers, so the buffer is cut to the strings of the array
+    _, offsets_buffer, data_buffer = array.buffers()
+    offsets = np.frombuffer(offsets_buffer, dtype=np.int64)[array.offset : array.offset + len(array) + 1]
+    if data_buffer is None or not len(array):
+        return np.zeros(0, dtype=np.uint8), np.zeros(len(array) + 1, dtype=np.int64)
+
+    data = np.frombuffer(data_buffer, dtype=np.uint8)[offsets[0] : offsets[-1]]
+    return data, offsets - offsets[0]
+
+
+def _is_self_overlapping(substring: bytes) -> bool:
+    # whether a proper prefix of the substring is also its suffix, so two of its matches can overlap
+    return any(substring[:size] == substring[-size:] for size in range(1, len(substring)))
+
+
+def _non_overlapping(positions: npt.NDArray[np.int64], size: int) -> npt.NDArray[np.bool_]:
+    # keep the matches left to right, dropping the matches overlapping the last kept match.
+    # it only runs for the self-overlapping substrings, whose matches are rare enough for a loop
+    keep = np.ones(len(positions), dtype=bool)
+    end = -1
+    for index, position in enumerate(positions.tolist()):
+        if position < end:
+            keep[index] = False
+        else:
+            end = position + size
+
+    return keep
+
+
+def count_substrings(
+    data: npt.NDArray[np.uint8],
+    offsets: npt.NDArray[np.int64],
+    substrings: Sequence[bytes],
+) -> npt.NDArray[np.int64]:
+    """
+    Count the non-overlapping occurrences of several substrings in every string of a UTF-8 buffer.
+    A single pass over the buffer finds the candidate matches of every substring by their first byte, and the candidates
+    are verified byte by byte, so adding a substring does not add a scan of the buffer.
+    The UTF-8 encoding is self-synchronizing, so the matches of a substring of whole characters are whole characters.
+
+    Parameters
+    ----------
+    data : npt.NDArray[np.uint8]
+        The UTF-8 buffer of the strings.
+    offsets : npt.NDArray[np.int64]
+        The offsets of the strings in the buffer, with the end of the last string.
+    substrings : Sequence[bytes]
+        The UTF-8 encoded substrings.
+
+    Returns
+    -------
+    npt.NDArray[np.int64]
+        The counts of every substring, with a row per string and a column per substring.
+
+    Examples
+    --------
+    >>> data, offsets = utf8_buffer(pd.Series(['banana', 'KFW']))
+    >>> count_substrings(data, offsets, [b'a', b'an', b'ana']).tolist()
+    [[3, 2, 1], [0, 0, 0]]
+    """
+    if any(not substring for substring in substrings):
+        raise ValueError('The substrings must not be empty.')
+
+    row_count = len(offsets) - 1
+    counts = np.zeros((row_count, len(substrings)), dtype=np.int64)
+    if not data.size or not substrings:
+        return counts
+
+    # the single pass over the buffer, looking up every byte in the table of the first bytes of the substrings
+    first_bytes = np.zeros(256, dtype=bool)
+    first_bytes[[substring[0] for substring in substrings]] = True
+    candidates = np.flatnonzero(first_bytes[data])
+    candidate_bytes = data[candidates]
+
+    for column, substring in enumerate(substrings):
+        positions = candidates[candidate_bytes == substring[0]]
+        for shift, byte in enumerate(substring[1:], start=1):
+            positions = positions[positions + shift < data.size]
+            positions = positions[data[positions + shift] == byte]
+
+        # the matches spanning two strings are discarded
+        rows = np.searchsorted(offsets, positions, side='right') - 1
+        inside = positions + len(substring) <= offsets[rows + 1]
+        positions, rows = positions[inside], rows[inside]
+
+        if _is_self_overlapping(substring):
+            rows = rows[_non_overlapping(positions, len(substring))]
+
+        counts[:, column] = np.bincount(rows, minlength=row_count)
+
+    return counts
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
@@ -1,19 +1,22 @@
 """Implementation of the FIRDS loader tool."""
 
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
 import fsspec  # type: ignore
 import pandas as pd
 
 from etl_processor.exceptions import LoadError
 from etl_processor.logger import logger
+from etl_processor.models import FIRDSDataset
+from etl_processor.parquet import import_pyarrow
 from etl_processor.tool import Tool
 
 
 class FIRDSLoader(Tool):
     """
     Loading tool to save the FIRDS CSV into a file storage system.
+    It reads the transformed FIRDS data in CSV or Parquet, either as a single file or as a partitioned dataset.
 
     Attributes
     ----------
@@ -25,6 +28,10 @@ class FIRDSLoader(Tool):
         The path to save the FIRDS data in the file storage system.
     storage_options : dict[str, Any], optional
         The options to pass to the file storage system.
+    partitioned : bool
+        Whether to read the partitions of the partitioned firds_transformed dataset.
+    input_format : Literal['csv', 'parquet']
+        The format of the transformed FIRDS data.
 
     Examples
     --------
@@ -46,6 +53,8 @@ class FIRDSLoader(Tool):
         system: str,
         target_path: str,
         storage_options: dict[str, Any] | None = None,
+        partitioned: bool = False,
+        input_format: Literal['csv', 'parquet'] = 'csv',
     ) -> None:
         """
         Initialize the FIRDS loader tool.
@@ -60,7 +69,21 @@ class FIRDSLoader(Tool):
             The path to save the FIRDS data in the file storage system.
         storage_options : dict[str, Any], optional
             The options to pass to the file storage system.
+        partitioned : bool, optional
+            Whether to read the partitions of the partitioned firds_transformed dataset, by default False.
+            The partitions are read in the order of the dataset manifest and saved to a single CSV.
+        input_format : Literal['csv', 'parquet'], optional
+            The format of the transformed FIRDS data, by default 'csv'. It must match the output format of the
+            transformer. The parquet format requires pyarrow.
+
+        Raises
+        ------
+        ValueError
+            If the input format is not supported.
         """
+        if input_format not in ('csv', 'parquet'):
+            raise ValueError("The input format must be either 'csv' or 'parquet'.")
+
         if storage_options is None:
             storage_options = {}
 
@@ -71,12 +94,43 @@ class FIRDSLoader(Tool):
         self.fs = fs
         self.target_path = target_path
         self.storage_options = storage_options
-        self.firds_csv_path = self.data_dir / 'firds_transformed.csv'
+        self.partitioned = partitioned
+        self.input_format = input_format
+        self.transformed_path = self.data_dir / f'firds_transformed.{input_format}'
+        self.transformed_dataset_dir = self.data_dir / 'firds_transformed'
+        self.transformed_dataset_path = self.transformed_dataset_dir / '_manifest.json'
+
+    def _transformed_paths(self) -> list[Path]:
+        # the transformed file, or the transformed files of the partitions in the order of the dataset manifest
+        if not self.partitioned:
+            return [self.transformed_path]
+
+        transformed_dataset = FIRDSDataset.model_validate_json(self.transformed_dataset_path.read_bytes())
+        if transformed_dataset.format != self.input_format:
+            raise LoadError(
+                f'The transformed FIRDS dataset {self.transformed_dataset_dir} is in {transformed_dataset.format}, '
+                f'not in {self.input_format}.'
+            )
+
+        return [
+            self.transformed_dataset_dir / partition.path / self.transformed_path.name
+            for partition in transformed_dataset.partitions
+        ]
+
+    def _read_transformed_file(self, transformed_path: Path) -> pd.DataFrame:
+        if self.input_format == 'parquet':
+            # the parquet file is read on its own, without the partition columns of its hive-style path
+            _, pq = import_pyarrow()
+            df: pd.DataFrame = pq.ParquetFile(transformed_path).read().to_pandas()
+            return df
+
+        return pd.read_csv(transformed_path)
 
     def run(self) -> None:
         """
         Load the FIRDS data.
-        It reads the FIRDS CSV file and writes it to the file storage system.
+        It reads the transformed FIRDS file, or the files of its partitions, and writes them to a single CSV file
+        in the file storage system.
         It uses the fsspec library to interact with the file storage system.
 
         Raises
@@ -85,15 +139,15 @@ class FIRDSLoader(Tool):
             If an error occurs during the loading of the FIRDS data.
         """
         try:
-            logger.info(f'Loading the FIRDS data in {self.firds_csv_path} to {self.target_path}')
+            source_path = self.transformed_dataset_dir if self.partitioned else self.transformed_path
+            logger.info(f'Loading the FIRDS data in {source_path} to {self.target_path}')
 
-            # read the firds csv file
+            # write the transformed files one at a time to the file storage system, with the header of the first one
             # TODO: read the csv file adds an extra validation step. It verifies the file is a valid csv file. However, it might not be necessary. We could well load the file directly to the file storage system.
-            df = pd.read_csv(self.firds_csv_path)
-
-            # write the dataframe to the file storage system
             with self.fs.open(self.target_path, 'wb') as f:
-                df.to_csv(f, index=False)
+                for index, transformed_path in enumerate(self._transformed_paths()):
+                    df = self._read_transformed_file(transformed_path)
+                    df.to_csv(f, header=index == 0, index=False)
 
             logger.info(f'The FIRDS data has been loaded to {self.target_path}')
 
@@ -1,6 +1,6 @@
 """It contains the models for the ETL processor."""
 
-from typing import Literal
+from typing import Annotated, Any, Literal, TypedDict
 
 from pydantic import AwareDatetime, BaseModel, Field
 
@@ -102,19 +102,400 @@ class FIRDS(BaseModel):
     def csv_header(cls) -> list[str]:
         """
         Return the CSV header for the model.
+        The columns are the serialization aliases of the model fields, that is, the path of the field tags in the
+        financial instrument record joined by dots (e.g. 'FinInstrmGnlAttrbts.Id').
 
         Returns
         -------
         list[str]
             The CSV header for the model.
         """
-        schema = cls.model_json_schema(by_alias=True)
-        properties = schema['properties']
         columns = []
-        for key in properties.keys():
-            if key == 'Issr':
-                columns.append('Issr')
-            else:
-                columns.append(f'FinInstrmGnlAttrbts.{key}')
+        for name, field in cls.model_fields.items():
+            columns.append(field.serialization_alias or field.alias or name)
 
         return columns
+
+    @classmethod
+    def record_aliases(cls) -> list[str]:
+        """
+        Return the validation aliases of the model fields, that is, the tags of the financial instrument record.
+
+        Returns
+        -------
+        list[str]
+            The validation aliases of the model fields.
+        """
+        aliases = []
+        for name, field in cls.model_fields.items():
+            alias = field.validation_alias or field.alias or name
+            if not isinstance(alias, str):
+                raise TypeError(f'The validation alias of the field {name} must be a string.')
+
+            aliases.append(alias)
+
+        return aliases
+
+    @classmethod
+    def record_paths(cls) -> dict[str, tuple[str, ...]]:
+        """
+        Return the path of the tags of each model field in the financial instrument record.
+        For instance, the path of the 'Id' field is ('FinInstrmGnlAttrbts', 'Id').
+
+        Returns
+        -------
+        dict[str, tuple[str, ...]]
+            The path of the field tags keyed by the validation aliases of the model fields.
+        """
+        return {
+            alias: tuple(column.split('.'))
+            for alias, column in zip(cls.record_aliases(), cls.csv_header(), strict=True)
+        }
+
+    @classmethod
+    def record_type(cls) -> Any:
+        """
+        Return a TypedDict of the financial instrument record keyed by the validation aliases of the model fields.
+        Validating a record with the TypedDict applies the same field types and constraints as the model,
+        but it avoids building a model instance for every financial instrument.
+
+        Returns
+        -------
+        Any
+            The TypedDict of the financial instrument record.
+        """
+        annotations = {}
+        for alias, field in zip(cls.record_aliases(), cls.model_fields.values(), strict=True):
+            annotation = field.annotation
+            if field.metadata:
+                annotation = Annotated[(annotation, *field.metadata)]  # type: ignore[assignment]
+
+            annotations[alias] = annotation
+
+        return TypedDict(f'{cls.__name__}Record', annotations)  # type: ignore[operator]
+
+
+class FIRDSFileRows(BaseModel):
+    """
+    Model for the rows of the FIRDS CSV extracted from a FIRDS reference document.
+    It locates the rows of the document in the FIRDS CSV, both by row number and by byte offset.
+    """
+
+    file_name: str = Field(
+        ...,
+        description='Document file name.',
+    )
+    checksum: str = Field(
+        ...,
+        description='Document checksum.',
+    )
+    version: int = Field(
+        ...,
+        description='Document version.',
+    )
+    publication_date: AwareDatetime = Field(
+        ...,
+        description='Document publication date.',
+    )
+    row_start: int = Field(
+        ...,
+        description='Number of the first row of the document in the FIRDS CSV, not counting the header.',
+    )
+    row_count: int = Field(
+        ...,
+        description='Number of rows of the document in the FIRDS CSV.',
+    )
+    reject_count: int = Field(
+        default=0,
+        description='Number of invalid records of the document quarantined instead of written to the FIRDS CSV.',
+    )
+    byte_start: int = Field(
+        ...,
+        description='Byte offset of the first row of the document in the FIRDS CSV.',
+    )
+    byte_end: int = Field(
+        ...,
+        description='Byte offset past the last row of the document in the FIRDS CSV.',
+    )
+    parquet_files: list[str] = Field(
+        default_factory=list,
+        description='Names of the Parquet files of the document in the Parquet dataset, if the output format is Parquet.',
+    )
+
+
+class FIRDSManifest(BaseModel):
+    """
+    Model for the manifest of the FIRDS CSV.
+    It lists the FIRDS reference documents already extracted to the FIRDS CSV in the order of their rows.
+    """
+
+    columns: list[str] = Field(
+        ...,
+        description='FIRDS CSV header.',
+    )
+    header_size: int = Field(
+        ...,
+        description='Size in bytes of the FIRDS CSV header.',
+    )
+    format: Literal['csv', 'parquet'] = Field(
+        default='csv',
+        description='Format of the extracted financial instruments. The parquet format only keeps the FIRDS CSV header.',
+    )
+    firds_url: str | None = Field(
+        default=None,
+        description='URL of the FIRDS reference documents extracted. The extraction starts over if the URL changes.',
+    )
+    files: list[FIRDSFileRows] = Field(
+        default_factory=list,
+        description='Rows of the FIRDS reference documents extracted to the FIRDS CSV.',
+    )
+    quarantine_size: int = Field(
+        default=0,
+        description='Size in bytes of the quarantine file of the invalid records of the extracted documents.',
+    )
+    complete: bool = Field(
+        default=True,
+        description='Whether the extraction of the FIRDS CSV completed. Otherwise, the next extraction resumes it.',
+    )
+
+    @property
+    def row_end(self) -> int:
+        """
+        Return the number of rows of the FIRDS CSV, not counting the header.
+
+        Returns
+        -------
+        int
+            The number of rows of the FIRDS CSV.
+        """
+        if not self.files:
+            return 0
+
+        return self.files[-1].row_start + self.files[-1].row_count
+
+    @property
+    def byte_end(self) -> int:
+        """
+        Return the size in bytes of the FIRDS CSV.
+
+        Returns
+        -------
+        int
+            The size in bytes of the FIRDS CSV.
+        """
+        if not self.files:
+            return self.header_size
+
+        return self.files[-1].byte_end
+
+
+class FIRDSPartition(BaseModel):
+    """
+    Model for a partition of the partitioned FIRDS dataset.
+    It holds the rows extracted from a FIRDS reference document, in a directory keyed by its publication date and file name.
+    """
+
+    path: str = Field(
+        ...,
+        description='Path of the partition directory relative to the dataset directory.',
+    )
+    file_name: str = Field(
+        ...,
+        description='Document file name.',
+    )
+    checksum: str = Field(
+        ...,
+        description='Document checksum.',
+    )
+    version: int = Field(
+        ...,
+        description='Document version.',
+    )
+    publication_date: AwareDatetime = Field(
+        ...,
+        description='Document publication date.',
+    )
+    row_count: int = Field(
+        ...,
+        description='Number of rows of the document in the partition.',
+    )
+    reject_count: int = Field(
+        default=0,
+        description='Number of invalid records of the document quarantined in the partition.',
+    )
+
+
+class FIRDSDataset(BaseModel):
+    """
+    Model for the manifest of the partitioned FIRDS dataset.
+    It lists the partitions of the FIRDS reference documents already extracted to the dataset.
+    """
+
+    format: Literal['csv', 'parquet'] = Field(
+        ...,
+        description='Format of the files of the partitions.',
+    )
+    columns: list[str] = Field(
+        ...,
+        description='Columns of the files of the partitions.',
+    )
+    firds_url: str | None = Field(
+        default=None,
+        description='URL of the FIRDS reference documents extracted. The extraction starts over if the URL changes.',
+    )
+    partitions: list[FIRDSPartition] = Field(
+        default_factory=list,
+        description='Partitions of the FIRDS reference documents extracted to the dataset.',
+    )
+    complete: bool = Field(
+        default=True,
+        description='Whether the extraction of the dataset completed. Otherwise, the next extraction resumes it.',
+    )
+
+    @property
+    def row_count(self) -> int:
+        """
+        Return the number of rows of the dataset.
+
+        Returns
+        -------
+        int
+            The number of rows of the dataset.
+        """
+        return sum(partition.row_count for partition in self.partitions)
+
+
+class FIRDSWatermark(BaseModel):
+    """
+    Model for the watermark of the incremental transformation of the FIRDS CSV.
+    It records the prefix of the FIRDS CSV already transformed to the transformed FIRDS CSV.
+    """
+
+    byte_offset: int = Field(
+        ...,
+        description='Size in bytes of the prefix of the FIRDS CSV already transformed, including its header.',
+    )
+    row_count: int = Field(
+        ...,
+        description='Number of rows of the FIRDS CSV already transformed, not counting the header.',
+    )
+    fingerprint: str = Field(
+        ...,
+        description='SHA-256 digest of the head and the tail of the prefix of the FIRDS CSV already transformed.',
+    )
+    engine: Literal['pandas', 'pyarrow'] = Field(
+        ...,
+        description='Engine of the transformation.',
+    )
+    columns: list[str] = Field(
+        ...,
+        description='Header of the transformed FIRDS CSV.',
+    )
+    transformed_size: int = Field(
+        ...,
+        description='Size in bytes of the transformed FIRDS CSV at the watermark.',
+    )
+
+
+class FIRDSChunk(BaseModel):
+    """
+    Model for a chunk of the FIRDS transformation.
+    It records the number of rows of the chunk and, with a memory budget, the memory measured for its transformation.
+    """
+
+    row_count: int = Field(
+        ...,
+        description='Number of rows of the chunk.',
+    )
+    memory: int | None = Field(
+        default=None,
+        description='Size in bytes of the chunk and of its transformation in memory, measured with a memory budget only.',
+    )
+
+
+class FIRDSZipMember(BaseModel):
+    """
+    Model for a member of a FIRDS zip file.
+    It should contain the name and the sizes of the member listed in the central directory of the zip file.
+    """
+
+    name: str = Field(
+        ...,
+        description='Member name (e.g. DLTINS_20210117_01of01.xml).',
+    )
+    file_size: int = Field(
+        ...,
+        description='Size in bytes of the decompressed member.',
+    )
+    compress_size: int = Field(
+        ...,
+        description='Size in bytes of the compressed member.',
+    )
+
+
+class HTTPCacheEntry(BaseModel):
+    """
+    Model for an entry of the on-disk HTTP cache.
+    It should contain the validators of the cached response and the digest of its content.
+    """
+
+    url: str = Field(
+        ...,
+        description='Response URL.',
+    )
+    checksum: str = Field(
+        ...,
+        description='Checksum of the document published along with the URL, if any.',
+    )
+    digest: str = Field(
+        ...,
+        description='SHA-256 digest of the response content, which addresses the content in the cache.',
+    )
+    size: int = Field(
+        ...,
+        description='Size in bytes of the response content.',
+    )
+    etag: str | None = Field(
+        default=None,
+        description='Response ETag header.',
+    )
+    last_modified: str | None = Field(
+        default=None,
+        description='Response Last-Modified header.',
+    )
+    accessed_at: float = Field(
+        ...,
+        description='Timestamp of the last access to the entry.',
+    )
+
+
+class HTTPAttempt(BaseModel):
+    """
+    Model for an attempt of an HTTP request.
+    It should contain the outcome and the latency of the attempt.
+    """
+
+    method: str = Field(
+        ...,
+        description='Request method.',
+    )
+    url: str = Field(
+        ...,
+        description='Request URL.',
+    )
+    attempt: int = Field(
+        ...,
+        description='Number of the attempt, starting at 1.',
+    )
+    status_code: int | None = Field(
+        default=None,
+        description='Response status code, if a response was received.',
+    )
+    error: str | None = Field(
+        default=None,
+        description='Transport error of the attempt, if any.',
+    )
+    elapsed: float = Field(
+        ...,
+        description='Seconds until the response headers or the transport error were received.',
+    )
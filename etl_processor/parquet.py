@@ -0,0 +1,200 @@
+"""Implementation of the Parquet writer of the FIRDS records."""
+
+import os
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+from types import ModuleType
+from typing import TYPE_CHECKING, Any
+
+from etl_processor.models import FIRDS
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+# the columns with a few distinct values, which are dictionary encoded in the parquet files
+FIRDS_DICTIONARY_COLUMNS = ('FinInstrmGnlAttrbts.ClssfctnTp', 'FinInstrmGnlAttrbts.NtnlCcy')
+
+# the arrow type factories of the annotations of the FIRDS model fields
+ARROW_TYPES = {str: 'string', bool: 'bool_', int: 'int64', float: 'float64'}
+
+
+def import_pyarrow() -> tuple[ModuleType, ModuleType]:
+    """
+    Import pyarrow and its parquet module, which are an optional dependency.
+
+    Returns
+    -------
+    tuple[ModuleType, ModuleType]
+        The pyarrow and pyarrow.parquet modules.
+
+    Raises
+    ------
+    ImportError
+        If pyarrow is not installed.
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+
+    except ImportError as exc:
+        raise ImportError('The Parquet output format requires pyarrow, install it with `pip install pyarrow`.') from exc
+
+    return pyarrow, pyarrow.parquet
+
+
+def firds_arrow_schema(dictionary_columns: Sequence[str] = ()) -> 'pa.Schema':
+    """
+    Return the arrow schema of the FIRDS records.
+    The columns are the CSV header of the FIRDS model, typed by the annotations of the model fields.
+
+    Parameters
+    ----------
+    dictionary_columns : Sequence[str], optional
+        The string columns typed as dictionaries of strings, by default none.
+
+    Returns
+    -------
+    pa.Schema
+        The arrow schema of the FIRDS records.
+    """
+    pa, _ = import_pyarrow()
+
+    fields = []
+    for column, field in zip(FIRDS.csv_header(), FIRDS.model_fields.values(), strict=True):
+        if field.annotation not in ARROW_TYPES:
+            raise TypeError(f'The FIRDS field {column} has no arrow type.')
+
+        arrow_type = getattr(pa, ARROW_TYPES[field.annotation])()
+        if column in dictionary_columns:
+            arrow_type = pa.dictionary(pa.int32(), arrow_type)
+
+        fields.append(pa.field(column, arrow_type, nullable=not field.is_required()))
+
+    return pa.schema(fields)
+
+
+class FIRDSParquetWriter:
+    """
+    Writer of the FIRDS records to a Parquet file.
+    The rows are buffered column by column and written in row groups, and the file is only moved to its path on close,
+    so a Parquet file is never left half-written.
+    It mirrors the csv writers, writing sequences of values with writerows and mappings by column with writerow.
+
+    Attributes
+    ----------
+    parquet_path : Path
+        The path to the Parquet file.
+    row_group_size : int
+        The number of rows of every row group of the Parquet file.
+    schema : pa.Schema
+        The arrow schema of the FIRDS records.
+
+    Examples
+    --------
+    >>> from pathlib import Path
+    >>> with FIRDSParquetWriter(Path('data/firds.parquet')) as writer:
+    ...     writer.writerows([('EZV1JDJ1R5Q9', 'Foreign_Exchange Forward', 'JFTXFP', False, 'SEK', '2138004TYNQCB7MLTG76')])
+    """
+
+    def __init__(
+        self,
+        parquet_path: Path,
+        row_group_size: int = 10**5,
+        dictionary_columns: Sequence[str] = FIRDS_DICTIONARY_COLUMNS,
+        compression: str = 'zstd',
+    ) -> None:
+        """
+        Initialize the writer of the FIRDS records to a Parquet file.
+
+        Parameters
+        ----------
+        parquet_path : Path
+            The path to the Parquet file.
+        row_group_size : int, optional
+            The number of rows of every row group of the Parquet file, by default 10**5.
+        dictionary_columns : Sequence[str], optional
+            The columns dictionary encoded in the Parquet file, by default the classification type and notional currency.
+        compression : str, optional
+            The compression codec of the Parquet file, by default 'zstd'.
+        """
+        if row_group_size < 1:
+            raise ValueError('The row group size must be at least 1.')
+
+        self._pa, pq = import_pyarrow()
+
+        self.parquet_path = parquet_path
+        self.row_group_size = row_group_size
+        self.schema = firds_arrow_schema()
+
+        self._tmp_path = parquet_path.with_suffix('.parquet.tmp')
+        self._tmp_path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = pq.ParquetWriter(
+            self._tmp_path,
+            self.schema,
+            compression=compression,
+            use_dictionary=list(dictionary_columns),
+        )
+        self._columns: list[list[Any]] = [[] for _ in self.schema.names]
+
+    def __enter__(self) -> 'FIRDSParquetWriter':
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc_info: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def writerows(self, rows: Iterable[Iterable[Any]]) -> None:
+        """
+        Write rows of values in the order of the schema columns.
+
+        Parameters
+        ----------
+        rows : Iterable[Iterable[Any]]
+            The rows of values.
+        """
+        for row in rows:
+            for column, value in zip(self._columns, row, strict=True):
+                column.append(value)
+
+            if len(self._columns[0]) >= self.row_group_size:
+                self._flush()
+
+    def writerow(self, row: Mapping[str, Any]) -> None:
+        """
+        Write a row of values keyed by the schema columns.
+
+        Parameters
+        ----------
+        row : Mapping[str, Any]
+            The row of values.
+        """
+        self.writerows([[row[name] for name in self.schema.names]])
+
+    def _flush(self) -> None:
+        if not self._columns[0]:
+            return
+
+        arrays = [
+            self._pa.array(column, type=field.type) for column, field in zip(self._columns, self.schema, strict=True)
+        ]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self.schema))
+        self._columns = [[] for _ in self.schema.names]
+
+    def close(self) -> None:
+        """Write the buffered rows and move the Parquet file to its path."""
+        self._flush()
+        self._writer.close()
+        os.replace(self._tmp_path, self.parquet_path)
+
+    def abort(self) -> None:
+        """Discard the Parquet file."""
+        self._writer.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
@@ -0,0 +1,437 @@
+"""Implementation of the declarative transform pipeline of the FIRDS data."""
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Mapping, Sequence
+
+import pandas as pd
+
+from etl_processor.kernels import count_substrings, utf8_buffer
+
+# the substrings counted in the full names by default, keyed by the names of their derived columns
+FIRDS_SUBSTRINGS = {'a': 'a'}
+
+
+class Expression(ABC):
+    """
+    Column expression of a transform pipeline.
+    The expressions are row-wise, so the rows of a chunk are transformed independently of each other.
+    The expressions are pickled to the worker processes of the parallel transformation, so their functions must be
+    defined at the module level.
+
+    Attributes
+    ----------
+    inputs : tuple[str, ...]
+        The columns read by the expression.
+    outputs : tuple[str, ...]
+        The columns written by the expression.
+    """
+
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+
+    @abstractmethod
+    def apply(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Apply the expression to a chunk.
+
+        Parameters
+        ----------
+        chunk : pd.DataFrame
+            The chunk of the FIRDS data.
+
+        Returns
+        -------
+        pd.DataFrame
+            The transformed chunk.
+        """
+
+
+class Derive(Expression):
+    """
+    Expression deriving a column from other columns.
+
+    Attributes
+    ----------
+    name : str
+        The name of the derived column.
+    inputs : tuple[str, ...]
+        The columns passed to the function, in order.
+    outputs : tuple[str, ...]
+        The derived column.
+    func : Callable[..., pd.Series]
+        The function of the input columns returning the derived column.
+
+    Examples
+    --------
+    >>> def name_length(full_name: pd.Series) -> pd.Series:
+    ...     return full_name.str.len()
+    >>> derive = Derive('name_length', ['FinInstrmGnlAttrbts.FullNm'], name_length)
+    """
+
+    def __init__(self, name: str, inputs: Sequence[str], func: Callable[..., pd.Series]) -> None:
+        """
+        Initialize the expression deriving a column from other columns.
+
+        Parameters
+        ----------
+        name : str
+            The name of the derived column.
+        inputs : Sequence[str]
+            The columns passed to the function, in order.
+        func : Callable[..., pd.Series]
+            The function of the input columns returning the derived column.
+        """
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.outputs = (name,)
+        self.func = func
+
+    def apply(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Derive the column of a chunk.
+
+        Parameters
+        ----------
+        chunk : pd.DataFrame
+            The chunk of the FIRDS data.
+
+        Returns
+        -------
+        pd.DataFrame
+            The chunk with the derived column.
+        """
+        chunk[self.name] = self.func(*(chunk[column] for column in self.inputs))
+        return chunk
+
+
+class SubstringCounts(Expression):
+    """
+    Expression deriving the count and presence columns of several substrings in a string column.
+    The substrings are counted at once by a NumPy kernel over the UTF-8 buffer of the column.
+
+    Attributes
+    ----------
+    column : str
+        The string column.
+    substrings : dict[str, str]
+        The literal substrings, keyed by the names of their columns.
+    inputs : tuple[str, ...]
+        The string column.
+    outputs : tuple[str, ...]
+        The {name}_count and contains_{name} columns of every substring.
+
+    Examples
+    --------
+    >>> substring_counts = SubstringCounts(substrings={'a': 'a'})
+    >>> substring_counts.outputs
+    ('a_count', 'contains_a')
+    """
+
+    def __init__(self, column: str = 'FinInstrmGnlAttrbts.FullNm', substrings: Mapping[str, str] | None = None) -> None:
+        """
+        Initialize the expression deriving the count and presence columns of several substrings.
+
+        Parameters
+        ----------
+        column : str, optional
+            The string column, by default the full name of the financial instruments.
+        substrings : Mapping[str, str] | None, optional
+            The literal substrings, keyed by the names of their columns, by default the letter "a" named a.
+        """
+        if substrings is None:
+            substrings = FIRDS_SUBSTRINGS
+
+        if not substrings or any(not substring for substring in substrings.values()):
+            raise ValueError('The substrings must be a non-empty mapping of non-empty substrings.')
+
+        self.column = column
+        self.substrings = dict(substrings)
+        self.inputs = (column,)
+        self.outputs = tuple(column for name in substrings for column in (f'{name}_count', f'contains_{name}'))
+
+    def apply(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Derive the count and presence columns of the substrings of a chunk.
+
+        Parameters
+        ----------
+        chunk : pd.DataFrame
+            The chunk of the FIRDS data.
+
+        Returns
+        -------
+        pd.DataFrame
+            The chunk with the count and presence columns.
+        """
+        data, offsets = utf8_buffer(chunk[self.column])
+        counts = count_substrings(data, offsets, [substring.encode('utf-8') for substring in self.substrings.values()])
+
+        for index, name in enumerate(self.substrings):
+            chunk[f'{name}_count'] = counts[:, index]
+            chunk[f'contains_{name}'] = counts[:, index] > 0
+
+        return chunk
+
+
+class Filter(Expression):
+    """
+    Expression keeping the rows of a chunk matching a predicate of some columns.
+    The missing values of the predicate drop their rows.
+
+    Attributes
+    ----------
+    inputs : tuple[str, ...]
+        The columns passed to the predicate, in order.
+    predicate : Callable[..., pd.Series]
+        The function of the input columns returning whether to keep every row.
+
+    Examples
+    --------
+    >>> def is_euro(currency: pd.Series) -> pd.Series:
+    ...     return currency == 'EUR'
+    >>> euro_filter = Filter(['FinInstrmGnlAttrbts.NtnlCcy'], is_euro)
+    """
+
+    def __init__(self, inputs: Sequence[str], predicate: Callable[..., pd.Series]) -> None:
+        """
+        Initialize the expression keeping the rows matching a predicate.
+
+        Parameters
+        ----------
+        inputs : Sequence[str]
+            The columns passed to the predicate, in order.
+        predicate : Callable[..., pd.Series]
+            The function of the input columns returning whether to keep every row.
+        """
+        self.inputs = tuple(inputs)
+        self.predicate = predicate
+
+    def apply(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Keep the rows of a chunk matching the predicate.
+
+        Parameters
+        ----------
+        chunk : pd.DataFrame
+            The chunk of the FIRDS data.
+
+        Returns
+        -------
+        pd.DataFrame
+            The rows of the chunk matching the predicate.
+        """
+        mask = self.predicate(*(chunk[column] for column in self.inputs))
+        # the rows are already copied by the mask, so the shallow copy only detaches the chunk from the unfiltered
+        # chunk, and the later derivations assign their columns without a chained assignment warning
+        return chunk[mask.fillna(False).astype(bool)].copy(deep=False)
+
+
+class Select(Expression):
+    """
+    Expression projecting a chunk to some columns, in order.
+
+    Attributes
+    ----------
+    columns : tuple[str, ...]
+        The projected columns.
+    inputs : tuple[str, ...]
+        The projected columns.
+
+    Examples
+    --------
+    >>> select = Select(['FinInstrmGnlAttrbts.Id', 'a_count'])
+    """
+
+    def __init__(self, columns: Sequence[str]) -> None:
+        """
+        Initialize the expression projecting a chunk to some columns.
+
+        Parameters
+        ----------
+        columns : Sequence[str]
+            The projected columns.
+        """
+        if not columns:
+            raise ValueError('The projection must select at least a column.')
+
+        self.columns = tuple(columns)
+        self.inputs = tuple(columns)
+
+    def apply(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Project a chunk to the columns.
+
+        Parameters
+        ----------
+        chunk : pd.DataFrame
+            The chunk of the FIRDS data.
+
+        Returns
+        -------
+        pd.DataFrame
+            The projected chunk.
+        """
+        return chunk[list(self.columns)]
+
+
+class CompiledPipeline:
+    """
+    Transform pipeline planned for the columns of the FIRDS data.
+    It applies the planned expressions to a chunk in a single pass.
+
+    Attributes
+    ----------
+    source_columns : list[str]
+        The columns read from the FIRDS data, in the order of the FIRDS data.
+    expressions : list[Expression]
+        The planned expressions, in order of application.
+    columns : list[str]
+        The columns of the transformed FIRDS data.
+    """
+
+    def __init__(self, source_columns: list[str], expressions: list[Expression], columns: list[str]) -> None:
+        """
+        Initialize the planned transform pipeline.
+
+        Parameters
+        ----------
+        source_columns : list[str]
+            The columns read from the FIRDS data, in the order of the FIRDS data.
+        expressions : list[Expression]
+            The planned expressions, in order of application.
+        columns : list[str]
+            The columns of the transformed FIRDS data.
+        """
+        self.source_columns = source_columns
+        self.expressions = expressions
+        self.columns = columns
+
+    def apply(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """
+        Transform a chunk of the FIRDS data.
+
+        Parameters
+        ----------
+        chunk : pd.DataFrame
+            The chunk of the source columns of the FIRDS data.
+
+        Returns
+        -------
+        pd.DataFrame
+            The transformed chunk.
+        """
+        for expression in self.expressions:
+            chunk = expression.apply(chunk)
+
+        return chunk[self.columns]
+
+
+class TransformPipeline:
+    """
+    Declarative pipeline of column expressions transforming the FIRDS data.
+    The expressions are declared in order and planned for the columns of the FIRDS data before the transformation:
+    the derived columns unused by the projection are not derived, the unused columns are not read,
+    and every filter runs as soon as its columns are available, before the derivations it does not depend on.
+
+    Attributes
+    ----------
+    expressions : list[Expression]
+        The expressions of the pipeline, in order of declaration.
+
+    Examples
+    --------
+    >>> def is_euro(currency: pd.Series) -> pd.Series:
+    ...     return currency == 'EUR'
+    >>> pipeline = TransformPipeline(
+    ...     [
+    ...         SubstringCounts(substrings={'a': 'a'}),
+    ...         Filter(['FinInstrmGnlAttrbts.NtnlCcy'], is_euro),
+    ...         Select(['FinInstrmGnlAttrbts.Id', 'a_count']),
+    ...     ]
+    ... )
+    >>> pipeline.compile(['FinInstrmGnlAttrbts.Id', 'FinInstrmGnlAttrbts.FullNm', 'FinInstrmGnlAttrbts.NtnlCcy']).columns
+    ['FinInstrmGnlAttrbts.Id', 'a_count']
+    """
+
+    def __init__(self, expressions: Sequence[Expression]) -> None:
+        """
+        Initialize the declarative pipeline of column expressions.
+
+        Parameters
+        ----------
+        expressions : Sequence[Expression]
+            The expressions of the pipeline, in order of declaration.
+        """
+        self.expressions = list(expressions)
+
+    def compile(self, source_columns: Sequence[str]) -> CompiledPipeline:
+        """
+        Plan the pipeline for the columns of the FIRDS data.
+
+        Parameters
+        ----------
+        source_columns : Sequence[str]
+            The columns of the FIRDS data.
+
+        Returns
+        -------
+        CompiledPipeline
+            The planned pipeline.
+
+        Raises
+        ------
+        ValueError
+            If an expression reads a column unavailable at its position in the pipeline.
+        """
+        # the columns available after every expression, checking the inputs of every expression
+        columns = list(source_columns)
+        for expression in self.expressions:
+            missing = [column for column in expression.inputs if column not in columns]
+            if missing:
+                raise ValueError(f'The columns {missing} are not available to the expression {expression!r}.')
+
+            if isinstance(expression, Select):
+                columns = list(expression.columns)
+            else:
+                columns += [column for column in expression.outputs if column not in columns]
+
+        # the derivations whose columns are neither projected nor read by the later expressions are pruned.
+        # the projections are applied once at the end, since the unused columns are never read or derived
+        required = set(columns)
+        expressions: list[Expression] = []
+        for expression in reversed(self.expressions):
+            if isinstance(expression, Select):
+                continue
+
+            if isinstance(expression, Filter) or required.intersection(expression.outputs):
+                required.difference_update(expression.outputs)
+                required.update(expression.inputs)
+                expressions.append(expression)
+
+        expressions.reverse()
+
+        # every filter is pushed right after the last derivation of its columns, so the derivations before it run
+        # on the kept rows only. the expressions are row-wise, so the filters commute with the other derivations
+        planned: list[Expression] = []
+        for expression in expressions:
+            if not isinstance(expression, Filter):
+                planned.append(expression)
+                continue
+
+            position = len(planned)
+            while position and not set(planned[position - 1].outputs).intersection(expression.inputs):
+                position -= 1
+
+            planned.insert(position, expression)
+
+        return CompiledPipeline(
+            source_columns=[column for column in source_columns if column in required],
+            expressions=planned,
+            columns=columns,
+        )
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
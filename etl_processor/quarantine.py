@@ -0,0 +1,130 @@
+"""Implementation of the quarantine of the invalid FIRDS records."""
+
+import json
+import time
+from collections import Counter
+from collections.abc import Iterable
+from pathlib import Path
+from typing import IO
+
+from pydantic_core import ErrorDetails
+
+from etl_processor.logger import logger
+
+
+def firds_error_codes(errors: Iterable[ErrorDetails]) -> list[str]:
+    """
+    Return the compact error codes of the validation errors of a FIRDS record.
+    The codes are the record key and the pydantic error type joined by a colon (e.g. 'CmmdtyDerivInd:bool_parsing').
+
+    Parameters
+    ----------
+    errors : Iterable[ErrorDetails]
+        The validation errors of the FIRDS record, located by record key.
+
+    Returns
+    -------
+    list[str]
+        The compact error codes of the validation errors.
+    """
+    return [f'{".".join(str(loc) for loc in error["loc"])}:{error["type"]}' for error in errors]
+
+
+class FIRDSQuarantine:
+    """
+    Quarantine of the invalid FIRDS records of a FIRDS XML file.
+    The rejected records are appended with their compact error codes to a JSON Lines file, while their errors are only
+    logged as rate-limited summaries. The quarantine file is only opened once a record is rejected.
+
+    Attributes
+    ----------
+    quarantine_path : Path
+        The path to the JSON Lines file of the rejected records.
+    source : str
+        The name of the FIRDS XML file of the records.
+    log_interval : float
+        The minimum number of seconds between the summaries logged while records are rejected.
+    reject_count : int
+        The number of rejected records.
+    error_counts : Counter[str]
+        The number of rejected records by error code.
+
+    Examples
+    --------
+    >>> from pathlib import Path
+    >>> with FIRDSQuarantine(Path('data/firds_quarantine.jsonl'), source='DLTINS_20210117_01of01.xml') as quarantine:
+    ...     quarantine.reject({'Id': 'EZV1JDJ1R5Q9'}, ['FullNm:missing'])
+    """
+
+    def __init__(self, quarantine_path: Path, source: str = '', log_interval: float = 10.0) -> None:
+        """
+        Initialize the quarantine of the invalid FIRDS records.
+
+        Parameters
+        ----------
+        quarantine_path : Path
+            The path to the JSON Lines file of the rejected records.
+        source : str, optional
+            The name of the FIRDS XML file of the records, by default ''.
+        log_interval : float, optional
+            The minimum number of seconds between the summaries logged while records are rejected, by default 10.
+            A last summary is logged when the quarantine is closed.
+        """
+        self.quarantine_path = quarantine_path
+        self.source = source
+        self.log_interval = log_interval
+        self.reject_count = 0
+        self.error_counts: Counter[str] = Counter()
+
+        self._f: IO[str] | None = None
+        self._logged_at = time.monotonic()
+
+    def __enter__(self) -> 'FIRDSQuarantine':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def reject(self, firds_dict: dict[str, str | None], error_codes: list[str]) -> None:
+        """
+        Quarantine an invalid FIRDS record.
+
+        Parameters
+        ----------
+        firds_dict : dict[str, str | None]
+            The invalid FIRDS record.
+        error_codes : list[str]
+            The compact error codes of the FIRDS record.
+        """
+        if self._f is None:
+            self._f = self.quarantine_path.open('a', encoding='utf-8')
+
+        self._f.write(json.dumps({'source': self.source, 'errors': error_codes, 'record': firds_dict}) + '\n')
+        self.reject_count += 1
+        self.error_counts.update(error_codes)
+
+        if time.monotonic() - self._logged_at >= self.log_interval:
+            self._log_summary()
+
+    def _log_summary(self) -> None:
+        errors = ', '.join(f'{error_code} ({count})' for error_code, count in self.error_counts.most_common(5))
+        logger.warning(
+            f'Quarantined {self.reject_count} invalid FIRDS records of {self.source or "the FIRDS XML file"} '
+            f'to {self.quarantine_path}: {errors}'
+        )
+        self._logged_at = time.monotonic()
+
+    def close(self) -> None:
+        """Close the quarantine file, logging a summary of the rejected records, if any."""
+        if self._f is None:
+            return
+
+        self._f.close()
+        self._f = None
+        self._log_summary()
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
@@ -0,0 +1,251 @@
+"""Implementation of the HTTP range reader of the remote FIRDS zip files."""
+
+import io
+import re
+from collections import deque
+from typing import IO, TYPE_CHECKING
+from zipfile import ZipFile
+
+import httpx
+
+from etl_processor.exceptions import NetworkError
+
+if TYPE_CHECKING:
+    from collections.abc import Buffer
+
+# the end of central directory record of a zip file is followed by a comment of up to 64 KiB,
+# so the tail fetched along with the probe holds the record, the zip64 locator and usually the central directory
+ZIP_TAIL_SIZE = 65 * 1024
+
+CONTENT_RANGE_PATTERN = re.compile(r'bytes (\d+)-(\d+)/(\d+)')
+
+
+class HTTPRangeFile(io.RawIOBase):
+    """
+    Seekable binary file of a remote resource read with HTTP range requests.
+    The tail of the resource is fetched along with its size, so the central directory of a zip file is read from memory,
+    while the other reads are served from a few windows of block_size bytes fetched on demand.
+    It is not thread-safe, but forks of the file share the tail and fetch their own windows, so the members of a zip file
+    are fetched in parallel through forks of the file.
+
+    Attributes
+    ----------
+    client : httpx.Client
+        The client of the range requests.
+    url : str
+        The URL of the remote resource.
+    size : int
+        The size in bytes of the remote resource.
+    block_size : int
+        The minimum number of bytes fetched by a range request.
+
+    Examples
+    --------
+    >>> import httpx
+    >>> with httpx.Client() as client:
+    ...     firds_range_file = open_http_range_file(client, 'https://example.com/DLTINS_20210117_01of01.zip')
+    """
+
+    def __init__(
+        self,
+        client: httpx.Client,
+        url: str,
+        size: int,
+        tail: bytes = b'',
+        block_size: int = 1024**2,
+        max_windows: int = 2,
+    ) -> None:
+        """
+        Initialize the seekable binary file of a remote resource.
+
+        Parameters
+        ----------
+        client : httpx.Client
+            The client of the range requests.
+        url : str
+            The URL of the remote resource.
+        size : int
+            The size in bytes of the remote resource.
+        tail : bytes, optional
+            The last bytes of the remote resource, if already fetched, by default none.
+        block_size : int, optional
+            The minimum number of bytes fetched by a range request, by default 1 MiB.
+        max_windows : int, optional
+            The number of windows of fetched bytes kept in memory besides the tail, by default 2.
+        """
+        if block_size < 1:
+            raise ValueError('The block size must be at least 1.')
+
+        if max_windows < 1:
+            raise ValueError('The number of windows must be at least 1.')
+
+        super().__init__()
+        self.client = client
+        self.url = url
+        self.size = size
+        self.block_size = block_size
+
+        self._tail = tail
+        self._tail_start = size - len(tail)
+        self._windows: deque[tuple[int, bytes]] = deque(maxlen=max_windows)
+        self._position = 0
+
+    def fork(self) -> 'HTTPRangeFile':
+        """
+        Return a file of the same remote resource, sharing the tail but with its own position and windows.
+
+        Returns
+        -------
+        HTTPRangeFile
+            The fork of the file.
+        """
+        return HTTPRangeFile(
+            self.client,
+            self.url,
+            self.size,
+            tail=self._tail,
+            block_size=self.block_size,
+            max_windows=self._windows.maxlen or 1,
+        )
+
+    def readable(self) -> bool:
+        """Return whether the file is readable, which it always is."""
+        return True
+
+    def seekable(self) -> bool:
+        """Return whether the file is seekable, which it always is."""
+        return True
+
+    def tell(self) -> int:
+        """Return the current position in the remote resource."""
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move to a position in the remote resource, without fetching it."""
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        elif whence != io.SEEK_SET:
+            raise ValueError(f'Invalid whence {whence}.')
+
+        if offset < 0:
+            raise ValueError(f'Negative seek position {offset}.')
+
+        self._position = offset
+        return self._position
+
+    def readinto(self, buffer: 'Buffer') -> int:
+        """Read bytes from the current position into the buffer, fetching the missing windows."""
+        # fill the buffer up to the end of the resource, since the zip file reader does not expect short reads
+        view = memoryview(buffer).cast('B')
+        size = 0
+        while size < len(view) and self._position < self.size:
+            window_start, window = self._window(self._position, len(view) - size)
+            chunk = window[self._position - window_start : self._position - window_start + len(view) - size]
+            view[size : size + len(chunk)] = chunk
+            size += len(chunk)
+            self._position += len(chunk)
+
+        return size
+
+    def _window(self, position: int, size: int) -> tuple[int, bytes]:
+        # the window of fetched bytes holding the position, fetching at least block_size bytes if none does
+        if position >= self._tail_start:
+            return self._tail_start, self._tail
+
+        for window_start, window in self._windows:
+            if window_start <= position < window_start + len(window):
+                return window_start, window
+
+        window_end = min(position + max(size, self.block_size), self._tail_start)
+        window = self._fetch(position, window_end)
+        self._windows.append((position, window))
+        return position, window
+
+    def _fetch(self, start: int, end: int) -> bytes:
+        try:
+            response = self.client.get(self.url, headers={'Range': f'bytes={start}-{end - 1}'})
+            response.raise_for_status()
+
+        except httpx.HTTPError as exc:
+            raise NetworkError(f'Error fetching the bytes {start}-{end - 1} of {self.url}.') from exc
+
+        if response.status_code != httpx.codes.PARTIAL_CONTENT or len(response.content) != end - start:
+            raise NetworkError(f'The server did not return the bytes {start}-{end - 1} of {self.url}.')
+
+        return response.content
+
+
+def open_http_range_file(
+    client: httpx.Client,
+    url: str,
+    block_size: int = 1024**2,
+    tail_size: int = ZIP_TAIL_SIZE,
+) -> HTTPRangeFile | None:
+    """
+    Open a remote resource as a seekable file if its server supports HTTP range requests.
+    A single range request probes the server and fetches the tail of the resource along with its size.
+
+    Parameters
+    ----------
+    client : httpx.Client
+        The client of the range requests.
+    url : str
+        The URL of the remote resource.
+    block_size : int, optional
+        The minimum number of bytes fetched by a range request, by default 1 MiB.
+    tail_size : int, optional
+        The number of bytes fetched from the end of the resource by the probe, by default 65 KiB.
+
+    Returns
+    -------
+    HTTPRangeFile | None
+        The seekable file of the remote resource, or None if its server does not support range requests.
+
+    Raises
+    ------
+    httpx.HTTPError
+        If the probe fails.
+    """
+    # the body of a server ignoring the range is not read, so the resource is not downloaded twice
+    with client.stream('GET', url, headers={'Range': f'bytes=-{tail_size}'}) as response:
+        if response.status_code == httpx.codes.REQUESTED_RANGE_NOT_SATISFIABLE:
+            return None
+
+        response.raise_for_status()
+        if response.status_code != httpx.codes.PARTIAL_CONTENT:
+            return None
+
+        content_range = CONTENT_RANGE_PATTERN.fullmatch(response.headers.get('Content-Range', ''))
+        if content_range is None:
+            return None
+
+        tail = response.read()
+
+    return HTTPRangeFile(client, url, size=int(content_range.group(3)), tail=tail, block_size=block_size)
+
+
+def open_zip_member(http_range_file: HTTPRangeFile, name: str) -> IO[bytes]:
+    """
+    Open a member of a remote zip file through its own fork of the remote file.
+
+    Parameters
+    ----------
+    http_range_file : HTTPRangeFile
+        The remote zip file.
+    name : str
+        The name of the member.
+
+    Returns
+    -------
+    IO[bytes]
+        The decompressed member, whose CRC-32 is verified once read to the end.
+    """
+    return ZipFile(http_range_file.fork()).open(name)
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
@@ -0,0 +1,251 @@
+"""Implementation of the retry policy of the HTTP requests."""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+import httpx
+
+from etl_processor.logger import logger
+from etl_processor.models import HTTPAttempt
+
+
+class RetryPolicy:
+    """
+    Exponential backoff policy for retrying HTTP requests.
+    The requests are retried on transport errors and on the retryable status codes, honouring the Retry-After header
+    of the responses. Otherwise, the delay doubles with every attempt up to a maximum, with full jitter.
+
+    Attributes
+    ----------
+    max_attempts : int
+        The maximum number of attempts of a request, including the first one.
+    backoff_factor : float
+        The delay in seconds before the first retry, doubled on every further retry.
+    max_backoff : float
+        The maximum delay in seconds before a retry, also bounding the Retry-After delays.
+    retry_statuses : frozenset[int]
+        The response status codes that are retried.
+    retry_methods : frozenset[str]
+        The request methods that are retried.
+    jitter : bool
+        Whether to draw the delays uniformly between zero and the exponential backoff.
+
+    Examples
+    --------
+    >>> retry_policy = RetryPolicy(
+    ...     max_attempts=3,
+    ...     backoff_factor=0.5,
+    ...     jitter=False,
+    ... )
+    >>> retry_policy.backoff(3)
+    2.0
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 60.0,
+        retry_statuses: frozenset[int] = frozenset({429, 500, 502, 503, 504}),
+        retry_methods: frozenset[str] = frozenset({'GET', 'HEAD'}),
+        jitter: bool = True,
+    ) -> None:
+        """
+        Initialize the retry policy.
+
+        Parameters
+        ----------
+        max_attempts : int, optional
+            The maximum number of attempts of a request, including the first one, by default 5.
+        backoff_factor : float, optional
+            The delay in seconds before the first retry, doubled on every further retry, by default 0.5.
+        max_backoff : float, optional
+            The maximum delay in seconds before a retry, also bounding the Retry-After delays, by default 60.
+        retry_statuses : frozenset[int], optional
+            The response status codes that are retried, by default 429, 500, 502, 503 and 504.
+        retry_methods : frozenset[str], optional
+            The request methods that are retried, by default the idempotent GET and HEAD.
+        jitter : bool, optional
+            Whether to draw the delays uniformly between zero and the exponential backoff, by default True.
+        """
+        if max_attempts < 1:
+            raise ValueError('The maximum number of attempts must be at least 1.')
+
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.retry_statuses = retry_statuses
+        self.retry_methods = retry_methods
+        self.jitter = jitter
+
+    def backoff(self, attempt: int, response: httpx.Response | None = None) -> float:
+        """
+        Get the delay in seconds before retrying a failed attempt.
+
+        Parameters
+        ----------
+        attempt : int
+            The number of the failed attempt, starting at 1.
+        response : httpx.Response | None, optional
+            The response of the failed attempt, if any, by default None.
+
+        Returns
+        -------
+        float
+            The delay in seconds.
+        """
+        retry_after = self._retry_after(response) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+
+        delay = min(self.backoff_factor * 2.0 ** (attempt - 1), self.max_backoff)
+        if self.jitter:
+            return random.uniform(0, delay)
+
+        return delay
+
+    def _retry_after(self, response: httpx.Response) -> float | None:
+        # the retry-after header is either a number of seconds or an http date
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is None:
+            return None
+
+        try:
+            return max(float(retry_after), 0.0)
+
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+
+        except (TypeError, ValueError):
+            return None
+
+        return max(retry_at.timestamp() - time.time(), 0.0)
+
+
+class RetryTransport(httpx.BaseTransport):
+    """
+    HTTP transport retrying the requests of a wrapped transport with a retry policy.
+    The attempts are retried until their response arrives, so it also retries the streamed requests, but not the errors
+    raised while the content of a response is read, which the caller retries, e.g. with a range request.
+    The outcome and latency of every attempt are recorded.
+
+    Attributes
+    ----------
+    transport : httpx.BaseTransport
+        The wrapped transport sending the requests.
+    retry_policy : RetryPolicy
+        The retry policy of the requests.
+    attempts : list[HTTPAttempt]
+        The attempts of the requests sent so far.
+
+    Examples
+    --------
+    >>> client = httpx.Client(
+    ...     transport=RetryTransport(
+    ...         transport=httpx.HTTPTransport(),
+    ...         retry_policy=RetryPolicy(),
+    ...     ),
+    ... )
+    """
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        retry_policy: RetryPolicy,
+        attempts: list[HTTPAttempt] | None = None,
+    ) -> None:
+        """
+        Initialize the retry transport.
+
+        Parameters
+        ----------
+        transport : httpx.BaseTransport
+            The wrapped transport sending the requests.
+        retry_policy : RetryPolicy
+            The retry policy of the requests.
+        attempts : list[HTTPAttempt] | None, optional
+            The list to record the attempts of the requests in, by default a new list.
+        """
+        self.transport = transport
+        self.retry_policy = retry_policy
+        self.attempts = attempts if attempts is not None else []
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """
+        Send a request, retrying the failed attempts.
+
+        Parameters
+        ----------
+        request : httpx.Request
+            The request to send.
+
+        Returns
+        -------
+        httpx.Response
+            The response of the last attempt.
+
+        Raises
+        ------
+        httpx.TransportError
+            If the last attempt fails with a transport error.
+        """
+        max_attempts = self.retry_policy.max_attempts if request.method in self.retry_policy.retry_methods else 1
+
+        attempt = 1
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self.transport.handle_request(request)
+
+            except httpx.TransportError as exc:
+                self._record(request, attempt, start, error=repr(exc))
+                if attempt >= max_attempts:
+                    raise
+
+                delay = self.retry_policy.backoff(attempt)
+                logger.warning(f'Error requesting {request.url} ({exc!r}), retrying in {delay:.2f}s')
+
+            else:
+                self._record(request, attempt, start, status_code=response.status_code)
+                if attempt >= max_attempts or response.status_code not in self.retry_policy.retry_statuses:
+                    return response
+
+                delay = self.retry_policy.backoff(attempt, response)
+                logger.warning(f'Error requesting {request.url} ({response.status_code}), retrying in {delay:.2f}s')
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        """Close the wrapped transport."""
+        self.transport.close()
+
+    def _record(
+        self,
+        request: httpx.Request,
+        attempt: int,
+        start: float,
+        status_code: int | None = None,
+        error: str | None = None,
+    ) -> None:
+        http_attempt = HTTPAttempt(
+            method=request.method,
+            url=str(request.url),
+            attempt=attempt,
+            status_code=status_code,
+            error=error,
+            elapsed=time.perf_counter() - start,
+        )
+        logger.debug(f'Requested {http_attempt.url} in {http_attempt.elapsed:.3f}s (attempt {attempt})')
+        self.attempts.append(http_attempt)
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
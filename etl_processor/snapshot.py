@@ -0,0 +1,211 @@
+"""Implementation of the latest-wins snapshot of the FIRDS CSV."""
+
+import csv
+import os
+import sqlite3
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path
+from typing import IO
+
+from etl_processor.logger import logger
+from etl_processor.models import FIRDSManifest
+
+FIRDS_ID_COLUMN = 'FinInstrmGnlAttrbts.Id'
+
+
+def _iter_firds_csv_rows(f: IO[bytes], byte_start: int, byte_end: int) -> Iterator[tuple[int, bytes]]:
+    # a quoted field may span several lines, so a row only ends at a line whose quotes are balanced
+    f.seek(byte_start)
+    offset = byte_start
+    row = b''
+    while offset < byte_end:
+        line = f.readline()
+        if not line:
+            break
+
+        row += line
+        offset += len(line)
+        if row.count(b'"') % 2 == 0:
+            yield offset - len(row), row
+            row = b''
+
+
+def _firds_csv_row_id(row: bytes, id_index: int) -> str:
+    if b'"' not in row:
+        return row.rstrip(b'\r\n').split(b',')[id_index].decode()
+
+    return next(csv.reader([row.decode()]))[id_index]
+
+
+class FIRDSSnapshot:
+    """
+    Latest-wins snapshot of the FIRDS CSV.
+    Every DLTINS file is a delta, so a financial instrument is extracted once per file that records it.
+    The snapshot indexes the identifier of every financial instrument to the byte range of its latest row in the FIRDS CSV,
+    and writes one current row per financial instrument.
+
+    Attributes
+    ----------
+    firds_csv_path : Path
+        The path to the FIRDS CSV.
+    index_path : Path | None
+        The path to the on-disk index of the snapshot, or None to keep the index in memory.
+    batch_size : int
+        The number of rows upserted to the index at once.
+
+    Examples
+    --------
+    >>> import tempfile
+    >>> from datetime import datetime, timezone
+    >>> from etl_processor.models import FIRDSFileRows
+    >>> data_dir = Path(tempfile.mkdtemp())
+    >>> with (data_dir / 'firds.csv').open('w', newline='') as f:
+    ...     csv.writer(f).writerows([['FinInstrmGnlAttrbts.Id', 'FullNm'], ['ID1', 'old'], ['ID2', 'other'], ['ID1', 'new']])
+    >>> firds_manifest = FIRDSManifest(columns=['FinInstrmGnlAttrbts.Id', 'FullNm'], header_size=31)
+    >>> firds_manifest.files = [
+    ...     FIRDSFileRows(
+    ...         file_name=f'DLTINS_202101{day}.zip',
+    ...         checksum=f'{day}',
+    ...         version=1,
+    ...         publication_date=datetime(2021, 1, day, tzinfo=timezone.utc),
+    ...         row_start=row_start,
+    ...         row_count=row_count,
+    ...         byte_start=byte_start,
+    ...         byte_end=byte_end,
+    ...     )
+    ...     for day, row_start, row_count, byte_start, byte_end in [(17, 0, 2, 31, 51), (18, 2, 1, 51, 60)]
+    ... ]
+    >>> with FIRDSSnapshot(data_dir / 'firds.csv') as firds_snapshot:
+    ...     firds_snapshot.index(firds_manifest)
+    ...     firds_snapshot.write(data_dir / 'firds_snapshot.csv')
+    3
+    2
+    >>> print((data_dir / 'firds_snapshot.csv').read_text(), end='')
+    FinInstrmGnlAttrbts.Id,FullNm
+    ID2,other
+    ID1,new
+    """
+
+    def __init__(self, firds_csv_path: Path, index_path: Path | None = None, batch_size: int = 10**4) -> None:
+        """
+        Initialize the latest-wins snapshot of the FIRDS CSV.
+
+        Parameters
+        ----------
+        firds_csv_path : Path
+            The path to the FIRDS CSV.
+        index_path : Path | None, optional
+            The path to the on-disk index of the snapshot, by default None.
+            The index is a sqlite table from the identifier of every financial instrument to the byte range of its row,
+            so it stays compact regardless of the width of the rows. Without a path, the index is kept in memory.
+        batch_size : int, optional
+            The number of rows upserted to the index at once, by default 10**4.
+        """
+        if batch_size < 1:
+            raise ValueError('The batch size must be at least 1.')
+
+        self.firds_csv_path = firds_csv_path
+        self.index_path = index_path
+        self.batch_size = batch_size
+
+        if index_path is not None:
+            index_path.unlink(missing_ok=True)
+
+        # the index is rebuilt on every snapshot, so it needs neither a journal nor durable writes
+        self._connection = sqlite3.connect(index_path if index_path is not None else ':memory:')
+        self._connection.execute('PRAGMA journal_mode = OFF')
+        self._connection.execute('PRAGMA synchronous = OFF')
+        self._connection.execute(
+            'CREATE TABLE firds_snapshot (id TEXT PRIMARY KEY, byte_start INTEGER, byte_size INTEGER) WITHOUT ROWID'
+        )
+
+    def __enter__(self) -> 'FIRDSSnapshot':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the index of the snapshot, removing it from disk."""
+        self._connection.close()
+        if self.index_path is not None:
+            self.index_path.unlink(missing_ok=True)
+
+    def index(self, firds_manifest: FIRDSManifest) -> int:
+        """
+        Index the latest row of every financial instrument of the FIRDS CSV.
+        The rows of the FIRDS reference documents are indexed in the order of their publication dates, and in the order
+        of the FIRDS CSV within a document, so a later row replaces the earlier rows of the same financial instrument.
+
+        Parameters
+        ----------
+        firds_manifest : FIRDSManifest
+            The manifest of the FIRDS CSV.
+
+        Returns
+        -------
+        int
+            The number of rows indexed.
+        """
+        id_index = firds_manifest.columns.index(FIRDS_ID_COLUMN)
+
+        # the sort is stable, so the documents published at once keep the order of the FIRDS CSV
+        firds_files = sorted(firds_manifest.files, key=lambda firds_file: firds_file.publication_date)
+
+        row_count = 0
+        with self.firds_csv_path.open('rb') as f:
+            for firds_file in firds_files:
+                rows = _iter_firds_csv_rows(f, firds_file.byte_start, firds_file.byte_end)
+                while batch := list(islice(rows, self.batch_size)):
+                    self._connection.executemany(
+                        'INSERT OR REPLACE INTO firds_snapshot VALUES (?, ?, ?)',
+                        ((_firds_csv_row_id(row, id_index), byte_start, len(row)) for byte_start, row in batch),
+                    )
+                    row_count += len(batch)
+
+        self._connection.commit()
+        return row_count
+
+    def __len__(self) -> int:
+        (count,) = self._connection.execute('SELECT COUNT(*) FROM firds_snapshot').fetchone()
+        return int(count)
+
+    def write(self, snapshot_path: Path) -> int:
+        """
+        Write the latest row of every financial instrument to the snapshot CSV.
+        The rows are copied from the FIRDS CSV in the order of their byte offsets, so the FIRDS CSV is read forward.
+
+        Parameters
+        ----------
+        snapshot_path : Path
+            The path to the snapshot CSV.
+
+        Returns
+        -------
+        int
+            The number of rows of the snapshot CSV, not counting the header.
+        """
+        snapshot_tmp_path = snapshot_path.with_suffix('.csv.tmp')
+
+        row_count = 0
+        with self.firds_csv_path.open('rb') as firds_csv, snapshot_tmp_path.open('wb') as f:
+            # the header is the first line of the FIRDS CSV
+            f.write(firds_csv.readline())
+
+            rows = self._connection.execute('SELECT byte_start, byte_size FROM firds_snapshot ORDER BY byte_start')
+            for byte_start, byte_size in rows:
+                firds_csv.seek(byte_start)
+                f.write(firds_csv.read(byte_size))
+                row_count += 1
+
+        # the snapshot is replaced atomically, so it is never left half-written
+        os.replace(snapshot_tmp_path, snapshot_path)
+        logger.info(f'Wrote {row_count} financial instruments to the FIRDS snapshot at {snapshot_path}')
+        return row_count
+
+
+if __name__ == '__main__':
+    import doctest
+
+    doctest.testmod()
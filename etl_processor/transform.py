@@ -1,13 +1,526 @@
 """Implementation of the FIRDS transformation tool."""
 
+import hashlib
+import io
+import os
+import shutil
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from contextlib import AbstractContextManager, ExitStack, nullcontext
 from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Literal
 
 import pandas as pd
+from pydantic import ValidationError
 
 from etl_processor.exceptions import TransformationError
+from etl_processor.files import atomic_write_json
 from etl_processor.logger import logger
+from etl_processor.models import FIRDS, FIRDSChunk, FIRDSDataset, FIRDSManifest, FIRDSWatermark
+from etl_processor.parquet import FIRDS_DICTIONARY_COLUMNS, firds_arrow_schema, import_pyarrow
+from etl_processor.pipeline import CompiledPipeline, SubstringCounts, TransformPipeline
 from etl_processor.tool import Tool
 
+if TYPE_CHECKING:
+    from collections.abc import Buffer
+
+    import pyarrow as pa
+
+# the number of bytes of the head and of the tail of the transformed prefix of the FIRDS CSV hashed by the watermark
+WATERMARK_SAMPLE_SIZE = 64 * 1024
+
+# the bytes per row assumed to size the first chunk of a memory budget, before any chunk is measured.
+# a financial instrument takes a few hundred bytes as python strings, so the first chunk stays within the budget
+INITIAL_BYTES_PER_ROW = 1024
+
+
+def _transform_chunk(chunk: pd.DataFrame, header: bool, pipeline: CompiledPipeline) -> str:
+    # apply the planned pipeline to a chunk of the firds csv in a single pass and render it as csv text.
+    # it is a module function, so the chunks are pickled to the worker processes of the parallel transformation
+    return pipeline.apply(chunk).to_csv(header=header, index=False)
+
+
+def _iter_csv_chunks(reader: Any, chunk_sizer: 'ChunkSizer') -> Iterator[pd.DataFrame]:
+    # read the chunks of the pandas csv reader, each sized by the chunk sizer when it is read
+    while True:
+        try:
+            yield reader.get_chunk(chunk_sizer.chunk_size)
+
+        except StopIteration:
+            return
+
+
+def _iter_arrow_chunks(
+    batches: Iterator['pa.RecordBatch'],
+    schema: 'pa.Schema',
+    chunk_sizer: 'ChunkSizer',
+) -> Iterator['pa.Table']:
+    # regroup the record batches of the csv reader, sized in bytes, into tables of the rows of the chunk sizer.
+    # an empty csv still yields an empty table, so the header of the transformed file is written
+    pa, _ = import_pyarrow()
+
+    pending: list[Any] = []
+    pending_rows = 0
+    empty = True
+    for batch in batches:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+
+        while pending_rows >= (chunk_size := chunk_sizer.chunk_size):
+            table = pa.Table.from_batches(pending, schema=schema)
+            yield table.slice(0, chunk_size)
+
+            pending = table.slice(chunk_size).to_batches()
+            pending_rows -= chunk_size
+            empty = False
+
+    if pending_rows or empty:
+        yield pa.Table.from_batches(pending, schema=schema)
+
+
+def _iter_parquet_batches(parquet_paths: Iterable[Path], schema: 'pa.Schema') -> Iterator['pa.RecordBatch']:
+    # read the record batches of the columns of the schema from the parquet files, in order.
+    # the batches are cast to the schema, so the dictionary columns of the pyarrow engine are read as dictionaries
+    pa, pq = import_pyarrow()
+
+    dictionary_columns = [field.name for field in schema if pa.types.is_dictionary(field.type)]
+    for parquet_path in parquet_paths:
+        parquet_file = pq.ParquetFile(parquet_path, read_dictionary=dictionary_columns)
+        for batch in parquet_file.iter_batches(columns=schema.names):
+            yield from pa.Table.from_batches([batch]).cast(schema).to_batches()
+
+
+class _ArrowChunkWriter:
+    # a writer of the arrow tables transformed by the pipeline to the transformed format of the pyarrow engine.
+    # the strings of the tables are never python objects in the transformed chunks, and the writer takes the schema of
+    # the first transformed chunk, which the next chunks are cast to
+    def __init__(
+        self,
+        sink: Path | IO[bytes],
+        pipeline: CompiledPipeline,
+        output_format: str,
+        chunk_sizer: 'ChunkSizer',
+        include_header: bool = True,
+    ) -> None:
+        self._pa, _ = import_pyarrow()
+        self._sink = sink
+        self._pipeline = pipeline
+        self._output_format = output_format
+        self._chunk_sizer = chunk_sizer
+        self._include_header = include_header
+        self._types_mapper = {self._pa.string(): pd.StringDtype('pyarrow')}.get
+        self._writer: Any = None
+        self._schema: Any = None
+
+    def write(self, table: 'pa.Table') -> None:
+        chunk = self._pipeline.apply(table.to_pandas(types_mapper=self._types_mapper))
+        transformed_table = self._pa.Table.from_pandas(chunk, preserve_index=False)
+
+        if self._writer is None:
+            self._schema = transformed_table.schema
+            self._writer = self._open_writer(self._schema)
+
+        self._writer.write_table(transformed_table.cast(self._schema))
+        self._chunk_sizer.observe(table.num_rows, self._chunk_sizer.measure(table, chunk, transformed_table))
+
+    def _open_writer(self, schema: 'pa.Schema') -> Any:
+        _, pq = import_pyarrow()
+        from pyarrow import csv as pa_csv
+
+        if self._output_format == 'parquet':
+            return pq.ParquetWriter(self._sink, schema)
+
+        write_options = pa_csv.WriteOptions(include_header=self._include_header)
+        return pa_csv.CSVWriter(self._sink, schema, write_options=write_options)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+def _fingerprint(firds_csv_path: Path, byte_offset: int) -> str:
+    # a rewrite of the firds csv, such as the rows of a changed file replaced by the incremental extraction, changes
+    # its header or shifts the rows before the watermark, so only the head and the tail of the prefix are hashed,
+    # instead of the whole history
+    digest = hashlib.sha256(str(byte_offset).encode())
+    with firds_csv_path.open('rb') as f:
+        digest.update(f.read(min(byte_offset, WATERMARK_SAMPLE_SIZE)))
+        f.seek(max(0, byte_offset - WATERMARK_SAMPLE_SIZE))
+        digest.update(f.read(byte_offset - f.tell()))
+
+    return digest.hexdigest()
+
+
+def _complete_size(firds_csv_path: Path, size: int) -> int:
+    # the size of the complete rows of the first size bytes of the firds csv, without a row half-written by the
+    # extraction at its end. a file without a line break is returned whole, as a header without rows
+    with firds_csv_path.open('rb') as f:
+        end = size
+        while end > 0:
+            start = max(0, end - WATERMARK_SAMPLE_SIZE)
+            f.seek(start)
+            line_break = f.read(end - start).rfind(b'\n')
+            if line_break >= 0:
+                return start + line_break + 1
+
+            end = start
+
+    return size
+
+
+class _ByteRangeReader(io.RawIOBase):
+    # a raw reader of a binary file from its current position up to byte_end, so the rows appended to the firds csv
+    # after its size was taken are left to the next transformation
+    def __init__(self, f: IO[bytes], byte_end: int) -> None:
+        super().__init__()
+        self._f = f
+        self._remaining = max(0, byte_end - f.tell())
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: 'Buffer') -> int:
+        view = memoryview(buffer).cast('B')
+        data = self._f.read(min(len(view), self._remaining))
+        view[: len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+    def close(self) -> None:
+        self._f.close()
+        super().close()
+
+
+def _open_byte_range(firds_csv_path: Path, byte_offset: int, byte_end: int | None) -> IO[bytes]:
+    # open the bytes of the firds csv from byte_offset to byte_end, or to its end
+    f = firds_csv_path.open('rb')
+    f.seek(byte_offset)
+    if byte_end is None:
+        return f
+
+    return io.BufferedReader(_ByteRangeReader(f, byte_end))
+
+
+class ChunkSizer:
+    """
+    Sizer of the chunks of the FIRDS transformation, which records the chunks transformed.
+    Without a memory budget, every chunk has max_chunk_size rows. With a memory budget, the memory of every chunk and
+    of its transformation is measured, and the next chunk is sized from the bytes per row of the previous chunks, so the
+    chunks held in memory at once fit in the budget whatever the length of the full names and the types of the columns.
+
+    Attributes
+    ----------
+    max_chunk_size : int
+        The maximum number of rows of a chunk.
+    memory_budget : int | None
+        The memory budget in bytes of the chunks held in memory at once, if any.
+    max_pending_chunks : int
+        The number of chunks held in memory at once, which share the memory budget.
+    chunk_size : int
+        The number of rows of the next chunk.
+    chunks : list[FIRDSChunk]
+        The chunks transformed so far.
+
+    Examples
+    --------
+    >>> chunk_sizer = ChunkSizer(max_chunk_size=10**6, memory_budget=256 * 1024**2)
+    >>> chunk_sizer.observe(chunk_sizer.chunk_size, 100 * 1024**2)
+    >>> chunk_sizer.chunk_size
+    671088
+    """
+
+    def __init__(
+        self,
+        max_chunk_size: int = 10**6,
+        memory_budget: int | None = None,
+        max_pending_chunks: int = 1,
+    ) -> None:
+        """
+        Initialize the sizer of the chunks of the FIRDS transformation.
+
+        Parameters
+        ----------
+        max_chunk_size : int, optional
+            The maximum number of rows of a chunk, by default 10**6. It is the size of every chunk without a memory budget.
+        memory_budget : int | None, optional
+            The memory budget in bytes of the chunks held in memory at once, by default None.
+            The first chunk is sized for 1 KiB per row, and the next chunks for the bytes per row measured so far,
+            or of the last chunk if its rows were larger.
+        max_pending_chunks : int, optional
+            The number of chunks held in memory at once, such as the chunks in flight in the worker processes,
+            which share the memory budget, by default 1.
+        """
+        if max_chunk_size < 1:
+            raise ValueError('The chunk size must be at least 1.')
+
+        if memory_budget is not None and memory_budget < 1:
+            raise ValueError('The memory budget must be at least 1 byte.')
+
+        if max_pending_chunks < 1:
+            raise ValueError('The maximum number of pending chunks must be at least 1.')
+
+        self.max_chunk_size = max_chunk_size
+        self.memory_budget = memory_budget
+        self.max_pending_chunks = max_pending_chunks
+        self.chunks: list[FIRDSChunk] = []
+
+        self._row_count = 0
+        self._memory = 0
+        self.chunk_size = max_chunk_size if memory_budget is None else self._fit(memory_budget, INITIAL_BYTES_PER_ROW)
+
+    def _fit(self, memory_budget: int, bytes_per_row: float) -> int:
+        chunk_size = int(memory_budget / (bytes_per_row * self.max_pending_chunks))
+        return max(1, min(self.max_chunk_size, chunk_size))
+
+    def measure(self, *objects: Any) -> int | None:
+        """
+        Measure the memory of the data frames, tables and strings of a chunk, with a memory budget only.
+        The memory of the data frames includes their Python strings, so it is only measured with a memory budget.
+
+        Parameters
+        ----------
+        *objects : Any
+            The data frames, Arrow tables and strings of the chunk.
+
+        Returns
+        -------
+        int | None
+            The size in bytes of the objects, or None without a memory budget.
+        """
+        if self.memory_budget is None:
+            return None
+
+        memory = 0
+        for obj in objects:
+            if isinstance(obj, pd.DataFrame):
+                memory += int(obj.memory_usage(deep=True).sum())
+            elif isinstance(obj, str):
+                memory += sys.getsizeof(obj)
+            else:
+                memory += obj.nbytes
+
+        return memory
+
+    def observe(self, row_count: int, memory: int | None = None) -> None:
+        """
+        Record a transformed chunk and size the next chunk from its memory.
+
+        Parameters
+        ----------
+        row_count : int
+            The number of rows of the chunk.
+        memory : int | None, optional
+            The size in bytes of the chunk and of its transformation, by default None.
+        """
+        self.chunks.append(FIRDSChunk(row_count=row_count, memory=memory))
+        if memory is None or self.memory_budget is None or not row_count:
+            return
+
+        # the bytes per row of the chunks so far, unless the rows of the last chunk were larger,
+        # so a run of long full names shrinks the next chunk at once
+        self._row_count += row_count
+        self._memory += memory
+        chunk_size = self._fit(self.memory_budget, max(self._memory / self._row_count, memory / row_count))
+        if chunk_size != self.chunk_size:
+            logger.debug(f'Sizing the next FIRDS chunk to {chunk_size} rows')
+
+        self.chunk_size = chunk_size
+
+    @property
+    def peak_memory(self) -> int | None:
+        """
+        Return the peak memory of the chunks held in memory at once.
+        It is the largest memory of max_pending_chunks consecutive chunks, which are in memory at once at most.
+
+        Returns
+        -------
+        int | None
+            The peak memory in bytes of the chunks, or None if no chunk memory was measured.
+        """
+        memories = [chunk.memory for chunk in self.chunks if chunk.memory is not None]
+        if not memories:
+            return None
+
+        window = min(self.max_pending_chunks, len(memories))
+        return max(sum(memories[start : start + window]) for start in range(len(memories) - window + 1))
+
+
+class FIRDSTransformWriter:
+    """
+    Writer of the FIRDS records transformed in memory, without a round-trip through the FIRDS CSV.
+    The rows are buffered and every chunk of chunk_size rows is transformed by the pipeline and written to the
+    transformed FIRDS data, dropping the columns unused by the pipeline before the chunk is built. The transformed file
+    is only moved to its path on close, so it is never left half-written.
+    It mirrors the csv writers, writing sequences of values with writerows and mappings by column with writerow.
+
+    Attributes
+    ----------
+    transformed_path : Path
+        The path to the transformed FIRDS data.
+    pipeline : CompiledPipeline
+        The pipeline planned for the columns of the FIRDS records.
+    chunk_size : int
+        The maximum number of rows of every transformed chunk.
+    chunk_sizer : ChunkSizer
+        The sizer of the transformed chunks, which records their sizes and memory.
+    engine : Literal['pandas', 'pyarrow']
+        The engine building and writing the chunks.
+    output_format : Literal['csv', 'parquet']
+        The format of the transformed FIRDS data.
+
+    Examples
+    --------
+    >>> with FIRDSTransformer(data_dir='data').open_writer() as writer:
+    ...     writer.writerows([('EZV1JDJ1R5Q9', 'Foreign_Exchange Forward', 'JFTXFP', False, 'SEK', '2138004TYNQCB7MLTG76')])
+    """
+
+    def __init__(
+        self,
+        transformed_path: Path,
+        pipeline: CompiledPipeline,
+        chunk_size: int = 10**6,
+        engine: Literal['pandas', 'pyarrow'] = 'pandas',
+        output_format: Literal['csv', 'parquet'] = 'csv',
+        memory_budget: int | None = None,
+    ) -> None:
+        """
+        Initialize the writer of the FIRDS records transformed in memory.
+
+        Parameters
+        ----------
+        transformed_path : Path
+            The path to the transformed FIRDS data.
+        pipeline : CompiledPipeline
+            The pipeline planned for the columns of the FIRDS records, that is, the CSV header of the FIRDS model.
+        chunk_size : int, optional
+            The maximum number of rows of every transformed chunk, by default 10**6.
+        engine : Literal['pandas', 'pyarrow'], optional
+            The engine building and writing the chunks, by default 'pandas'. The pyarrow engine types the columns
+            by the FIRDS model and writes the chunks with the Arrow CSV or Parquet writers.
+        output_format : Literal['csv', 'parquet'], optional
+            The format of the transformed FIRDS data, by default 'csv'. The parquet format requires the pyarrow engine.
+        memory_budget : int | None, optional
+            The memory budget in bytes of a transformed chunk, by default None. The chunks are sized from the bytes
+            per row measured for the previous chunks instead of chunk_size rows, which only bounds them.
+        """
+        if chunk_size < 1:
+            raise ValueError('The chunk size must be at least 1.')
+
+        if output_format == 'parquet' and engine != 'pyarrow':
+            raise ValueError('The parquet output format is only supported by the pyarrow engine.')
+
+        self.transformed_path = transformed_path
+        self.pipeline = pipeline
+        self.chunk_size = chunk_size
+        self.chunk_sizer = ChunkSizer(max_chunk_size=chunk_size, memory_budget=memory_budget)
+        self.engine = engine
+        self.output_format = output_format
+
+        # the positions of the columns used by the pipeline in the rows of the FIRDS records
+        self._header = FIRDS.csv_header()
+        self._positions = [self._header.index(column) for column in pipeline.source_columns]
+        self._rows: list[tuple[Any, ...]] = []
+        self._chunk_count = 0
+
+        self._tmp_path = transformed_path.with_name(f'{transformed_path.name}.tmp')
+        self._tmp_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file: Any = None
+        self._arrow_writer: _ArrowChunkWriter | None = None
+        self._arrow_schema: Any = None
+        if engine == 'pyarrow':
+            pa, _ = import_pyarrow()
+            schema = firds_arrow_schema(dictionary_columns=FIRDS_DICTIONARY_COLUMNS)
+            self._arrow_schema = pa.schema([schema.field(column) for column in pipeline.source_columns])
+            self._arrow_writer = _ArrowChunkWriter(self._tmp_path, pipeline, output_format, self.chunk_sizer)
+        else:
+            self._file = self._tmp_path.open('w', newline='', encoding='utf-8')
+
+    def __enter__(self) -> 'FIRDSTransformWriter':
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *exc_info: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def writerows(self, rows: Iterable[Iterable[Any]]) -> None:
+        """
+        Write rows of values in the order of the CSV header of the FIRDS model.
+
+        Parameters
+        ----------
+        rows : Iterable[Iterable[Any]]
+            The rows of values.
+        """
+        self._rows.extend(tuple(row) for row in rows)
+        while len(self._rows) >= (chunk_size := self.chunk_sizer.chunk_size):
+            rows_chunk = self._rows[:chunk_size]
+            del self._rows[:chunk_size]
+            self._write_chunk(rows_chunk)
+
+    def writerow(self, row: Mapping[str, Any]) -> None:
+        """
+        Write a row of values keyed by the CSV header of the FIRDS model.
+
+        Parameters
+        ----------
+        row : Mapping[str, Any]
+            The row of values.
+        """
+        self.writerows([[row[column] for column in self._header]])
+
+    def _columns(self, rows: list[tuple[Any, ...]]) -> list[list[Any]]:
+        # transpose the rows to the columns used by the pipeline, so the unused columns are never converted
+        return [[row[position] for row in rows] for position in self._positions]
+
+    def _write_chunk(self, rows: list[tuple[Any, ...]]) -> None:
+        columns = self._columns(rows)
+        header = self._chunk_count == 0
+        self._chunk_count += 1
+
+        if self._file is not None:
+            # an empty chunk has the object columns of an empty firds csv, instead of the float columns of empty lists
+            if rows:
+                chunk = pd.DataFrame(dict(zip(self.pipeline.source_columns, columns, strict=True)))
+            else:
+                chunk = pd.DataFrame(columns=self.pipeline.source_columns, dtype=object)
+
+            transformed_csv = _transform_chunk(chunk, header=header, pipeline=self.pipeline)
+            self._file.write(transformed_csv)
+            self.chunk_sizer.observe(len(rows), self.chunk_sizer.measure(chunk, transformed_csv))
+            return
+
+        # the columns are typed by the firds model, like the chunks read by the arrow csv reader
+        pa, _ = import_pyarrow()
+        arrays = [pa.array(column, type=field.type) for column, field in zip(columns, self._arrow_schema, strict=True)]
+        if self._arrow_writer is not None:
+            self._arrow_writer.write(pa.Table.from_arrays(arrays, schema=self._arrow_schema))
+
+    def close(self) -> None:
+        """Transform the buffered rows and move the transformed file to its path."""
+        # the remaining rows are written as the last chunk, which also writes the header of an empty transformation
+        if self._rows or self._chunk_count == 0:
+            self._write_chunk(self._rows)
+            self._rows = []
+
+        self._close_file()
+        os.replace(self._tmp_path, self.transformed_path)
+
+    def abort(self) -> None:
+        """Discard the transformed file."""
+        self._close_file()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+        if self._arrow_writer is not None:
+            self._arrow_writer.close()
+
 
 class FIRDSTransformer(Tool):
     """
@@ -19,6 +532,26 @@ class FIRDSTransformer(Tool):
         The directory to read and save the extracted FIRDS documents.
     chunk_size : int
         The size of the chunks to process the FIRDS data.
+    partitioned : bool
+        Whether to transform the partitions of the partitioned FIRDS dataset instead of the FIRDS CSV.
+    max_workers : int
+        The number of worker processes transforming the chunks. A single worker transforms the chunks in-process.
+    max_pending_chunks : int
+        The maximum number of chunks read ahead of the transformed chunk written next by the worker processes.
+    engine : Literal['pandas', 'pyarrow']
+        The engine reading and writing the chunks.
+    output_format : Literal['csv', 'parquet']
+        The format of the transformed FIRDS data.
+    pipeline : TransformPipeline
+        The pipeline of column expressions transforming the FIRDS data.
+    derived_columns : list[str]
+        The columns derived by the pipeline.
+    incremental : bool
+        Whether to only transform the rows appended to the FIRDS CSV since the last transformation.
+    memory_budget : int | None
+        The memory budget in bytes of the chunks held in memory at once, if any.
+    chunk_sizer : ChunkSizer
+        The sizer of the chunks of the last transformation, which records their sizes and memory.
 
     Examples
     --------
@@ -32,6 +565,15 @@ class FIRDSTransformer(Tool):
         self,
         data_dir: str | Path,
         chunk_size: int = 10**6,
+        partitioned: bool = False,
+        max_workers: int = 1,
+        max_pending_chunks: int | None = None,
+        engine: Literal['pandas', 'pyarrow'] = 'pandas',
+        output_format: Literal['csv', 'parquet'] = 'csv',
+        substrings: Mapping[str, str] | None = None,
+        pipeline: TransformPipeline | None = None,
+        incremental: bool = False,
+        memory_budget: int | None = None,
     ) -> None:
         """
         Initialize the FIRDS transformation tool.
@@ -42,17 +584,541 @@ class FIRDSTransformer(Tool):
             The directory to read and save the extracted FIRDS documents.
         chunk_size : int, optional
             The size of the chunks to process the FIRDS data, by default 10**6.
+        partitioned : bool, optional
+            Whether to transform the partitions of the partitioned FIRDS dataset instead of the FIRDS CSV, by default False.
+            Every partition is transformed independently to the same path of the firds_transformed dataset,
+            whose manifest records the checksums of the transformed partitions, so the untouched partitions are skipped.
+        max_workers : int, optional
+            The number of worker processes transforming the chunks, by default 1.
+            A single worker transforms the chunks in-process. Otherwise, the chunks read from the FIRDS CSV are
+            transformed and rendered as CSV by the worker processes, and written in the order of the FIRDS CSV.
+        max_pending_chunks : int | None, optional
+            The maximum number of chunks read ahead of the transformed chunk written next by the worker processes,
+            by default twice the number of workers. The chunks transformed out of order wait in this reorder buffer,
+            so the memory of the transformation is bounded by max_pending_chunks times the chunk size.
+        engine : Literal['pandas', 'pyarrow'], optional
+            The engine reading and writing the chunks, by default 'pandas'.
+            The pandas engine infers the types of every chunk and keeps the strings as Python objects.
+            The pyarrow engine reads the FIRDS CSV with the multithreaded Arrow CSV reader, typed by the FIRDS model,
+            so the strings are string[pyarrow], the flags are bool and the classification type and the notional currency
+            are categoricals, and writes the chunks with the Arrow CSV or Parquet writers. It requires pyarrow and
+            does not support the worker processes, while the Arrow CSV writer quotes the strings and writes the flags
+            in lowercase.
+        output_format : Literal['csv', 'parquet'], optional
+            The format of the transformed FIRDS data, by default 'csv'. The parquet format requires the pyarrow engine.
+        substrings : Mapping[str, str] | None, optional
+            The substrings counted in the full names of the financial instruments, keyed by the names of their columns,
+            by default the letter "a" named a. Every substring derives the {name}_count column with its number of
+            non-overlapping occurrences and the contains_{name} column. The substrings are counted at once by a NumPy
+            kernel over the UTF-8 buffer of the full names of a chunk, so a substring does not add a pass over the chunk.
+            The substrings are literal and case-sensitive, and the missing full names count no occurrences.
+        pipeline : TransformPipeline | None, optional
+            The pipeline of column expressions transforming the FIRDS data, by default the substring counts of the
+            substrings. The pipeline is planned once for the columns of the FIRDS data and applied to every chunk in
+            a single pass: the columns unused by the pipeline are not read, the derived columns unused by its projection
+            are not derived, and its filters run before the derivations they do not depend on.
+        incremental : bool, optional
+            Whether to only transform the rows appended to the FIRDS CSV since the last transformation, by default False.
+            The watermark of the transformation records the byte offset and the rows of the FIRDS CSV transformed,
+            with a fingerprint of its head and of the rows before the offset, so the rows after the offset are
+            transformed and appended to the transformed FIRDS CSV. The FIRDS CSV is transformed in full if it was
+            rewritten, such as by the incremental extraction replacing the rows of a changed file, or if the engine or
+            the columns of the transformation changed. It requires the csv output format.
+        memory_budget : int | None, optional
+            The memory budget in bytes of the chunks held in memory at once, by default None. The chunks are sized
+            adaptively instead of by chunk_size rows, which only bounds them: the memory of every chunk and of its
+            transformation is measured, and the next chunk is sized from the bytes per row of the previous chunks.
+            The chunks in flight in the worker processes share the budget. The sizes and the memory of the chunks are
+            recorded by the chunk sizer and logged, with their peak memory, at the end of the transformation.
         """
+        if max_workers < 1:
+            raise ValueError('The maximum number of workers must be at least 1.')
+
+        if max_pending_chunks is None:
+            max_pending_chunks = 2 * max_workers
+
+        if max_pending_chunks < 1:
+            raise ValueError('The maximum number of pending chunks must be at least 1.')
+
+        if engine not in ('pandas', 'pyarrow'):
+            raise ValueError("The engine must be either 'pandas' or 'pyarrow'.")
+
+        if output_format not in ('csv', 'parquet'):
+            raise ValueError("The output format must be either 'csv' or 'parquet'.")
+
+        if incremental and output_format != 'csv':
+            raise ValueError('The incremental transformation is only supported by the csv output format.')
+
+        if incremental and partitioned:
+            raise ValueError('The incremental transformation is not supported by the partitioned transformation.')
+
+        if output_format == 'parquet' and engine != 'pyarrow':
+            raise ValueError('The parquet output format is only supported by the pyarrow engine.')
+
+        if engine == 'pyarrow' and max_workers > 1:
+            raise ValueError('The worker processes are only supported by the pandas engine.')
+
+        if engine == 'pyarrow':
+            # fail early if the optional dependency is missing
+            import_pyarrow()
+
+        if memory_budget is not None and memory_budget < 1:
+            raise ValueError('The memory budget must be at least 1 byte.')
+
+        if pipeline is not None and substrings is not None:
+            raise ValueError('The substrings are only supported by the default pipeline.')
+
+        if pipeline is None:
+            pipeline = TransformPipeline([SubstringCounts(substrings=substrings)])
+
         self.chunk_size = chunk_size
+        self.partitioned = partitioned
+        self.max_workers = max_workers
+        self.max_pending_chunks = max_pending_chunks
+        self.engine = engine
+        self.output_format = output_format
+        self.pipeline = pipeline
+        self.derived_columns = [column for expression in pipeline.expressions for column in expression.outputs]
+        self.incremental = incremental
+        self.memory_budget = memory_budget
+        self.chunk_sizer = self._chunk_sizer()
         self.data_dir = Path(data_dir)
 
         self.firds_csv_path = self.data_dir / 'firds.csv'
+        self.firds_manifest_path = self.data_dir / 'firds_manifest.json'
+        self.firds_parquet_dir = self.data_dir / 'firds_parquet'
+        self.firds_dataset_dir = self.data_dir / 'firds'
+        self.firds_dataset_path = self.firds_dataset_dir / '_manifest.json'
+        self.transformed_dataset_dir = self.data_dir / 'firds_transformed'
+        self.transformed_dataset_path = self.transformed_dataset_dir / '_manifest.json'
+        self.transformed_name = f'firds_transformed.{output_format}'
+        self.watermark_path = self.data_dir / 'firds_transformed_watermark.json'
+
+    def _executor(self) -> AbstractContextManager[Executor | None]:
+        # the worker processes are shared by the partitions of the transformation, if any
+        if self.max_workers == 1:
+            return nullcontext()
+
+        return ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def _chunk_sizer(self) -> ChunkSizer:
+        # the chunks in flight in the worker processes share the memory budget
+        return ChunkSizer(
+            max_chunk_size=self.chunk_size,
+            memory_budget=self.memory_budget,
+            max_pending_chunks=self.max_pending_chunks if self.max_workers > 1 else 1,
+        )
+
+    def _log_chunks(self) -> None:
+        chunk_sizes = [chunk.row_count for chunk in self.chunk_sizer.chunks]
+        if self.memory_budget is None or not chunk_sizes:
+            return
+
+        logger.info(
+            f'Transformed {len(chunk_sizes)} FIRDS chunks of {min(chunk_sizes)} to {max(chunk_sizes)} rows, '
+            f'with a peak memory of {self.chunk_sizer.peak_memory} bytes for a budget of {self.memory_budget} bytes',
+        )
+
+    def _read_header(self, firds_csv_path: Path) -> list[str]:
+        return pd.read_csv(firds_csv_path, nrows=0).columns.tolist()
+
+    def _compile_pipeline(self, firds_csv_path: Path) -> CompiledPipeline:
+        # plan the pipeline for the header of the firds csv file, before reading any chunk
+        return self.pipeline.compile(self._read_header(firds_csv_path))
+
+    def _transform_csv(
+        self,
+        firds_csv_path: Path,
+        transformed_csv_path: Path,
+        executor: Executor | None = None,
+        byte_offset: int = 0,
+        byte_end: int | None = None,
+    ) -> int:
+        # transform the rows of the firds csv file from byte_offset to byte_end, returning their number.
+        # the rows after a watermark are appended to the transformed csv file, without its header
+        header = self._read_header(firds_csv_path)
+        pipeline = self.pipeline.compile(header)
+        if self.engine == 'pyarrow':
+            return self._transform_arrow(firds_csv_path, transformed_csv_path, pipeline, header, byte_offset, byte_end)
+
+        # the tail of the firds csv file has no header, so its columns are named after the header
+        read_options: dict[str, Any] = {'header': None, 'names': header} if byte_offset else {}
+        row_count = 0
+
+        # process the firds csv file in chunks of the columns used by the pipeline, writing the header with the first chunk
+        with (
+            _open_byte_range(firds_csv_path, byte_offset, byte_end) as src,
+            transformed_csv_path.open('a' if byte_offset else 'w', newline='', encoding='utf-8') as f,
+        ):
+            with pd.read_csv(src, usecols=pipeline.source_columns, chunksize=self.chunk_size, **read_options) as reader:
+                chunks = _iter_csv_chunks(reader, self.chunk_sizer)
+                if executor is None:
+                    for index, chunk in enumerate(chunks):
+                        row_count += len(chunk)
+                        transformed_csv = _transform_chunk(
+                            chunk, header=index == 0 and not byte_offset, pipeline=pipeline
+                        )
+                        f.write(transformed_csv)
+                        self.chunk_sizer.observe(len(chunk), self.chunk_sizer.measure(chunk, transformed_csv))
+
+                    return row_count
+
+                # the chunks are transformed by the worker processes, but written in order.
+                # at most max_pending_chunks chunks are in flight, so a slow chunk holds back the reader instead of the memory.
+                # the memory of a chunk is measured when it is submitted, and of its transformation when it is written
+                pending_chunks: deque[tuple[Future[str], int, int | None]] = deque()
+
+                def write_pending_chunk() -> None:
+                    pending_chunk, chunk_rows, memory = pending_chunks.popleft()
+                    transformed_csv = pending_chunk.result()
+                    f.write(transformed_csv)
+
+                    transformed_memory = self.chunk_sizer.measure(transformed_csv)
+                    if memory is not None and transformed_memory is not None:
+                        memory += transformed_memory
+
+                    self.chunk_sizer.observe(chunk_rows, memory)
+
+                try:
+                    for index, chunk in enumerate(chunks):
+                        row_count += len(chunk)
+                        pending_chunks.append(
+                            (
+                                executor.submit(_transform_chunk, chunk, index == 0 and not byte_offset, pipeline),
+                                len(chunk),
+                                self.chunk_sizer.measure(chunk),
+                            ),
+                        )
+
+                        while pending_chunks and (
+                            pending_chunks[0][0].done() or len(pending_chunks) >= self.max_pending_chunks
+                        ):
+                            write_pending_chunk()
+
+                    while pending_chunks:
+                        write_pending_chunk()
+
+                finally:
+                    for pending_chunk, _, _ in pending_chunks:
+                        pending_chunk.cancel()
+
+        return row_count
+
+    def _transform_arrow(
+        self,
+        firds_csv_path: Path,
+        transformed_path: Path,
+        pipeline: CompiledPipeline,
+        header: list[str],
+        byte_offset: int = 0,
+        byte_end: int | None = None,
+    ) -> int:
+        import_pyarrow()
+        from pyarrow import csv as pa_csv
+
+        # the columns are typed by the firds model instead of inferred, and the strings are never python objects.
+        # only the columns used by the pipeline are converted
+        schema = firds_arrow_schema(dictionary_columns=FIRDS_DICTIONARY_COLUMNS)
+        row_count = 0
+
+        with _open_byte_range(firds_csv_path, byte_offset, byte_end) as src, ExitStack() as stack:
+            reader = pa_csv.open_csv(
+                src,
+                read_options=pa_csv.ReadOptions(column_names=header) if byte_offset else None,
+                convert_options=pa_csv.ConvertOptions(
+                    column_types=schema,
+                    strings_can_be_null=False,
+                    include_columns=pipeline.source_columns,
+                ),
+            )
+
+            # the rows after a watermark are appended to the transformed csv file, without its header
+            sink: Path | IO[bytes] = (
+                stack.enter_context(transformed_path.open('ab')) if byte_offset else transformed_path
+            )
+
+            writer = _ArrowChunkWriter(
+                sink,
+                pipeline,
+                self.output_format,
+                self.chunk_sizer,
+                include_header=not byte_offset,
+            )
+            try:
+                for table in _iter_arrow_chunks(iter(reader), reader.schema, self.chunk_sizer):
+                    row_count += table.num_rows
+                    writer.write(table)
+
+            finally:
+                writer.close()
+
+        return row_count
+
+    def _transform_parquet(self, firds_parquet_dir: Path, transformed_path: Path) -> int:
+        # transform the parquet files of the parquet extraction in the order of their names, returning their rows.
+        # the parquet files are typed by the firds model, so the pandas engine only converts the chunks to pandas
+        pa, _ = import_pyarrow()
+
+        pipeline = self.pipeline.compile(FIRDS.csv_header())
+        dictionary_columns = FIRDS_DICTIONARY_COLUMNS if self.engine == 'pyarrow' else ()
+        firds_schema = firds_arrow_schema(dictionary_columns=dictionary_columns)
+        schema = pa.schema([firds_schema.field(column) for column in pipeline.source_columns])
+        tables = _iter_arrow_chunks(
+            _iter_parquet_batches(sorted(firds_parquet_dir.glob('*.parquet')), schema),
+            schema,
+            self.chunk_sizer,
+        )
+        row_count = 0
+
+        if self.engine == 'pyarrow':
+            writer = _ArrowChunkWriter(transformed_path, pipeline, self.output_format, self.chunk_sizer)
+            try:
+                for table in tables:
+                    row_count += table.num_rows
+                    writer.write(table)
+
+            finally:
+                writer.close()
+
+            return row_count
+
+        with transformed_path.open('w', newline='', encoding='utf-8') as f:
+            for index, table in enumerate(tables):
+                chunk = table.to_pandas()
+                row_count += len(chunk)
+                transformed_csv = _transform_chunk(chunk, header=index == 0, pipeline=pipeline)
+                f.write(transformed_csv)
+                self.chunk_sizer.observe(len(chunk), self.chunk_sizer.measure(chunk, transformed_csv))
+
+        return row_count
+
+    def _extraction_format(self) -> str:
+        # the format of the extracted financial instruments recorded by the manifest of the firds csv, if any
+        if not self.firds_manifest_path.exists():
+            return 'csv'
+
+        try:
+            return FIRDSManifest.model_validate_json(self.firds_manifest_path.read_bytes()).format
+
+        except ValidationError:
+            logger.warning(f'Invalid FIRDS manifest {self.firds_manifest_path}')
+            return 'csv'
+
+    def _load_dataset(self, dataset_path: Path) -> FIRDSDataset | None:
+        if not dataset_path.exists():
+            return None
+
+        try:
+            return FIRDSDataset.model_validate_json(dataset_path.read_bytes())
+
+        except ValidationError:
+            logger.warning(f'Invalid FIRDS dataset manifest {dataset_path}')
+            return None
+
+    def _save_transformed_dataset(self, transformed_dataset: FIRDSDataset) -> None:
+        atomic_write_json(self.transformed_dataset_path, transformed_dataset)
+
+    def _load_watermark(self) -> FIRDSWatermark | None:
+        if not self.watermark_path.exists():
+            return None
+
+        try:
+            return FIRDSWatermark.model_validate_json(self.watermark_path.read_bytes())
+
+        except ValidationError:
+            logger.warning(f'Invalid FIRDS transformation watermark {self.watermark_path}')
+            return None
+
+    def _save_watermark(self, watermark: FIRDSWatermark) -> None:
+        atomic_write_json(self.watermark_path, watermark)
+
+    def _check_watermark(self, transformed_csv_path: Path, firds_csv_size: int) -> FIRDSWatermark | None:
+        # the watermark of the last transformation, unless the firds csv or the transformation changed since
+        watermark = self._load_watermark()
+        if watermark is None:
+            return None
+
+        if watermark.engine != self.engine or watermark.columns != self._compile_pipeline(self.firds_csv_path).columns:
+            logger.info('The FIRDS transformation changed since the last transformation, transforming all FIRDS rows')
+            return None
+
+        if firds_csv_size < watermark.byte_offset or watermark.fingerprint != _fingerprint(
+            self.firds_csv_path,
+            watermark.byte_offset,
+        ):
+            logger.info(f'The FIRDS CSV {self.firds_csv_path} was rewritten, transforming all FIRDS rows')
+            return None
+
+        if not transformed_csv_path.exists() or transformed_csv_path.stat().st_size < watermark.transformed_size:
+            logger.info(f'The transformed FIRDS CSV {transformed_csv_path} does not match its watermark')
+            return None
+
+        return watermark
+
+    def _run_incremental(self, transformed_csv_path: Path, executor: Executor | None) -> None:
+        # the size of the complete rows of the firds csv is taken before its rows are read, and the rows are only read
+        # up to it, so the rows appended meanwhile, or half-written, are left after the next watermark
+        firds_csv_size = _complete_size(self.firds_csv_path, self.firds_csv_path.stat().st_size)
+        watermark = self._check_watermark(transformed_csv_path, firds_csv_size)
+
+        if watermark is None:
+            # the watermark is removed first, so a failed transformation is never appended to
+            self.watermark_path.unlink(missing_ok=True)
+            row_count = self._transform_csv(
+                self.firds_csv_path,
+                transformed_csv_path,
+                executor,
+                byte_end=firds_csv_size,
+            )
+
+        elif watermark.byte_offset == firds_csv_size:
+            logger.info(f'No FIRDS rows appended to {self.firds_csv_path} since the last transformation')
+            return
+
+        else:
+            logger.info(f'Transforming the FIRDS rows appended after the row {watermark.row_count}')
+
+            # discard the rows appended by a failed transformation after the watermark
+            os.truncate(transformed_csv_path, watermark.transformed_size)
+            row_count = watermark.row_count + self._transform_csv(
+                self.firds_csv_path,
+                transformed_csv_path,
+                executor,
+                byte_offset=watermark.byte_offset,
+                byte_end=firds_csv_size,
+            )
+
+        self._save_watermark(
+            FIRDSWatermark(
+                byte_offset=firds_csv_size,
+                row_count=row_count,
+                fingerprint=_fingerprint(self.firds_csv_path, firds_csv_size),
+                engine=self.engine,
+                columns=self._compile_pipeline(self.firds_csv_path).columns,
+                transformed_size=transformed_csv_path.stat().st_size,
+            ),
+        )
+
+    def _run_partitioned(self, executor: Executor | None) -> None:
+        firds_dataset = self._load_dataset(self.firds_dataset_path)
+        if firds_dataset is None:
+            raise TransformationError(f'The FIRDS dataset {self.firds_dataset_dir} does not exist.')
+
+        # the partitions transformed before are skipped unless their firds reference documents changed,
+        # or they were transformed to other columns or to another format
+        columns = self.pipeline.compile(firds_dataset.columns).columns
+        transformed_dataset = self._load_dataset(self.transformed_dataset_path)
+        if transformed_dataset is None:
+            transformed_dataset = FIRDSDataset(format=self.output_format, columns=columns)
+
+        reusable = transformed_dataset.columns == columns and transformed_dataset.format == self.output_format
+        transformed_partitions = {
+            (partition.path, partition.checksum): partition for partition in transformed_dataset.partitions
+        }
+        transformed_dataset = FIRDSDataset(format=self.output_format, columns=columns)
+
+        for partition in firds_dataset.partitions:
+            transformed_dir = self.transformed_dataset_dir / partition.path
+            transformed_csv_path = transformed_dir / self.transformed_name
+
+            if (
+                reusable
+                and (partition.path, partition.checksum) in transformed_partitions
+                and transformed_csv_path.exists()
+            ):
+                logger.info(f'Skipping the FIRDS partition {partition.path} transformed before')
+                transformed_dataset.partitions.append(partition)
+                continue
+
+            logger.info(f'Transforming the FIRDS partition {partition.path}')
+            transformed_dir.mkdir(parents=True, exist_ok=True)
+            if firds_dataset.format == 'parquet':
+                # the parquet files of the xml files of the document are in its partition directory
+                self._transform_parquet(self.firds_dataset_dir / partition.path, transformed_csv_path)
+            else:
+                self._transform_csv(
+                    self.firds_dataset_dir / partition.path / self.firds_csv_path.name,
+                    transformed_csv_path,
+                    executor,
+                )
+            transformed_dataset.partitions.append(partition)
+            self._save_transformed_dataset(transformed_dataset)
+
+        # remove the transformed partitions no longer in the firds dataset
+        partition_paths = {partition.path for partition in firds_dataset.partitions}
+        for partition in transformed_partitions.values():
+            if partition.path not in partition_paths:
+                shutil.rmtree(self.transformed_dataset_dir / partition.path, ignore_errors=True)
+
+        self._save_transformed_dataset(transformed_dataset)
+        logger.info(f'The transformed FIRDS data is saved to {self.transformed_dataset_dir}')
+
+    def _run_parquet(self, transformed_path: Path) -> None:
+        # the financial instruments of the parquet extraction are only in the parquet dataset,
+        # since the firds csv only keeps its header
+        if self.incremental:
+            raise TransformationError('The incremental transformation is not supported by the Parquet extraction.')
+
+        if not self.firds_parquet_dir.exists():
+            raise TransformationError(f'The FIRDS Parquet dataset {self.firds_parquet_dir} does not exist.')
+
+        try:
+            logger.info(f'Transforming the FIRDS data in the Parquet dataset {self.firds_parquet_dir}')
+
+            # the transformed file is rewritten, so the watermark of an incremental transformation is stale
+            self.watermark_path.unlink(missing_ok=True)
+            self._transform_parquet(self.firds_parquet_dir, transformed_path)
+
+            logger.info(f'The transformed FIRDS data is saved to {transformed_path}')
+            self._log_chunks()
+
+        except Exception as exc:
+            logger.error(f'Error transforming the FIRDS data in the Parquet dataset {self.firds_parquet_dir}')
+            raise TransformationError('Error transforming the FIRDS data.') from exc
+
+    def open_writer(self) -> FIRDSTransformWriter:
+        """
+        Open a writer transforming the FIRDS records in memory to the transformed FIRDS data.
+        It streams the validated records of the extraction to the transformation, without writing and parsing the
+        FIRDS CSV. The chunks are transformed in-process, whatever the number of workers.
+
+        Returns
+        -------
+        FIRDSTransformWriter
+            The writer of the FIRDS records, whose transformed file is only moved to its path on close.
+
+        Raises
+        ------
+        ValueError
+            If the transformer is partitioned or its pipeline reads columns that are not FIRDS columns.
+        """
+        if self.partitioned:
+            raise ValueError('The streaming transformation is not supported by the partitioned transformer.')
+
+        # the transformed csv file is rewritten, so the watermark of an incremental transformation is stale
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        self.watermark_path.unlink(missing_ok=True)
+        writer = FIRDSTransformWriter(
+            self.data_dir / self.transformed_name,
+            self.pipeline.compile(FIRDS.csv_header()),
+            chunk_size=self.chunk_size,
+            engine=self.engine,
+            output_format=self.output_format,
+            memory_budget=self.memory_budget,
+        )
+
+        # the chunks of the streaming transformation are recorded by the sizer of the writer
+        self.chunk_sizer = writer.chunk_sizer
+        return writer
 
     async def arun(self) -> None:
         """
         Transform the FIRDS data. Asynchronous version.
-        It calculates the total number of the letter "a" in the full name of the financial instruments.
-        It adds a new column indicating whether the financial instrument full name contains the letter "a".
+        It applies the pipeline of column expressions to the FIRDS data. By default, it calculates the total number of
+        every substring, by default the letter "a", in the full name of the financial instruments, and adds a new column
+        indicating whether the financial instrument full name contains the substring.
+        The financial instruments of a Parquet extraction, whose format is recorded by the manifest of the FIRDS CSV
+        or of the FIRDS dataset, are read from its Parquet files in-process.
 
         Raises
         ------
@@ -65,8 +1131,11 @@ class FIRDSTransformer(Tool):
     def run(self) -> None:
         """
         Transform the FIRDS data.
-        It calculates the total number of the letter "a" in the full name of the financial instruments.
-        It adds a new column indicating whether the financial instrument full name contains the letter "a".
+        It applies the pipeline of column expressions to the FIRDS data. By default, it calculates the total number of
+        every substring, by default the letter "a", in the full name of the financial instruments, and adds a new column
+        indicating whether the financial instrument full name contains the substring.
+        The financial instruments of a Parquet extraction, whose format is recorded by the manifest of the FIRDS CSV
+        or of the FIRDS dataset, are read from its Parquet files in-process.
 
         Raises
         ------
@@ -76,33 +1145,46 @@ class FIRDSTransformer(Tool):
         if not self.data_dir.exists():
             raise TransformationError(f'The data directory {self.data_dir} does not exist.')
 
-        if not self.firds_csv_path.exists():
-            raise TransformationError(f'The FIRDS CSV file {self.firds_csv_path} does not exist.')
+        # the chunks are sized from the memory of the chunks of this transformation only
+        self.chunk_sizer = self._chunk_sizer()
 
-        try:
-            logger.info(f'Transforming the FIRDS data in the file {self.firds_csv_path}')
+        if self.partitioned:
+            try:
+                with self._executor() as executor:
+                    self._run_partitioned(executor)
+
+                self._log_chunks()
+
+            except TransformationError:
+                raise
+
+            except Exception as exc:
+                logger.error(f'Error transforming the FIRDS data in the dataset {self.firds_dataset_dir}')
+                raise TransformationError('Error transforming the FIRDS data.') from exc
 
-            # process the firds csv file in chunks
-            transformed_csv_path = self.data_dir / 'firds_transformed.csv'
-            first_chunk = True
+            return
 
-            with pd.read_csv(self.firds_csv_path, chunksize=self.chunk_size) as reader:
-                for chunk in reader:
-                    # calculate the total number of the letter "a" in the full name
-                    chunk['a_count'] = chunk['FinInstrmGnlAttrbts.FullNm'].str.count('a')
+        transformed_csv_path = self.data_dir / self.transformed_name
+        if self._extraction_format() == 'parquet':
+            self._run_parquet(transformed_csv_path)
+            return
 
-                    # add a new column indicating whether the financial instrument full name contains the letter "a"
-                    chunk['contains_a'] = chunk['FinInstrmGnlAttrbts.FullNm'].str.contains('a')
+        if not self.firds_csv_path.exists():
+            raise TransformationError(f'The FIRDS CSV file {self.firds_csv_path} does not exist.')
 
-                    # save the transformed data
-                    if first_chunk:
-                        chunk.to_csv(transformed_csv_path, mode='w', header=True, index=False)
-                    else:
-                        chunk.to_csv(transformed_csv_path, mode='a', header=False, index=False)
+        try:
+            logger.info(f'Transforming the FIRDS data in the file {self.firds_csv_path}')
 
-                    first_chunk = False
+            with self._executor() as executor:
+                if self.incremental:
+                    self._run_incremental(transformed_csv_path, executor)
+                else:
+                    # the transformed csv file is rewritten, so the watermark of an incremental transformation is stale
+                    self.watermark_path.unlink(missing_ok=True)
+                    self._transform_csv(self.firds_csv_path, transformed_csv_path, executor)
 
             logger.info(f'The transformed FIRDS data is saved to {transformed_csv_path}')
+            self._log_chunks()
 
         except Exception as exc:
             logger.error(f'Error transforming the FIRDS data in the file {self.firds_csv_path}')
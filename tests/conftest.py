@@ -1,9 +1,17 @@
+import hashlib
+import re
+import threading
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import TYPE_CHECKING
+from urllib.parse import parse_qsl
 
 import pytest
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from etl_processor.extract import FIRDSExtractor
     from etl_processor.models import FIRDS, FIRDSDoc
 
@@ -93,6 +101,33 @@ def firds_ref_doc_response() -> str:
 """
 
 
+@pytest.fixture
+def firds_ref_doc_route_factory() -> 'Callable[[list[dict[str, str]]], Callable[[dict[str, str]], bytes]]':
+    """
+    Fixture of a factory of FIRDS reference document routes.
+    It creates a route rendering the solr response pages of the given FIRDS reference documents by start and rows.
+    """
+
+    def firds_ref_doc_route(firds_ref_docs: list[dict[str, str]]) -> 'Callable[[dict[str, str]], bytes]':
+        def firds_ref_doc_page(params: dict[str, str]) -> bytes:
+            start = int(params.get('start', 0))
+            rows = int(params.get('rows', 10))
+            docs = ''.join(
+                '<doc>'
+                + ''.join(f'<str name="{name}">{value}</str>' for name, value in firds_ref_doc.items())
+                + '</doc>'
+                for firds_ref_doc in firds_ref_docs[start : start + rows]
+            )
+            return (
+                f'<response><result name="response" numFound="{len(firds_ref_docs)}" start="{start}">'
+                f'{docs}</result></response>'
+            ).encode()
+
+        return firds_ref_doc_page
+
+    return firds_ref_doc_route
+
+
 @pytest.fixture
 def firds_xml_data() -> str:
     """
@@ -103,6 +138,95 @@ def firds_xml_data() -> str:
 """
 
 
+@pytest.fixture
+def firds_zip_factory(firds_xml_data: str) -> 'Callable[[str], bytes]':
+    """
+    Fixture of a factory of FIRDS zip files.
+    It creates the content of a zip file with the FIRDS XML document of a financial instrument with the given identifier.
+    The zip files are reproducible, so their checksums are stable.
+    """
+    from io import BytesIO
+    from zipfile import ZIP_DEFLATED, ZipFile, ZipInfo
+
+    def firds_zip(firds_id: str) -> bytes:
+        firds_zip_io = BytesIO()
+        with ZipFile(firds_zip_io, 'w', compression=ZIP_DEFLATED) as firds_zip_file:
+            firds_xml_info = ZipInfo(f'DLTINS_{firds_id}.xml', date_time=(2021, 1, 17, 0, 0, 0))
+            firds_zip_file.writestr(
+                firds_xml_info,
+                firds_xml_data.replace('EZV1JDJ1R5Q9', firds_id),
+                compress_type=ZIP_DEFLATED,
+            )
+
+        return firds_zip_io.getvalue()
+
+    return firds_zip
+
+
+@pytest.fixture
+def serve_firds_files(
+    http_server: 'StubHTTPServer',
+    firds_doc_data: dict[str, str],
+    firds_ref_doc_route_factory: 'Callable[[list[dict[str, str]]], Callable[[dict[str, str]], bytes]]',
+) -> 'Callable[..., str]':
+    """
+    Fixture of a function serving FIRDS zip files from the local HTTP server.
+    It serves the given zip files by file name, along with the solr response of their FIRDS reference documents,
+    with their download links, MD5 checksums and publication dates, and returns the URL of the solr response.
+    """
+
+    def serve(firds_zips: dict[str, bytes], publication_dates: dict[str, str] | None = None) -> str:
+        publication_dates = publication_dates or {}
+        for file_name, firds_zip in firds_zips.items():
+            http_server.contents[f'/{file_name}'] = firds_zip
+
+        http_server.routes['/solr/select'] = firds_ref_doc_route_factory(
+            [
+                firds_doc_data
+                | {
+                    'file_name': file_name,
+                    'download_link': http_server.url(f'/{file_name}'),
+                    'checksum': hashlib.md5(firds_zip).hexdigest(),
+                    'publication_date': publication_dates.get(file_name, firds_doc_data['publication_date']),
+                }
+                for file_name, firds_zip in firds_zips.items()
+            ],
+        )
+        return http_server.url('/solr/select')
+
+    return serve
+
+
+@pytest.fixture(scope='session')
+def large_firds_xml(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """
+    Fixture of a large synthetic FIRDS XML document.
+    It creates a temporary file with 20000 financial instruments.
+    """
+    header = (
+        '<BizData xmlns="urn:iso:std:iso:20022:tech:xsd:head.003.001.01"><Pyld>'
+        '<Document xmlns="urn:iso:std:iso:20022:tech:xsd:auth.036.001.02"><FinInstrmRptgRefDataDltaRpt>'
+        '<RptHdr><RptgNtty><NtlCmptntAuthrty>EU</NtlCmptntAuthrty></RptgNtty></RptHdr>'
+    )
+    instrument = (
+        '<FinInstrm><NewRcrd><FinInstrmGnlAttrbts><Id>EZ{index:010d}</Id>'
+        '<FullNm>Foreign_Exchange Forward JPY SEK {index}</FullNm><ClssfctnTp>JFTXFP</ClssfctnTp>'
+        '<NtnlCcy>SEK</NtnlCcy><CmmdtyDerivInd>false</CmmdtyDerivInd></FinInstrmGnlAttrbts>'
+        '<Issr>2138004TYNQCB7MLTG76</Issr><TechAttrbts><RlvntCmptntAuthrty>NL</RlvntCmptntAuthrty></TechAttrbts>'
+        '</NewRcrd></FinInstrm>'
+    )
+    footer = '</FinInstrmRptgRefDataDltaRpt></Document></Pyld></BizData>'
+
+    large_firds_xml_path = tmp_path_factory.mktemp('xml') / 'DLTINS_large.xml'
+    with large_firds_xml_path.open('w', encoding='utf-8') as f:
+        f.write(header)
+        for index in range(20000):
+            f.write(instrument.format(index=index))
+        f.write(footer)
+
+    return large_firds_xml_path
+
+
 @pytest.fixture(scope='session')
 def firds_csv(tmp_path_factory: pytest.TempPathFactory) -> Path:
     """
@@ -137,3 +261,101 @@ DE000A1R07V3,Kreditanst.f.Wiederaufbau Anl.v.2014 (2021),DBFTFB,False,EUR,549300
     firds_transformed_csv_path = tmp_path_factory.mktemp('data') / 'firds_transformed.csv'
     firds_transformed_csv_path.write_text(firds_transformed_csv_data)
     return firds_transformed_csv_path
+
+
+class StubHTTPServer(ThreadingHTTPServer):
+    """
+    Local HTTP server serving contents for the tests.
+    The static contents are served by path and the dynamic contents are rendered from the query parameters.
+    The failures queued for a path are served before its content,
+    and the resets queued for a path close the connection after the given number of bytes of its next responses.
+    It revalidates the contents with ETags, serves byte ranges unless accept_ranges is False,
+    and records the status of every request along with the bytes sent per path.
+    """
+
+    def __init__(self) -> None:
+        super().__init__(('127.0.0.1', 0), StubHTTPRequestHandler)
+        self.contents: dict[str, bytes] = {}
+        self.routes: dict[str, Callable[[dict[str, str]], bytes]] = {}
+        self.failures: dict[str, list[tuple[int, dict[str, str]]]] = {}
+        self.resets: dict[str, list[int]] = {}
+        self.requests: list[tuple[str, str, int]] = []
+        self.accept_ranges = True
+        self.bytes_sent: dict[str, int] = {}
+
+    def url(self, path: str) -> str:
+        return f'http://127.0.0.1:{self.server_port}{path}'
+
+
+class StubHTTPRequestHandler(BaseHTTPRequestHandler):
+    server: StubHTTPServer
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+    def _respond(self, status: int, headers: dict[str, str], body: bytes = b'') -> None:
+        self.server.requests.append((self.command, self.path, status))
+        path = self.path.partition('?')[0]
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+
+        # the connection is closed before the whole body is sent
+        if self.server.resets.get(path):
+            body = body[: self.server.resets[path].pop(0)]
+            self.close_connection = True
+
+        self.server.bytes_sent[path] = self.server.bytes_sent.get(path, 0) + len(body)
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        path, _, query = self.path.partition('?')
+        if self.server.failures.get(path):
+            status, headers = self.server.failures[path].pop(0)
+            return self._respond(status, headers)
+
+        content = self.server.contents.get(path)
+        if content is None and path in self.server.routes:
+            content = self.server.routes[path](dict(parse_qsl(query)))
+
+        if content is None:
+            return self._respond(404, {})
+
+        etag = f'"{hashlib.sha256(content).hexdigest()[:16]}"'
+        if self.headers.get('If-None-Match') == etag:
+            return self._respond(304, {'ETag': etag})
+
+        headers = {'ETag': etag, 'Last-Modified': 'Sun, 17 Jan 2021 00:00:00 GMT'}
+        byte_range = re.fullmatch(r'bytes=(\d*)-(\d*)', self.headers.get('Range', ''))
+        if not self.server.accept_ranges or byte_range is None:
+            return self._respond(200, headers, content)
+
+        # a suffix range holds the last bytes of the content, otherwise the range is bounded by the content
+        start, end = byte_range.groups()
+        if not start:
+            start, end = str(max(len(content) - int(end), 0)), str(len(content) - 1)
+
+        first, last = int(start), min(int(end) if end else len(content) - 1, len(content) - 1)
+        if first > last:
+            return self._respond(416, {'Content-Range': f'bytes */{len(content)}'})
+
+        headers |= {'Accept-Ranges': 'bytes', 'Content-Range': f'bytes {first}-{last}/{len(content)}'}
+        return self._respond(206, headers, content[first : last + 1])
+
+
+@pytest.fixture
+def http_server() -> 'Iterator[StubHTTPServer]':
+    """
+    Fixture of a local HTTP server serving static contents.
+    """
+    server = StubHTTPServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+    thread.join()
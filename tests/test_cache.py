@@ -0,0 +1,283 @@
+from io import BytesIO
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from etl_processor.models import FIRDSDoc
+    from tests.conftest import StubHTTPServer
+
+
+def write_cache_entry(http_cache: 'object', url: str, content: bytes, etag: str | None = None) -> None:
+    from etl_processor.cache import HTTPCache
+
+    assert isinstance(http_cache, HTTPCache)
+
+    response = MagicMock()
+    response.headers = {'ETag': etag} if etag else {}
+
+    writer = http_cache.writer(url, 'checksum', response)
+    writer.write(content)
+    writer.commit()
+
+
+@pytest.mark.extract
+def test_lookup_and_read(tmp_path: Path) -> None:
+    """
+    Test HTTPCache stores, looks up and reads a response content.
+    """
+    from etl_processor.cache import HTTPCache
+
+    http_cache = HTTPCache(cache_dir=tmp_path)
+    write_cache_entry(http_cache, 'https://example.com/a.zip', b'content', etag='"a"')
+
+    assert http_cache.lookup('https://example.com/a.zip', 'other checksum') is None
+
+    entry = http_cache.lookup('https://example.com/a.zip', 'checksum')
+    assert entry is not None
+    assert entry.size == len(b'content')
+    assert http_cache.conditional_headers(entry) == {'If-None-Match': '"a"'}
+
+    f = BytesIO()
+    assert http_cache.read_into(entry, f)
+    assert f.getvalue() == b'content'
+
+    # the index is persisted
+    assert HTTPCache(cache_dir=tmp_path).lookup('https://example.com/a.zip', 'checksum') == entry
+
+
+@pytest.mark.extract
+def test_read_corrupted(tmp_path: Path) -> None:
+    """
+    Test HTTPCache evicts an entry whose content does not match its digest.
+    """
+    from etl_processor.cache import HTTPCache
+
+    http_cache = HTTPCache(cache_dir=tmp_path)
+    write_cache_entry(http_cache, 'https://example.com/a.zip', b'content')
+
+    entry = http_cache.lookup('https://example.com/a.zip', 'checksum')
+    assert entry is not None
+    http_cache._object_path(entry.digest).write_bytes(b'corrupted')
+
+    f = BytesIO(b'prefix')
+    f.seek(0, 2)
+    assert not http_cache.read_into(entry, f)
+    assert f.getvalue() == b'prefix'
+    assert http_cache.lookup('https://example.com/a.zip', 'checksum') is None
+    assert not http_cache._object_path(entry.digest).exists()
+
+
+@pytest.mark.extract
+def test_evict_least_recently_used(tmp_path: Path) -> None:
+    """
+    Test HTTPCache evicts the least recently used entries above its maximum size.
+    """
+    from etl_processor.cache import HTTPCache
+
+    http_cache = HTTPCache(cache_dir=tmp_path, max_size=10)
+    write_cache_entry(http_cache, 'https://example.com/a.zip', b'aaaa')
+    write_cache_entry(http_cache, 'https://example.com/b.zip', b'bbbb')
+
+    # reading the first entry makes the second one the least recently used
+    entry = http_cache.lookup('https://example.com/a.zip', 'checksum')
+    assert entry is not None
+    assert http_cache.read_into(entry, BytesIO())
+
+    write_cache_entry(http_cache, 'https://example.com/c.zip', b'cccc')
+
+    assert http_cache.lookup('https://example.com/a.zip', 'checksum') is not None
+    assert http_cache.lookup('https://example.com/b.zip', 'checksum') is None
+    assert http_cache.lookup('https://example.com/c.zip', 'checksum') is not None
+    assert http_cache.size == 8
+
+
+@pytest.mark.extract
+def test_concurrent_writers(tmp_path: Path) -> None:
+    """
+    Test HTTPCache writers of the same response write to different temporary files.
+    """
+    from etl_processor.cache import HTTPCache
+
+    http_cache = HTTPCache(cache_dir=tmp_path)
+    response = MagicMock()
+    response.headers = {}
+
+    writer = http_cache.writer('https://example.com/a.zip', 'checksum', response)
+    other_writer = http_cache.writer('https://example.com/a.zip', 'checksum', response)
+    writer.write(b'content')
+    other_writer.write(b'partial')
+    other_writer.abort()
+    writer.commit()
+
+    entry = http_cache.lookup('https://example.com/a.zip', 'checksum')
+    assert entry is not None
+
+    f = BytesIO()
+    assert http_cache.read_into(entry, f)
+    assert f.getvalue() == b'content'
+    assert not list(http_cache.objects_dir.glob('*.tmp'))
+
+
+@pytest.mark.extract
+def test_evict_shared_content(tmp_path: Path) -> None:
+    """
+    Test HTTPCache counts a content shared by several entries once, and keeps it until its last entry is evicted.
+    """
+    from etl_processor.cache import HTTPCache
+
+    http_cache = HTTPCache(cache_dir=tmp_path, max_size=10)
+    write_cache_entry(http_cache, 'https://example.com/a.zip', b'aaaa')
+    write_cache_entry(http_cache, 'https://example.com/b.zip', b'aaaa')
+    write_cache_entry(http_cache, 'https://example.com/c.zip', b'cccc')
+    assert http_cache.size == 8
+
+    write_cache_entry(http_cache, 'https://example.com/d.zip', b'dddd')
+
+    # both entries of the shared content are evicted to make room for the new content
+    assert http_cache.lookup('https://example.com/a.zip', 'checksum') is None
+    assert http_cache.lookup('https://example.com/b.zip', 'checksum') is None
+    assert http_cache.lookup('https://example.com/c.zip', 'checksum') is not None
+    assert http_cache.lookup('https://example.com/d.zip', 'checksum') is not None
+    assert http_cache.size == 8
+    assert sorted(path.name for path in http_cache.objects_dir.rglob('*') if path.is_file()) == sorted(
+        entry.digest for entry in http_cache._entries.values()
+    )
+
+
+@pytest.mark.extract
+@pytest.mark.asyncio
+async def test_extractor_http_cache(
+    tmp_path: Path,
+    http_server: 'StubHTTPServer',
+    firds_doc: 'FIRDSDoc',
+    firds_zip_factory: 'Callable[[str], bytes]',
+) -> None:
+    """
+    Test FIRDSExtractor revalidates the cached FIRDS zip files in both the sync and async extraction.
+    """
+    import hashlib
+
+    import httpx
+
+    from etl_processor.cache import HTTPCache
+    from etl_processor.extract import FIRDSExtractor
+
+    http_server.contents['/DLTINS.zip'] = firds_zip_factory('EZV1JDJ1R5Q9')
+    firds_doc = firds_doc.model_copy(
+        update={
+            'download_link': http_server.url('/DLTINS.zip'),
+            'checksum': hashlib.md5(http_server.contents['/DLTINS.zip']).hexdigest(),
+        },
+    )
+
+    firds_extractor = FIRDSExtractor(
+        firds_url='https://example.com',
+        data_dir=tmp_path / 'data',
+        http_cache=HTTPCache(cache_dir=tmp_path / 'cache'),
+    )
+
+    client = firds_extractor._http_client()
+
+    firds_zip_file = BytesIO()
+    firds_extractor._download_firds_file(client, firds_doc, firds_zip_file)
+    assert firds_zip_file.getvalue() == http_server.contents['/DLTINS.zip']
+
+    firds_zip_file = BytesIO()
+    firds_extractor._download_firds_file(client, firds_doc, firds_zip_file)
+    assert firds_zip_file.getvalue() == http_server.contents['/DLTINS.zip']
+
+    async with httpx.AsyncClient() as async_client:
+        firds_zip_file = BytesIO()
+        await firds_extractor._adownload_firds_file(async_client, firds_doc, firds_zip_file)
+        assert firds_zip_file.getvalue() == http_server.contents['/DLTINS.zip']
+
+    assert [status for _, _, status in http_server.requests] == [200, 304, 304]
+
+    # the cached file is downloaded again if it was modified
+    http_server.contents['/DLTINS.zip'] = firds_zip_factory('EZV1JDJ1R5Q8')
+    firds_doc = firds_doc.model_copy(update={'checksum': hashlib.md5(http_server.contents['/DLTINS.zip']).hexdigest()})
+
+    firds_zip_file = BytesIO()
+    firds_extractor._download_firds_file(client, firds_doc, firds_zip_file)
+    assert firds_zip_file.getvalue() == http_server.contents['/DLTINS.zip']
+    assert http_server.requests[-1][2] == 200
+
+    # the cached file is downloaded again if it is corrupted
+    assert firds_extractor.http_cache is not None
+    entry = firds_extractor.http_cache.lookup(firds_doc.download_link, firds_doc.checksum)
+    assert entry is not None
+    firds_extractor.http_cache._object_path(entry.digest).write_bytes(b'corrupted')
+
+    firds_zip_file = BytesIO()
+    firds_extractor._download_firds_file(client, firds_doc, firds_zip_file)
+    assert firds_zip_file.getvalue() == http_server.contents['/DLTINS.zip']
+    assert [status for _, _, status in http_server.requests[-2:]] == [304, 200]
+
+    client.close()
+
+
+@pytest.mark.extract
+@pytest.mark.asyncio
+async def test_extractor_http_cache_threads(
+    tmp_path: Path,
+    http_server: 'StubHTTPServer',
+    firds_doc: 'FIRDSDoc',
+    firds_zip_factory: 'Callable[[str], bytes]',
+) -> None:
+    """
+    Test FIRDSExtractor commits and reads the cached FIRDS zip files off the event loop in the async extraction.
+    """
+    import hashlib
+    import threading
+    from unittest.mock import patch
+
+    import httpx
+
+    from etl_processor.cache import HTTPCache
+    from etl_processor.extract import FIRDSExtractor
+
+    http_server.contents['/DLTINS.zip'] = firds_zip_factory('EZV1JDJ1R5Q9')
+    firds_doc = firds_doc.model_copy(
+        update={
+            'download_link': http_server.url('/DLTINS.zip'),
+            'checksum': hashlib.md5(http_server.contents['/DLTINS.zip']).hexdigest(),
+        },
+    )
+
+    http_cache = HTTPCache(cache_dir=tmp_path / 'cache')
+    firds_extractor = FIRDSExtractor(
+        firds_url='https://example.com',
+        data_dir=tmp_path / 'data',
+        http_cache=http_cache,
+    )
+
+    threads = []
+    commit = HTTPCache._commit
+    read_into = HTTPCache.read_into
+
+    def record_commit(*args: object) -> None:
+        threads.append(threading.current_thread())
+        commit(http_cache, *args)  # type: ignore[arg-type]
+
+    def record_read_into(*args: object) -> bool:
+        threads.append(threading.current_thread())
+        return read_into(http_cache, *args)  # type: ignore[arg-type]
+
+    with (
+        patch.object(http_cache, '_commit', side_effect=record_commit),
+        patch.object(http_cache, 'read_into', side_effect=record_read_into),
+    ):
+        async with httpx.AsyncClient() as async_client:
+            for _ in range(2):
+                firds_zip_file = BytesIO()
+                await firds_extractor._adownload_firds_file(async_client, firds_doc, firds_zip_file)
+                assert firds_zip_file.getvalue() == http_server.contents['/DLTINS.zip']
+
+    assert [status for _, _, status in http_server.requests] == [200, 304]
+    assert len(threads) == 2
+    assert threading.current_thread() not in threads
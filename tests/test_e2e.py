@@ -1,47 +1,47 @@
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from typing import TYPE_CHECKING
 
 import pytest
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
-@patch('etl_processor.extract.httpx.get')
 @pytest.mark.e2e
 @pytest.mark.asyncio
 async def test_etl(
-    mock_get: MagicMock,
-    firds_ref_doc_response: str,
-    firds_csv: Path,
+    tmp_path: Path,
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
 ) -> None:
     """
     Test the ETL process.
     """
-    mock_response = MagicMock()
-    mock_response.text = firds_ref_doc_response
-    mock_get.return_value = mock_response
-
     from etl_processor.extract import FIRDSExtractor
     from etl_processor.load import FIRDSLoader
     from etl_processor.transform import FIRDSTransformer
 
+    firds_url = serve_firds_files({'DLTINS_20210117_01of01.zip': firds_zip_factory('EZV1JDJ1R5Q9')})
+
     firds_extractor = FIRDSExtractor(
-        firds_url='https://mock-url.mock.domain',
-        data_dir=firds_csv.parent,
+        firds_url=f'{firds_url}?q=*&wt=xml',
+        data_dir=tmp_path,
     )
     await firds_extractor.arun()
 
     firds_transformer = FIRDSTransformer(
-        data_dir=firds_csv.parent,
+        data_dir=tmp_path,
     )
     await firds_transformer.arun()
 
     firds_loader = FIRDSLoader(
-        data_dir=firds_csv.parent,
+        data_dir=tmp_path,
         system='file',
-        target_path=str(firds_csv.parent / 'firds_gold.csv'),
+        target_path=str(tmp_path / 'firds_gold.csv'),
     )
     await firds_loader.arun()
 
-    firds_gold_csv = firds_csv.parent / 'firds_gold.csv'
+    firds_gold_csv = tmp_path / 'firds_gold.csv'
 
     assert firds_gold_csv.exists()
     assert firds_gold_csv.stat().st_size > 0
@@ -1,12 +1,15 @@
 from pathlib import Path
 from typing import TYPE_CHECKING
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 
 if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterator
+
     from etl_processor.extract import FIRDSExtractor
     from etl_processor.models import FIRDS, FIRDSDoc
+    from tests.conftest import StubHTTPServer
 
 
 @pytest.mark.extract
@@ -21,9 +24,25 @@ def test_init() -> None:
     assert firds_extractor.data_dir == Path('data')
     assert firds_extractor.data_dir.exists()
     assert firds_extractor.firds_csv_path == Path('data/firds.csv')
+    assert firds_extractor.max_concurrency == 4
+    assert firds_extractor.max_workers == 1
+    assert firds_extractor.batch_size == 10**3
+    assert not firds_extractor.strict
+
+    with pytest.raises(ValueError):
+        FIRDSExtractor(firds_url='https://example.com', data_dir='data', max_concurrency=0)
+
+    with pytest.raises(ValueError):
+        FIRDSExtractor(firds_url='https://example.com', data_dir='data', max_workers=0)
+
+    with pytest.raises(ValueError):
+        FIRDSExtractor(firds_url='https://example.com', data_dir='data', ref_doc_page_size=0)
+
+    with pytest.raises(ValueError):
+        FIRDSExtractor(firds_url='https://example.com', data_dir='data', checksum_attempts=0)
 
 
-@patch('etl_processor.extract.httpx.get')
+@patch('etl_processor.extract.httpx.Client.get')
 @pytest.mark.extract
 def test_fetch_and_parse_firds_ref_doc(
     mock_get: MagicMock,
@@ -35,15 +54,64 @@ def test_fetch_and_parse_firds_ref_doc(
     Test _fetch_and_parse_firds_ref_doc method.
     """
     mock_response = MagicMock()
-    mock_response.text = firds_ref_doc_response
+    mock_response.content = firds_ref_doc_response.encode('utf-8')
     mock_get.return_value = mock_response
 
     # TODO: consider patching the ET parse methods in the future
-    result = firds_extractor._fetch_and_parse_firds_ref_doc()
+    with firds_extractor._http_client() as client:
+        result = firds_extractor._fetch_and_parse_firds_ref_doc(client)
     assert len(result) == 1
     assert result[0].download_link == firds_doc.download_link
 
 
+@pytest.mark.extract
+def test_compile_firds_tags(firds_xml_data: str) -> None:
+    """
+    Test the lookup table of the financial instrument record tags compiled from the FIRDS model fields.
+    """
+    import xml.etree.ElementTree as ET
+
+    from etl_processor.extract import (
+        FIRDS_INSTRUMENT_TAG,
+        FIRDS_NAMESPACE,
+        FIRDS_RECORD_TAGS,
+        _collect_firds_fields,
+        _compile_firds_tags,
+    )
+    from etl_processor.models import FIRDS
+
+    assert FIRDS_RECORD_TAGS == {
+        f'{FIRDS_NAMESPACE}FinInstrmGnlAttrbts': {
+            f'{FIRDS_NAMESPACE}Id': 'Id',
+            f'{FIRDS_NAMESPACE}FullNm': 'FullNm',
+            f'{FIRDS_NAMESPACE}ClssfctnTp': 'ClssfctnTp',
+            f'{FIRDS_NAMESPACE}CmmdtyDerivInd': 'CmmdtyDerivInd',
+            f'{FIRDS_NAMESPACE}NtnlCcy': 'NtnlCcy',
+        },
+        f'{FIRDS_NAMESPACE}Issr': 'Issr',
+    }
+
+    # extra fields are projected by adding them to the model
+    record_paths = FIRDS.record_paths() | {'XpryDt': ('DerivInstrmAttrbts', 'XpryDt')}
+    with patch.object(FIRDS, 'record_paths', return_value=record_paths):
+        firds_tags = _compile_firds_tags(FIRDS_NAMESPACE)
+
+    firds_instrument = ET.fromstring(firds_xml_data.strip()).find(f'.//{FIRDS_INSTRUMENT_TAG}')
+    assert firds_instrument is not None
+
+    firds_dict: dict[str, str | None] = {}
+    _collect_firds_fields(firds_instrument[0], firds_tags, firds_dict)
+    assert firds_dict == {
+        'Id': 'EZV1JDJ1R5Q9',
+        'FullNm': 'Foreign_Exchange Forward JPY SEK 20210116',
+        'ClssfctnTp': 'JFTXFP',
+        'NtnlCcy': 'SEK',
+        'CmmdtyDerivInd': 'false',
+        'Issr': '2138004TYNQCB7MLTG76',
+        'XpryDt': '2021-01-16',
+    }
+
+
 @patch('etl_processor.extract.csv.DictWriter')
 @pytest.mark.extract
 def test_parse_firds_xml_file(
@@ -58,6 +126,7 @@ def test_parse_firds_xml_file(
     from io import BytesIO
 
     firds_xml = BytesIO(firds_xml_data.encode('utf-8'))
+    firds_extractor.strict = True
 
     with patch.object(firds_extractor, 'firds_csv_path') as csv_path:
         csv_path.open = MagicMock()
@@ -74,74 +143,471 @@ def test_parse_firds_xml_file(
         mock_dict_writer.return_value.writerow.assert_called_once_with(firds.model_dump(by_alias=True))
 
 
+@pytest.mark.extract
+def test_parse_firds_xml_file_batches(tmp_path: Path, firds_xml_data: str) -> None:
+    """
+    Test _parse_firds_xml_file validates and writes the financial instruments in batches as in the strict mode.
+    """
+    from io import BytesIO
+
+    from etl_processor.extract import FIRDSExtractor
+
+    # two valid financial instruments and an invalid one in between
+    invalid_firds_xml_data = firds_xml_data.replace('<CmmdtyDerivInd>false', '<CmmdtyDerivInd>abc')
+    firds_instrument = firds_xml_data[firds_xml_data.index('<FinInstrm>') : firds_xml_data.index('</FinInstrm>') + 12]
+    invalid_firds_instrument = invalid_firds_xml_data[
+        invalid_firds_xml_data.index('<FinInstrm>') : invalid_firds_xml_data.index('</FinInstrm>') + 12
+    ]
+    firds_xml_data = firds_xml_data.replace(
+        firds_instrument,
+        firds_instrument + invalid_firds_instrument + firds_instrument.replace('EZV1JDJ1R5Q9', 'EZV1JDJ1R5Q8'),
+    )
+
+    firds_csvs = []
+    for strict in (True, False):
+        firds_extractor = FIRDSExtractor(
+            firds_url='https://example.com',
+            data_dir=tmp_path / str(strict),
+            batch_size=2,
+            strict=strict,
+        )
+        firds_extractor._parse_firds_xml_file(firds_xml=BytesIO(firds_xml_data.encode('utf-8')))
+        firds_csvs.append(firds_extractor.firds_csv_path.read_text(encoding='utf-8'))
+
+    assert firds_csvs[0] == firds_csvs[1]
+    assert firds_csvs[1].splitlines() == [
+        'EZV1JDJ1R5Q9,Foreign_Exchange Forward JPY SEK 20210116,JFTXFP,False,SEK,2138004TYNQCB7MLTG76',
+        'EZV1JDJ1R5Q8,Foreign_Exchange Forward JPY SEK 20210116,JFTXFP,False,SEK,2138004TYNQCB7MLTG76',
+    ]
+
+
+@pytest.mark.extract
+def test_parse_firds_xml_file_bounded_memory(tmp_path: Path, large_firds_xml: Path) -> None:
+    """
+    Test _parse_firds_xml_file frees the parsed financial instruments, keeping the peak memory flat.
+    """
+    import tracemalloc
+
+    from etl_processor.extract import FIRDSExtractor
+
+    firds_extractor = FIRDSExtractor(firds_url='https://example.com', data_dir=tmp_path)
+
+    tracemalloc.start()
+    try:
+        with large_firds_xml.open('rb') as firds_xml:
+            firds_extractor._parse_firds_xml_file(firds_xml=firds_xml)
+
+        _, peak = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    # the xml file is ~7 MB and keeping the whole parsed tree in memory would take ~30 MB,
+    # while a batch of validated financial instruments takes ~2 MB
+    assert peak < 4 * 1024**2
+
+    with firds_extractor.firds_csv_path.open(encoding='utf-8') as f:
+        assert sum(1 for _ in f) == 20000
+
+
 @patch('etl_processor.extract.ZipFile')
-@patch('etl_processor.extract.BytesIO')
 @pytest.mark.extract
 def test_parse_firds_zip_file(
-    mock_bytes_io: MagicMock,
     mock_zip: MagicMock,
     firds_extractor: 'FIRDSExtractor',
 ) -> None:
     """
     Test _parse_firds_zip_file method.
     """
+    from io import BytesIO
+
     mock_zip_instance = MagicMock()
     mock_zip.return_value.__enter__.return_value = mock_zip_instance
 
     mock_zip_instance.namelist.return_value = ['file.xml', 'file.txt']
 
     mock_xml_file = MagicMock()
+    mock_xml_file.__enter__.return_value.read.side_effect = [b'xml content', b'']
     mock_zip_instance.open.return_value = mock_xml_file
 
+    contents = []
+    firds_zip_file = BytesIO(b'zip content')
     with patch.object(firds_extractor, '_parse_firds_xml_file') as mock_parse:
-        firds_extractor._parse_firds_zip_file(b'zip content')
-
-        mock_bytes_io.assert_called_once_with(b'zip content')
+        mock_parse.side_effect = (
+            lambda firds_xml, firds_csv_path, firds_xml_name: contents.append(firds_xml.read()) or 0
+        )
+        firds_extractor._parse_firds_zip_file(firds_zip_file)
 
-        mock_zip.assert_called_once_with(mock_bytes_io.return_value, 'r')
+        mock_zip.assert_called_once_with(firds_zip_file, 'r')
 
         mock_zip_instance.namelist.assert_called_once()
         mock_zip_instance.open.assert_called_once_with('file.xml')
 
-        mock_parse.assert_called_once_with(firds_xml=mock_zip_instance.open.return_value.__enter__.return_value)
+        mock_parse.assert_called_once_with(firds_xml=ANY, firds_csv_path=None, firds_xml_name='file.xml')
+        assert contents == [b'xml content']
 
 
-@patch('etl_processor.extract.httpx.get')
+@pytest.mark.extract
+def test_parse_firds_zip_file_members(tmp_path: Path, firds_xml_data: str, large_firds_xml: Path) -> None:
+    """
+    Test _parse_firds_zip_file parses every XML file of the zip file in order.
+    """
+    from io import BytesIO
+    from zipfile import ZIP_DEFLATED, ZipFile
+
+    from etl_processor.extract import FIRDSExtractor
+
+    firds_extractor = FIRDSExtractor(
+        firds_url='https://example.com',
+        data_dir=tmp_path,
+        decompress_workers=2,
+        decompress_buffer_size=1,
+    )
+
+    firds_zip_file = BytesIO()
+    with ZipFile(firds_zip_file, 'w', compression=ZIP_DEFLATED) as firds_zip:
+        firds_zip.writestr('DLTINS_1of3.xml', firds_xml_data.replace('EZV1JDJ1R5Q9', 'ID0000000001'))
+        firds_zip.writestr('README.txt', 'not a FIRDS file')
+        firds_zip.write(large_firds_xml, 'DLTINS_2of3.xml')
+        firds_zip.writestr('DLTINS_3of3.xml', firds_xml_data.replace('EZV1JDJ1R5Q9', 'ID0000000003'))
+
+    firds_zip_file.seek(0)
+    assert firds_extractor._parse_firds_zip_file(firds_zip_file) == 20002
+
+    with firds_extractor.firds_csv_path.open(encoding='utf-8') as f:
+        ids = [line.split(',', 1)[0] for line in f]
+
+    assert ids == ['ID0000000001', *(f'EZ{index:010d}' for index in range(20000)), 'ID0000000003']
+
+
+@pytest.mark.extract
+def test_parse_firds_zip_file_corrupted(tmp_path: Path, firds_xml_data: str, large_firds_xml: Path) -> None:
+    """
+    Test _parse_firds_zip_file raises the decompression errors and stops decompressing the remaining XML files.
+    """
+    import threading
+    from io import BytesIO
+    from zipfile import ZIP_STORED, BadZipFile, ZipFile
+
+    from etl_processor.extract import FIRDSExtractor
+
+    firds_extractor = FIRDSExtractor(
+        firds_url='https://example.com',
+        data_dir=tmp_path,
+        decompress_workers=2,
+        decompress_buffer_size=1,
+    )
+
+    firds_zip_file = BytesIO()
+    with ZipFile(firds_zip_file, 'w', compression=ZIP_STORED) as firds_zip:
+        firds_zip.writestr('DLTINS_1of2.xml', firds_xml_data)
+        firds_zip.write(large_firds_xml, 'DLTINS_2of2.xml')
+
+    # the stored xml file no longer matches its crc
+    firds_zip_bytes = firds_zip_file.getvalue().replace(b'Foreign_Exchange', b'Foreign_Exchangf', 1)
+
+    threads = threading.active_count()
+    with pytest.raises(BadZipFile):
+        firds_extractor._parse_firds_zip_file(BytesIO(firds_zip_bytes))
+
+    assert threading.active_count() == threads
+
+
+@patch('etl_processor.extract.httpx.Client.stream')
+@pytest.mark.extract
+def test_fetch_firds_file(
+    mock_stream: MagicMock,
+    firds_extractor: 'FIRDSExtractor',
+    firds_doc: 'FIRDSDoc',
+) -> None:
+    """
+    Test _fetch_firds_file method spools the download to disk above the memory threshold.
+    """
+    import hashlib
+
+    firds_doc = firds_doc.model_copy(update={'checksum': hashlib.md5(b'zip content').hexdigest()})
+    mock_response = mock_stream.return_value.__enter__.return_value
+    mock_response.iter_bytes.return_value = [b'zip ', b'content']
+
+    firds_extractor.spool_max_size = 4
+    with (
+        firds_extractor._http_client() as client,
+        firds_extractor._fetch_firds_file(client, firds_doc) as firds_zip_file,
+    ):
+        mock_stream.assert_called_once_with('GET', firds_doc.download_link, headers={})
+        assert firds_zip_file._rolled
+        assert firds_zip_file.read() == b'zip content'
+
+
+@pytest.mark.parametrize('asynchronous', [False, True])
+@pytest.mark.extract
+def test_download_firds_file_checksum(
+    asynchronous: bool,
+    tmp_path: Path,
+    http_server: 'StubHTTPServer',
+    firds_doc: 'FIRDSDoc',
+    firds_zip_factory: 'Callable[[str], bytes]',
+) -> None:
+    """
+    Test _download_firds_file and _adownload_firds_file download the FIRDS zip files again on a checksum mismatch.
+    """
+    import asyncio
+    import hashlib
+    from io import BytesIO
+
+    import httpx
+
+    from etl_processor.cache import HTTPCache
+    from etl_processor.exceptions import ExtractionError
+    from etl_processor.extract import FIRDSExtractor
+
+    firds_zip = firds_zip_factory('EZV1JDJ1R5Q9')
+    firds_doc = firds_doc.model_copy(
+        update={'download_link': http_server.url('/DLTINS.zip'), 'checksum': hashlib.md5(firds_zip).hexdigest()},
+    )
+    firds_extractor = FIRDSExtractor(
+        firds_url='https://example.com',
+        data_dir=tmp_path / 'data',
+        http_cache=HTTPCache(cache_dir=tmp_path / 'cache'),
+    )
+
+    def download(firds_zip_file: BytesIO) -> None:
+        if asynchronous:
+
+            async def adownload() -> None:
+                async with httpx.AsyncClient() as client:
+                    await firds_extractor._adownload_firds_file(client, firds_doc, firds_zip_file)
+
+            asyncio.run(adownload())
+
+        else:
+            with firds_extractor._http_client() as client:
+                firds_extractor._download_firds_file(client, firds_doc, firds_zip_file)
+
+    # the first download is corrupted in transit
+    corrupted_firds_zip = firds_zip[:10] + bytes([firds_zip[10] ^ 0xFF]) + firds_zip[11:]
+    responses = [corrupted_firds_zip, firds_zip]
+    http_server.routes['/DLTINS.zip'] = lambda params: responses.pop(0)
+
+    firds_zip_file = BytesIO()
+    download(firds_zip_file)
+    assert firds_zip_file.getvalue() == firds_zip
+    assert len(http_server.requests) == 2
+
+    # only the verified download is cached
+    assert firds_extractor.http_cache is not None
+    firds_cache_entry = firds_extractor.http_cache.lookup(firds_doc.download_link, firds_doc.checksum)
+    assert firds_cache_entry is not None
+    assert firds_cache_entry.digest == hashlib.sha256(firds_zip).hexdigest()
+
+    # the downloads give up after checksum_attempts mismatches
+    firds_doc = firds_doc.model_copy(update={'download_link': http_server.url('/DLTINS_corrupted.zip')})
+    http_server.contents['/DLTINS_corrupted.zip'] = corrupted_firds_zip
+
+    firds_zip_file = BytesIO()
+    with pytest.raises(ExtractionError):
+        download(firds_zip_file)
+
+    assert firds_zip_file.getvalue() == b''
+    assert len(http_server.requests) == 2 + firds_extractor.checksum_attempts
+    assert firds_extractor.http_cache.lookup(firds_doc.download_link, firds_doc.checksum) is None
+
+
+@patch('etl_processor.extract.httpx.Client.stream')
 @pytest.mark.extract
 def test_fetch_and_parse_firds_files(
-    mock_get: MagicMock,
+    mock_stream: MagicMock,
     firds_extractor: 'FIRDSExtractor',
     firds_doc: 'FIRDSDoc',
 ) -> None:
     """
     Test _fetch_and_parse_firds_files method.
     """
-    mock_response = MagicMock()
-    mock_response.content = b'zip content'
-    mock_get.return_value = mock_response
+    import hashlib
+
+    firds_doc = firds_doc.model_copy(update={'checksum': hashlib.md5(b'zip content').hexdigest()})
+    mock_response = mock_stream.return_value.__enter__.return_value
+    mock_response.iter_bytes.return_value = [b'zip ', b'content']
 
     firds_ref_docs = [firds_doc]
+    contents = []
     with patch.object(firds_extractor, '_parse_firds_zip_file') as mock_parse:
-        firds_extractor._fetch_and_parse_firds_files(firds_ref_docs)
-        mock_parse.assert_called_once_with(b'zip content')
+        mock_parse.side_effect = lambda firds_zip_file: contents.append(firds_zip_file.read())
+        with firds_extractor._http_client() as client:
+            firds_extractor._fetch_and_parse_firds_files(client, firds_ref_docs)
+
+        mock_parse.assert_called_once()
+        assert contents == [b'zip content']
+        assert mock_parse.call_args.args[0].closed
 
 
-@patch('etl_processor.extract.httpx.AsyncClient.get')
+@patch('etl_processor.extract.httpx.AsyncClient.stream')
 @pytest.mark.asyncio
 @pytest.mark.extract
 async def test_afetch_and_parse_firds_files(
-    mock_get: MagicMock,
+    mock_stream: MagicMock,
     firds_extractor: 'FIRDSExtractor',
     firds_doc: 'FIRDSDoc',
 ) -> None:
     mock_response = MagicMock()
-    mock_response.content = b'zip content'
-    mock_get.return_value = mock_response
+    mock_response.aiter_bytes.return_value.__aiter__.return_value = [b'zip ', b'content']
+    mock_stream.return_value.__aenter__.return_value = mock_response
+
+    import hashlib
+
+    from etl_processor.extract import _aiter
+
+    firds_doc = firds_doc.model_copy(update={'checksum': hashlib.md5(b'zip content').hexdigest()})
 
     firds_ref_docs = [firds_doc]
+    contents = []
     with patch.object(firds_extractor, '_parse_firds_zip_file') as mock_parse:
-        await firds_extractor._afetch_and_parse_firds_files(firds_ref_docs)
-        mock_parse.assert_called_once_with(b'zip content')
+        mock_parse.side_effect = lambda firds_zip_file: contents.append(firds_zip_file.read())
+        await firds_extractor._afetch_and_parse_firds_files(_aiter(firds_ref_docs))
+
+        mock_parse.assert_called_once()
+        assert contents == [b'zip content']
+
+
+@pytest.mark.asyncio
+@pytest.mark.extract
+async def test_afetch_and_parse_firds_files_concurrently(
+    firds_extractor: 'FIRDSExtractor',
+    firds_doc: 'FIRDSDoc',
+) -> None:
+    """
+    Test _afetch_and_parse_firds_files bounds the concurrent downloads and parses the files in order.
+    """
+    import asyncio
+    import hashlib
+    from collections.abc import AsyncIterator
+    from contextlib import asynccontextmanager
+
+    from etl_processor.extract import _aiter
+
+    firds_extractor.max_concurrency = 2
+    firds_ref_docs = [
+        firds_doc.model_copy(
+            update={
+                'download_link': f'https://example.com/DLTINS_{i}.zip',
+                'checksum': hashlib.md5(f'https://example.com/DLTINS_{i}.zip'.encode()).hexdigest(),
+            },
+        )
+        for i in range(5)
+    ]
+
+    in_flight = 0
+    max_in_flight = 0
+
+    @asynccontextmanager
+    async def mock_stream(method: str, url: str, headers: dict[str, str]) -> AsyncIterator[MagicMock]:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+
+        # the first files are the slowest to download
+        index = int(url.rsplit('_', 1)[1].split('.')[0])
+        await asyncio.sleep(0.01 * (5 - index))
+
+        in_flight -= 1
+        mock_response = MagicMock()
+        mock_response.aiter_bytes.return_value.__aiter__.return_value = [url.encode('utf-8')]
+        yield mock_response
+
+    parsed = []
+    with patch('etl_processor.extract.httpx.AsyncClient.stream', side_effect=mock_stream):
+        with patch.object(firds_extractor, '_parse_firds_zip_file') as mock_parse:
+            mock_parse.side_effect = lambda firds_zip_file: parsed.append(firds_zip_file.read())
+            await firds_extractor._afetch_and_parse_firds_files(_aiter(firds_ref_docs))
+
+    assert max_in_flight == 2
+    assert parsed == [doc.download_link.encode('utf-8') for doc in firds_ref_docs]
+
+
+@pytest.mark.extract
+def test_fetch_and_parse_firds_shards(
+    tmp_path: Path,
+    firds_doc: 'FIRDSDoc',
+    firds_zip_factory: 'Callable[[str], bytes]',
+) -> None:
+    """
+    Test _fetch_and_parse_firds_files parses the files in worker processes and keeps the reference document order.
+    """
+    import hashlib
+    from contextlib import contextmanager
+
+    from etl_processor.extract import FIRDSExtractor
+
+    firds_extractor = FIRDSExtractor(firds_url='https://example.com', data_dir=tmp_path, max_workers=2)
+    firds_ref_docs = [
+        firds_doc.model_copy(
+            update={
+                'download_link': f'https://example.com/ID{i:010d}',
+                'checksum': hashlib.md5(firds_zip_factory(f'ID{i:010d}')).hexdigest(),
+            },
+        )
+        for i in range(5)
+    ]
+
+    @contextmanager
+    def mock_stream(method: str, url: str, headers: dict[str, str]) -> 'Iterator[MagicMock]':
+        mock_response = MagicMock()
+        mock_response.iter_bytes.return_value = [firds_zip_factory(url.rsplit('/', 1)[1])]
+        yield mock_response
+
+    with (
+        patch('etl_processor.extract.httpx.Client.stream', side_effect=mock_stream),
+        firds_extractor._http_client() as client,
+    ):
+        firds_extractor._fetch_and_parse_firds_files(client, firds_ref_docs)
+
+    with firds_extractor.firds_csv_path.open(encoding='utf-8') as f:
+        ids = [line.split(',', 1)[0] for line in f]
+
+    assert ids == [f'ID{i:010d}' for i in range(5)]
+    assert not firds_extractor.firds_shards_dir.exists()
+
+
+@pytest.mark.asyncio
+@pytest.mark.extract
+async def test_afetch_and_parse_firds_shards(
+    tmp_path: Path,
+    firds_doc: 'FIRDSDoc',
+    firds_zip_factory: 'Callable[[str], bytes]',
+) -> None:
+    """
+    Test _afetch_and_parse_firds_files parses the files in worker processes and keeps the reference document order.
+    """
+    import hashlib
+    from contextlib import asynccontextmanager
+
+    from etl_processor.extract import FIRDSExtractor, _aiter
+
+    firds_extractor = FIRDSExtractor(firds_url='https://example.com', data_dir=tmp_path, max_workers=2)
+    firds_ref_docs = [
+        firds_doc.model_copy(
+            update={
+                'download_link': f'https://example.com/ID{i:010d}',
+                'checksum': hashlib.md5(firds_zip_factory(f'ID{i:010d}')).hexdigest(),
+            },
+        )
+        for i in range(5)
+    ]
+
+    @asynccontextmanager
+    async def mock_stream(method: str, url: str, headers: dict[str, str]) -> 'AsyncIterator[MagicMock]':
+        mock_response = MagicMock()
+        mock_response.aiter_bytes.return_value.__aiter__.return_value = [firds_zip_factory(url.rsplit('/', 1)[1])]
+        yield mock_response
+
+    with patch('etl_processor.extract.httpx.AsyncClient.stream', side_effect=mock_stream):
+        await firds_extractor._afetch_and_parse_firds_files(_aiter(firds_ref_docs))
+
+    with firds_extractor.firds_csv_path.open(encoding='utf-8') as f:
+        ids = [line.split(',', 1)[0] for line in f]
+
+    assert ids == [f'ID{i:010d}' for i in range(5)]
+    assert not firds_extractor.firds_shards_dir.exists()
 
 
 @patch('etl_processor.extract.csv.DictWriter')
@@ -157,7 +623,10 @@ def test_run(
     """
     with patch.object(firds_extractor, '_fetch_and_parse_firds_ref_doc') as mock_fetch:
         with patch.object(firds_extractor, '_fetch_and_parse_firds_files') as mock_parse:
-            with patch.object(firds_extractor, 'firds_csv_path') as csv_path:
+            with (
+                patch.object(firds_extractor, 'firds_csv_path') as csv_path,
+                patch.object(firds_extractor, '_save_firds_manifest') as mock_save,
+            ):
                 csv_path.open = MagicMock()
 
                 mock_fetch.return_value = [firds_doc]
@@ -174,7 +643,9 @@ def test_run(
                 mock_dict_writer.return_value.writeheader.assert_called_once()
 
                 mock_fetch.assert_called_once()
-                mock_parse.assert_called_once_with([firds_doc])
+                mock_parse.assert_called_once_with(ANY, [firds_doc])
+                # the manifest is saved when the extraction starts and completes
+                assert mock_save.call_count == 2
 
 
 @patch('etl_processor.extract.csv.DictWriter')
@@ -189,12 +660,25 @@ async def test_arun(
     """
     Test arun method.
     """
-    with patch.object(firds_extractor, '_fetch_and_parse_firds_ref_doc') as mock_fetch:
+    from collections.abc import AsyncIterable
+
+    from etl_processor.extract import _aiter
+
+    parsed_docs = []
+
+    async def mock_afetch_and_parse_files(firds_ref_docs: 'AsyncIterable[FIRDSDoc]') -> None:
+        parsed_docs.extend([firds_ref_doc async for firds_ref_doc in firds_ref_docs])
+
+    with patch.object(firds_extractor, '_afetch_and_parse_firds_ref_docs') as mock_fetch:
         with patch.object(firds_extractor, '_afetch_and_parse_firds_files') as mock_parse:
-            with patch.object(firds_extractor, 'firds_csv_path') as csv_path:
+            with (
+                patch.object(firds_extractor, 'firds_csv_path') as csv_path,
+                patch.object(firds_extractor, '_save_firds_manifest') as mock_save,
+            ):
                 csv_path.open = MagicMock()
 
-                mock_fetch.return_value = [firds_doc]
+                mock_fetch.side_effect = lambda client: _aiter([firds_doc])
+                mock_parse.side_effect = mock_afetch_and_parse_files
 
                 await firds_extractor.arun()
 
@@ -208,4 +692,426 @@ async def test_arun(
                 mock_dict_writer.return_value.writeheader.assert_called_once()
 
                 mock_fetch.assert_called_once()
-                mock_parse.assert_called_once_with([firds_doc])
+                mock_parse.assert_called_once()
+                assert parsed_docs == [firds_doc]
+                # the manifest is saved when the extraction starts and completes
+                assert mock_save.call_count == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.extract
+async def test_afetch_and_parse_firds_ref_docs(
+    tmp_path: Path,
+    http_server: 'StubHTTPServer',
+    firds_doc_data: dict[str, str],
+    firds_ref_doc_route_factory: 'Callable[[list[dict[str, str]]], Callable[[dict[str, str]], bytes]]',
+) -> None:
+    """
+    Test _afetch_and_parse_firds_ref_docs pages through the FIRDS reference documents in order.
+    """
+    import httpx
+
+    from etl_processor.extract import FIRDSExtractor
+
+    firds_doc_datas = [firds_doc_data | {'id': str(i), 'file_name': f'DLTINS_{i}.zip'} for i in range(7)]
+    http_server.routes['/solr/select'] = firds_ref_doc_route_factory(firds_doc_datas)
+
+    firds_extractor = FIRDSExtractor(
+        firds_url=http_server.url('/solr/select?q=*&wt=xml&start=0&rows=100'),
+        data_dir=tmp_path,
+        ref_doc_page_size=2,
+    )
+    async with httpx.AsyncClient() as client:
+        firds_ref_docs = [
+            firds_ref_doc async for firds_ref_doc in firds_extractor._afetch_and_parse_firds_ref_docs(client)
+        ]
+
+    assert [firds_ref_doc.file_name for firds_ref_doc in firds_ref_docs] == [f'DLTINS_{i}.zip' for i in range(7)]
+
+    # the start and rows of the solr query are overridden by the pages, within the documents found
+    paths = sorted(path for _, path, _ in http_server.requests)
+    assert paths == [
+        *[f'/solr/select?q=%2A&wt=xml&start={start}&rows=2' for start in (0, 2, 4)],
+        '/solr/select?q=%2A&wt=xml&start=6&rows=1',
+    ]
+
+
+@pytest.mark.asyncio
+@pytest.mark.extract
+async def test_arun_streams_firds_ref_docs(
+    tmp_path: Path,
+    http_server: 'StubHTTPServer',
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test arun method downloads the FIRDS zip files before the last page of FIRDS reference documents arrives.
+    """
+    import threading
+
+    from etl_processor.extract import FIRDSExtractor
+
+    firds_ids = [f'ID{i:010d}' for i in range(4)]
+    firds_url = serve_firds_files({f'{firds_id}.zip': firds_zip_factory(firds_id) for firds_id in firds_ids})
+    firds_ref_doc_route = http_server.routes['/solr/select']
+    first_download = threading.Event()
+    waited_pages = []
+
+    def firds_ref_doc_page(params: dict[str, str]) -> bytes:
+        # the last page is held back until the first zip file is downloaded
+        if params['start'] == '2':
+            waited_pages.append(first_download.wait(timeout=5))
+
+        return firds_ref_doc_route(params)
+
+    def firds_zip(params: dict[str, str]) -> bytes:
+        first_download.set()
+        return firds_zip_factory(firds_ids[0])
+
+    # the first zip file is rendered by its route instead of served as a static content
+    http_server.routes['/solr/select'] = firds_ref_doc_page
+    http_server.routes[f'/{firds_ids[0]}.zip'] = firds_zip
+    del http_server.contents[f'/{firds_ids[0]}.zip']
+
+    firds_extractor = FIRDSExtractor(
+        firds_url=firds_url,
+        data_dir=tmp_path,
+        ref_doc_page_size=2,
+    )
+    await firds_extractor.arun()
+
+    assert waited_pages == [True]
+
+    with firds_extractor.firds_csv_path.open(encoding='utf-8') as f:
+        ids = [line.split(',', 1)[0] for line in f]
+
+    assert ids == ['FinInstrmGnlAttrbts.Id', *firds_ids]
+
+
+@pytest.mark.parametrize('asynchronous', [False, True])
+@pytest.mark.extract
+def test_run_firds_url_bounds(
+    asynchronous: bool,
+    tmp_path: Path,
+    http_server: 'StubHTTPServer',
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test run and arun methods extract the same FIRDS reference documents, bounded by the start and rows of the firds_url.
+    """
+    import asyncio
+
+    from etl_processor.extract import FIRDSExtractor
+
+    firds_ids = [f'ID{i:010d}' for i in range(5)]
+    firds_url = serve_firds_files({f'{firds_id}.zip': firds_zip_factory(firds_id) for firds_id in firds_ids})
+
+    firds_extractor = FIRDSExtractor(
+        firds_url=f'{firds_url}?q=*&start=1&rows=3',
+        data_dir=tmp_path,
+        ref_doc_page_size=2,
+    )
+    if asynchronous:
+        asyncio.run(firds_extractor.arun())
+    else:
+        firds_extractor.run()
+
+    with firds_extractor.firds_csv_path.open(encoding='utf-8') as f:
+        ids = [line.split(',', 1)[0] for line in f]
+
+    assert ids == ['FinInstrmGnlAttrbts.Id', *firds_ids[1:4]]
+
+
+@pytest.mark.parametrize('asynchronous', [False, True])
+@pytest.mark.extract
+def test_run_firds_url_pages(
+    asynchronous: bool,
+    tmp_path: Path,
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test run and arun methods extract all the FIRDS reference documents found, in pages, for a firds_url without rows.
+    """
+    import asyncio
+
+    from etl_processor.extract import FIRDSExtractor
+
+    # more documents than the 10 rows of a solr query without rows
+    firds_ids = [f'ID{i:010d}' for i in range(12)]
+    firds_url = serve_firds_files({f'{firds_id}.zip': firds_zip_factory(firds_id) for firds_id in firds_ids})
+
+    firds_extractor = FIRDSExtractor(
+        firds_url=f'{firds_url}?q=*',
+        data_dir=tmp_path,
+        ref_doc_page_size=5,
+    )
+    if asynchronous:
+        asyncio.run(firds_extractor.arun())
+    else:
+        firds_extractor.run()
+
+    with firds_extractor.firds_csv_path.open(encoding='utf-8') as f:
+        ids = [line.split(',', 1)[0] for line in f]
+
+    assert ids == ['FinInstrmGnlAttrbts.Id', *firds_ids]
+
+
+@pytest.mark.asyncio
+@pytest.mark.extract
+async def test_arun_firds_ref_doc_failure(
+    tmp_path: Path,
+    http_server: 'StubHTTPServer',
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test arun method keeps the files extracted before if the FIRDS reference documents cannot be fetched.
+    """
+    from etl_processor.exceptions import NetworkError
+    from etl_processor.extract import FIRDSExtractor
+
+    firds_url = serve_firds_files({'ID0000000000.zip': firds_zip_factory('ID0000000000')})
+
+    firds_extractor = FIRDSExtractor(firds_url=firds_url, data_dir=tmp_path)
+    await firds_extractor.arun()
+    firds_csv = firds_extractor.firds_csv_path.read_bytes()
+    firds_manifest = firds_extractor.firds_manifest_path.read_bytes()
+
+    http_server.failures['/solr/select'] = [(500, {})]
+    with pytest.raises(NetworkError):
+        await firds_extractor.arun()
+
+    assert firds_extractor.firds_csv_path.read_bytes() == firds_csv
+    assert firds_extractor.firds_manifest_path.read_bytes() == firds_manifest
+
+
+@pytest.mark.extract
+def test_run_incremental(
+    tmp_path: Path,
+    firds_doc: 'FIRDSDoc',
+    firds_zip_factory: 'Callable[[str], bytes]',
+) -> None:
+    """
+    Test run method only extracts the new and changed files in the incremental mode.
+    """
+    import hashlib
+    import os
+    from contextlib import contextmanager
+
+    from etl_processor.extract import FIRDSExtractor
+    from etl_processor.models import FIRDSManifest
+
+    def firds_ref_doc(firds_id: str, content_id: str) -> 'FIRDSDoc':
+        # the documents with the same content have the same checksum
+        return firds_doc.model_copy(
+            update={
+                'download_link': f'https://example.com/{firds_id}?content={content_id}',
+                'file_name': f'DLTINS_{firds_id[:4]}.zip',
+                'checksum': hashlib.md5(firds_zip_factory(content_id)).hexdigest(),
+            },
+        )
+
+    fetched_links = []
+
+    @contextmanager
+    def mock_stream(method: str, url: str, headers: dict[str, str]) -> 'Iterator[MagicMock]':
+        fetched_links.append(url.split('?', 1)[0])
+        mock_response = MagicMock()
+        mock_response.iter_bytes.return_value = [firds_zip_factory(url.rsplit('=', 1)[1])]
+        yield mock_response
+
+    firds_extractor = FIRDSExtractor(firds_url='https://example.com', data_dir=tmp_path, incremental=True)
+    with (
+        patch('etl_processor.extract.httpx.Client.stream', side_effect=mock_stream),
+        patch.object(firds_extractor, '_fetch_and_parse_firds_ref_doc') as mock_fetch,
+    ):
+        mock_fetch.return_value = [
+            firds_ref_doc('AAAA000001', 'AAAA000001'),
+            firds_ref_doc('BBBB000001', 'BBBB000001'),
+            firds_ref_doc('DDDD000001', 'DDDD000001'),
+        ]
+        firds_extractor.run()
+
+        # the first file is unchanged, the second and fourth files changed and the third file is new
+        mock_fetch.return_value = [
+            firds_ref_doc('AAAA000002', 'AAAA000001'),
+            firds_ref_doc('BBBB000002', 'BBBB000002'),
+            firds_ref_doc('CCCC000002', 'CCCC000002'),
+            firds_ref_doc('DDDD000002', 'DDDD000002'),
+        ]
+        with patch('etl_processor.extract.os.replace', wraps=os.replace) as mock_replace:
+            firds_extractor.run()
+
+    # the rows of the changed files are removed by a single rewrite of the firds csv
+    assert [call.args[1] for call in mock_replace.call_args_list].count(firds_extractor.firds_csv_path) == 1
+
+    assert fetched_links == [
+        'https://example.com/AAAA000001',
+        'https://example.com/BBBB000001',
+        'https://example.com/DDDD000001',
+        'https://example.com/BBBB000002',
+        'https://example.com/CCCC000002',
+        'https://example.com/DDDD000002',
+    ]
+
+    with firds_extractor.firds_csv_path.open(encoding='utf-8') as f:
+        ids = [line.split(',', 1)[0] for line in f]
+
+    assert ids == ['FinInstrmGnlAttrbts.Id', 'AAAA000001', 'BBBB000002', 'CCCC000002', 'DDDD000002']
+
+    firds_manifest = FIRDSManifest.model_validate_json(firds_extractor.firds_manifest_path.read_text())
+    assert [firds_file.file_name for firds_file in firds_manifest.files] == [
+        'DLTINS_AAAA.zip',
+        'DLTINS_BBBB.zip',
+        'DLTINS_CCCC.zip',
+        'DLTINS_DDDD.zip',
+    ]
+    assert [firds_file.row_start for firds_file in firds_manifest.files] == [0, 1, 2, 3]
+    assert firds_manifest.byte_end == firds_extractor.firds_csv_path.stat().st_size
+
+    # the byte ranges locate the rows of each file
+    firds_csv = firds_extractor.firds_csv_path.read_bytes()
+    firds_file = firds_manifest.files[1]
+    assert firds_csv[firds_file.byte_start : firds_file.byte_end].startswith(b'BBBB000002,')
+
+    # the uncommitted rows appended after the last checkpoint are discarded
+    with firds_extractor.firds_csv_path.open('a', encoding='utf-8') as f:
+        f.write('uncommitted row\n')
+
+    with (
+        patch('etl_processor.extract.httpx.Client.stream', side_effect=mock_stream),
+        patch.object(firds_extractor, '_fetch_and_parse_firds_ref_doc') as mock_fetch,
+    ):
+        mock_fetch.return_value = [firds_ref_doc('AAAA000003', 'AAAA000001')]
+        firds_extractor.run()
+
+    assert fetched_links[-1] == 'https://example.com/DDDD000002'
+    assert firds_extractor.firds_csv_path.stat().st_size == firds_manifest.byte_end
+
+    # the files are extracted again when the csv does not match the manifest
+    with firds_extractor.firds_csv_path.open('r+', encoding='utf-8') as f:
+        f.truncate(firds_manifest.header_size)
+
+    with (
+        patch('etl_processor.extract.httpx.Client.stream', side_effect=mock_stream),
+        patch.object(firds_extractor, '_fetch_and_parse_firds_ref_doc') as mock_fetch,
+    ):
+        mock_fetch.return_value = [firds_ref_doc('AAAA000003', 'AAAA000001')]
+        firds_extractor.run()
+
+    assert fetched_links[-1] == 'https://example.com/AAAA000003'
+    assert firds_extractor.firds_csv_path.read_text(encoding='utf-8').splitlines()[1].startswith('AAAA000001,')
+
+
+@pytest.mark.parametrize('asynchronous', [False, True])
+@pytest.mark.extract
+def test_run_resume(
+    asynchronous: bool,
+    tmp_path: Path,
+    http_server: 'StubHTTPServer',
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test run and arun methods resume a failed extraction from the first unfinished file.
+    """
+    import asyncio
+
+    from etl_processor.exceptions import NetworkError
+    from etl_processor.extract import FIRDSExtractor
+    from etl_processor.models import FIRDSManifest
+
+    firds_ids = [f'ID{i:010d}' for i in range(3)]
+    firds_url = serve_firds_files({f'{firds_id}.zip': firds_zip_factory(firds_id) for firds_id in firds_ids})
+
+    firds_extractor = FIRDSExtractor(firds_url=firds_url, data_dir=tmp_path, max_concurrency=1)
+
+    def run() -> None:
+        if asynchronous:
+            asyncio.run(firds_extractor.arun())
+        else:
+            firds_extractor.run()
+
+    def fetched_paths() -> list[str]:
+        return [path for _, path, status in http_server.requests if path.endswith('.zip') and status == 200]
+
+    # the last file fails, after the rows of the first files are committed
+    http_server.failures[f'/{firds_ids[2]}.zip'] = [(404, {})]
+    with pytest.raises(NetworkError):
+        run()
+
+    firds_manifest = FIRDSManifest.model_validate_json(firds_extractor.firds_manifest_path.read_text())
+    assert not firds_manifest.complete
+    assert [firds_file.file_name for firds_file in firds_manifest.files] == [
+        f'{firds_id}.zip' for firds_id in firds_ids[:2]
+    ]
+
+    # a partial tail of rows is left uncommitted
+    with firds_extractor.firds_csv_path.open('a', encoding='utf-8') as f:
+        f.write(f'{firds_ids[2]},partial')
+
+    # the restarted extraction only fetches the unfinished file
+    fetched_before = len(fetched_paths())
+    run()
+    assert fetched_paths()[fetched_before:] == [f'/{firds_ids[2]}.zip']
+
+    with firds_extractor.firds_csv_path.open(encoding='utf-8') as f:
+        ids = [line.split(',', 1)[0] for line in f]
+
+    assert ids == ['FinInstrmGnlAttrbts.Id', *firds_ids]
+
+    firds_manifest = FIRDSManifest.model_validate_json(firds_extractor.firds_manifest_path.read_text())
+    assert firds_manifest.complete
+    assert firds_manifest.byte_end == firds_extractor.firds_csv_path.stat().st_size
+
+    # a completed extraction starts over
+    fetched_before = len(fetched_paths())
+    run()
+    assert fetched_paths()[fetched_before:] == [f'/{firds_id}.zip' for firds_id in firds_ids]
+
+
+@pytest.mark.parametrize('partitioned', [False, True])
+@pytest.mark.extract
+def test_run_resume_firds_url(
+    partitioned: bool,
+    tmp_path: Path,
+    http_server: 'StubHTTPServer',
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test run method starts over instead of resuming a failed extraction of another FIRDS URL.
+    """
+    from etl_processor.exceptions import NetworkError
+    from etl_processor.extract import FIRDSExtractor
+    from etl_processor.models import FIRDSDataset, FIRDSManifest
+
+    firds_ids = [f'ID{i:010d}' for i in range(3)]
+    firds_url = serve_firds_files({f'{firds_id}.zip': firds_zip_factory(firds_id) for firds_id in firds_ids})
+
+    # the last file fails, after the first files are committed
+    http_server.failures[f'/{firds_ids[2]}.zip'] = [(404, {})]
+    with pytest.raises(NetworkError):
+        FIRDSExtractor(firds_url=firds_url, data_dir=tmp_path, partitioned=partitioned).run()
+
+    # the extraction of another query only keeps the files it lists
+    firds_extractor = FIRDSExtractor(
+        firds_url=f'{firds_url}?start=2&rows=1', data_dir=tmp_path, partitioned=partitioned
+    )
+    firds_extractor.run()
+
+    if partitioned:
+        firds_dataset = FIRDSDataset.model_validate_json(firds_extractor.firds_dataset_path.read_text())
+        assert firds_dataset.firds_url == firds_extractor.firds_url
+        assert [partition.file_name for partition in firds_dataset.partitions] == [f'{firds_ids[2]}.zip']
+    else:
+        firds_manifest = FIRDSManifest.model_validate_json(firds_extractor.firds_manifest_path.read_text())
+        assert firds_manifest.firds_url == firds_extractor.firds_url
+        assert [firds_file.file_name for firds_file in firds_manifest.files] == [f'{firds_ids[2]}.zip']
+
+        with firds_extractor.firds_csv_path.open(encoding='utf-8') as f:
+            ids = [line.split(',', 1)[0] for line in f]
+
+        assert ids == ['FinInstrmGnlAttrbts.Id', firds_ids[2]]
@@ -0,0 +1,26 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.mark.chore
+def test_atomic_write_json(tmp_path: Path) -> None:
+    """
+    Test atomic_write_json writes the models and the JSON bytes, and keeps the previous file if the write fails.
+    """
+    from etl_processor.files import atomic_write_json
+    from etl_processor.models import FIRDSManifest
+
+    manifest_path = tmp_path / 'firds_manifest.json'
+    atomic_write_json(manifest_path, FIRDSManifest(columns=['Issr'], header_size=5))
+    assert FIRDSManifest.model_validate_json(manifest_path.read_bytes()).header_size == 5
+
+    atomic_write_json(manifest_path, b'{"columns": ["Issr"], "header_size": 6}')
+    assert FIRDSManifest.model_validate_json(manifest_path.read_bytes()).header_size == 6
+
+    # the file is flushed to disk before it is moved in place
+    with patch('etl_processor.files.os.fsync', side_effect=OSError), pytest.raises(OSError):
+        atomic_write_json(manifest_path, b'{}')
+
+    assert FIRDSManifest.model_validate_json(manifest_path.read_bytes()).header_size == 6
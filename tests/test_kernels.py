@@ -0,0 +1,77 @@
+import pytest
+
+
+@pytest.mark.parametrize('arrow', [False, True])
+@pytest.mark.transform
+def test_utf8_buffer(arrow: bool, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test utf8_buffer returns the UTF-8 buffer and offsets of the strings, with or without pyarrow.
+    """
+    import sys
+
+    import pandas as pd
+
+    from etl_processor.kernels import utf8_buffer
+
+    if arrow:
+        pytest.importorskip('pyarrow')
+    else:
+        monkeypatch.setitem(sys.modules, 'pyarrow', None)
+
+    values = pd.Series(['skip', 'Forward €', None, '', 'KFW'])[1:]
+
+    data, offsets = utf8_buffer(values)
+    assert bytes(data) == 'Forward €KFW'.encode()
+    assert offsets.tolist() == [0, 11, 11, 11, 14]
+
+    if arrow:
+        data, offsets = utf8_buffer(values.astype(pd.StringDtype('pyarrow')))
+        assert bytes(data) == 'Forward €KFW'.encode()
+        assert offsets.tolist() == [0, 11, 11, 11, 14]
+
+    data, offsets = utf8_buffer(values[:0])
+    assert data.size == 0
+    assert offsets.tolist() == [0]
+
+
+@pytest.mark.transform
+def test_count_substrings() -> None:
+    """
+    Test count_substrings counts the non-overlapping occurrences of every substring like str.count.
+    """
+    import random
+
+    import pandas as pd
+
+    from etl_processor.kernels import count_substrings, utf8_buffer
+
+    # the alphabet is small, so the substrings overlap, repeat and span the strings
+    rng = random.Random(0)
+    values = [''.join(rng.choices('abä ', k=rng.randint(0, 12))) for _ in range(500)]
+    substrings = ['a', 'ab', 'aa', 'aba', 'ä', 'bä', ' a ']
+
+    data, offsets = utf8_buffer(pd.Series(values))
+    counts = count_substrings(data, offsets, [substring.encode('utf-8') for substring in substrings])
+
+    assert counts.shape == (500, len(substrings))
+    assert counts.tolist() == [[value.count(substring) for substring in substrings] for value in values]
+
+
+@pytest.mark.transform
+def test_count_substrings_edge_cases() -> None:
+    """
+    Test count_substrings handles the matches across strings, empty buffers and empty substrings.
+    """
+    import numpy as np
+
+    from etl_processor.kernels import count_substrings
+
+    # the buffer holds 'xa' and 'bx', so the match of 'ab' spans two strings
+    data = np.frombuffer(b'xabx', dtype=np.uint8)
+    offsets = np.array([0, 2, 4], dtype=np.int64)
+    assert count_substrings(data, offsets, [b'ab', b'x']).tolist() == [[0, 1], [0, 1]]
+
+    assert count_substrings(np.zeros(0, dtype=np.uint8), np.array([0, 0]), [b'a']).tolist() == [[0]]
+
+    with pytest.raises(ValueError, match='empty'):
+        count_substrings(data, offsets, [b''])
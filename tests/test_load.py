@@ -1,7 +1,11 @@
 from pathlib import Path
+from typing import TYPE_CHECKING, Literal
 
 import pytest
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 
 @pytest.mark.load
 def test_init(firds_csv: Path) -> None:
@@ -19,6 +23,14 @@ def test_init(firds_csv: Path) -> None:
     assert firds_loader.system == 'file'
     assert firds_loader.target_path == str(firds_csv.parent / 'firds_gold.csv')
     assert firds_loader.storage_options == {}
+
+    with pytest.raises(ValueError):
+        FIRDSLoader(
+            data_dir=firds_csv.parent,
+            system='file',
+            target_path=str(firds_csv.parent / 'firds_gold.csv'),
+            input_format='json',  # type: ignore[arg-type]
+        )
     return
 
 
@@ -69,3 +81,86 @@ async def test_arun(firds_transformed_csv: Path) -> None:
         assert 'a_count' in header
         assert 'contains_a' in header
     return
+
+
+@pytest.mark.parametrize(
+    ('partitioned', 'output_format'),
+    [(False, 'csv'), (False, 'parquet'), (True, 'csv'), (True, 'parquet')],
+)
+@pytest.mark.load
+def test_run_transformed_layouts(
+    partitioned: bool,
+    output_format: Literal['csv', 'parquet'],
+    tmp_path: Path,
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test FIRDSLoder run loads the transformed FIRDS data in CSV or Parquet, as a single file or partitioned.
+    """
+    if output_format == 'parquet':
+        pytest.importorskip('pyarrow')
+
+    from etl_processor.extract import FIRDSExtractor
+    from etl_processor.load import FIRDSLoader
+    from etl_processor.transform import FIRDSTransformer
+
+    firds_url = serve_firds_files(
+        {
+            'DLTINS_20210117_01of01.zip': firds_zip_factory('AAAA00000001'),
+            'DLTINS_20210118_01of01.zip': firds_zip_factory('BBBB00000001'),
+        },
+        {
+            'DLTINS_20210117_01of01.zip': '2021-01-17T00:00:00Z',
+            'DLTINS_20210118_01of01.zip': '2021-01-18T00:00:00Z',
+        },
+    )
+    FIRDSExtractor(firds_url=firds_url, data_dir=tmp_path, partitioned=partitioned).run()
+    FIRDSTransformer(
+        data_dir=tmp_path,
+        partitioned=partitioned,
+        engine='pyarrow' if output_format == 'parquet' else 'pandas',
+        output_format=output_format,
+    ).run()
+
+    firds_loader = FIRDSLoader(
+        data_dir=tmp_path,
+        system='file',
+        target_path=str(tmp_path / 'firds_gold.csv'),
+        partitioned=partitioned,
+        input_format=output_format,
+    )
+    firds_loader.run()
+
+    header, *rows = (tmp_path / 'firds_gold.csv').read_text(encoding='utf-8').splitlines()
+    assert header.split(',')[-2:] == ['a_count', 'contains_a']
+    assert [row.split(',', 1)[0] for row in rows] == ['AAAA00000001', 'BBBB00000001']
+
+
+@pytest.mark.load
+def test_run_transformed_format_mismatch(
+    tmp_path: Path,
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test FIRDSLoder run raises an error if the partitioned transformed FIRDS dataset is in another format.
+    """
+    from etl_processor.exceptions import LoadError
+    from etl_processor.extract import FIRDSExtractor
+    from etl_processor.load import FIRDSLoader
+    from etl_processor.transform import FIRDSTransformer
+
+    firds_url = serve_firds_files({'DLTINS_20210117_01of01.zip': firds_zip_factory('AAAA00000001')})
+    FIRDSExtractor(firds_url=firds_url, data_dir=tmp_path, partitioned=True).run()
+    FIRDSTransformer(data_dir=tmp_path, partitioned=True).run()
+
+    firds_loader = FIRDSLoader(
+        data_dir=tmp_path,
+        system='file',
+        target_path=str(tmp_path / 'firds_gold.csv'),
+        partitioned=True,
+        input_format='parquet',
+    )
+    with pytest.raises(LoadError):
+        firds_loader.run()
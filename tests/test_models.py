@@ -85,3 +85,23 @@ def test_firds_csv_header() -> None:
         'Issr',
     ]
     assert FIRDS.csv_header() == expected_header
+
+
+def test_firds_record_type(firds_data: dict[str, str]) -> None:
+    """
+    Test the record_type class method of FIRDS validates the records as the model.
+    """
+    from pydantic import TypeAdapter
+
+    assert FIRDS.record_aliases() == ['Id', 'FullNm', 'ClssfctnTp', 'CmmdtyDerivInd', 'NtnlCcy', 'Issr']
+
+    assert FIRDS.record_paths()['Id'] == ('FinInstrmGnlAttrbts', 'Id')
+    assert FIRDS.record_paths()['Issr'] == ('Issr',)
+
+    record_adapter = TypeAdapter(FIRDS.record_type())
+    record = record_adapter.validate_python(firds_data)
+    assert list(record.values()) == list(FIRDS.model_validate(firds_data).model_dump().values())
+
+    firds_data['CmmdtyDerivInd'] = 'abc'
+    with pytest.raises(ValidationError):
+        record_adapter.validate_python(firds_data)
@@ -0,0 +1,247 @@
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+@pytest.mark.extract
+def test_firds_arrow_schema() -> None:
+    """
+    Test firds_arrow_schema derives the arrow types from the FIRDS model.
+    """
+    pa = pytest.importorskip('pyarrow')
+
+    from etl_processor.models import FIRDS
+    from etl_processor.parquet import firds_arrow_schema
+
+    schema = firds_arrow_schema()
+
+    assert schema.names == FIRDS.csv_header()
+    assert schema.field('FinInstrmGnlAttrbts.CmmdtyDerivInd').type == pa.bool_()
+    assert schema.field('FinInstrmGnlAttrbts.Id').type == pa.string()
+    assert not any(field.nullable for field in schema)
+
+
+@pytest.mark.parametrize('strict', [False, True])
+@pytest.mark.extract
+def test_parse_firds_xml_file_parquet(tmp_path: Path, firds_xml_data: str, strict: bool) -> None:
+    """
+    Test _parse_firds_xml_file writes the financial instruments to a typed Parquet file in row groups.
+    """
+    pq = pytest.importorskip('pyarrow.parquet')
+
+    from io import BytesIO
+
+    from etl_processor.extract import FIRDSExtractor
+
+    firds_instrument = firds_xml_data[firds_xml_data.index('<FinInstrm>') : firds_xml_data.index('</FinInstrm>') + 12]
+    firds_xml_data = firds_xml_data.replace(
+        firds_instrument,
+        firds_instrument
+        + firds_instrument.replace('<CmmdtyDerivInd>false', '<CmmdtyDerivInd>abc')
+        + firds_instrument.replace('EZV1JDJ1R5Q9', 'EZV1JDJ1R5Q8').replace('>false<', '>true<'),
+    )
+
+    firds_extractor = FIRDSExtractor(
+        firds_url='https://example.com',
+        data_dir=tmp_path,
+        strict=strict,
+        output_format='parquet',
+        parquet_row_group_size=1,
+    )
+    row_count = firds_extractor._parse_firds_xml_file(
+        firds_xml=BytesIO(firds_xml_data.encode('utf-8')),
+        firds_xml_name='DLTINS_20210117_01of01.xml',
+    )
+    assert row_count == 2
+
+    # the parquet file is named after the xml file and the invalid financial instrument is quarantined
+    firds_parquet_path = firds_extractor.firds_parquet_dir / 'DLTINS_20210117_01of01.parquet'
+    assert [path.name for path in firds_extractor.firds_parquet_dir.iterdir()] == [firds_parquet_path.name]
+    assert len(firds_extractor.firds_quarantine_path.read_text().splitlines()) == 1
+
+    firds_table = pq.read_table(firds_parquet_path)
+    assert firds_table.to_pydict() == {
+        'FinInstrmGnlAttrbts.Id': ['EZV1JDJ1R5Q9', 'EZV1JDJ1R5Q8'],
+        'FinInstrmGnlAttrbts.FullNm': ['Foreign_Exchange Forward JPY SEK 20210116'] * 2,
+        'FinInstrmGnlAttrbts.ClssfctnTp': ['JFTXFP'] * 2,
+        'FinInstrmGnlAttrbts.CmmdtyDerivInd': [False, True],
+        'FinInstrmGnlAttrbts.NtnlCcy': ['SEK'] * 2,
+        'Issr': ['2138004TYNQCB7MLTG76'] * 2,
+    }
+
+    # every row group holds a row, and the low-cardinality columns are dictionary encoded
+    metadata = pq.ParquetFile(firds_parquet_path).metadata
+    assert metadata.num_row_groups == 2
+
+    encodings = {
+        metadata.schema.column(index).name: metadata.row_group(0).column(index).encodings
+        for index in range(metadata.num_columns)
+    }
+    assert 'RLE_DICTIONARY' in encodings['FinInstrmGnlAttrbts.NtnlCcy']
+    assert 'RLE_DICTIONARY' not in encodings['FinInstrmGnlAttrbts.Id']
+
+
+@pytest.mark.extract
+def test_parse_firds_xml_file_parquet_error(tmp_path: Path, firds_xml_data: str) -> None:
+    """
+    Test _parse_firds_xml_file leaves no Parquet file if the XML file is malformed.
+    """
+    pytest.importorskip('pyarrow')
+
+    import xml.etree.ElementTree as ET
+    from io import BytesIO
+
+    from etl_processor.extract import FIRDSExtractor
+
+    firds_extractor = FIRDSExtractor(firds_url='https://example.com', data_dir=tmp_path, output_format='parquet')
+    with pytest.raises(ET.ParseError):
+        firds_extractor._parse_firds_xml_file(
+            firds_xml=BytesIO(firds_xml_data[:-200].encode('utf-8')),
+            firds_xml_name='DLTINS.xml',
+        )
+
+    assert list(firds_extractor.firds_parquet_dir.iterdir()) == []
+
+
+@pytest.mark.extract
+def test_parquet_output_format_options(tmp_path: Path) -> None:
+    """
+    Test FIRDSExtractor rejects the unsupported combinations of the Parquet output format.
+    """
+    from etl_processor.extract import FIRDSExtractor
+
+    with pytest.raises(ValueError, match='output format'):
+        FIRDSExtractor(firds_url='https://example.com', data_dir=tmp_path, output_format='orc')  # type: ignore[arg-type]
+
+    with pytest.raises(ValueError, match='snapshot'):
+        FIRDSExtractor(firds_url='https://example.com', data_dir=tmp_path, output_format='parquet', snapshot='memory')
+
+    with pytest.raises(ValueError, match='row group'):
+        FIRDSExtractor(
+            firds_url='https://example.com',
+            data_dir=tmp_path,
+            output_format='parquet',
+            parquet_row_group_size=0,
+        )
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+@pytest.mark.extract
+def test_run_parquet(
+    max_workers: int,
+    tmp_path: Path,
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test run method writes a Parquet dataset with a Parquet file per XML file.
+    """
+    pq = pytest.importorskip('pyarrow.parquet')
+
+    from etl_processor.extract import FIRDSExtractor
+    from etl_processor.models import FIRDSManifest
+
+    firds_ids = [f'ID{i:010d}' for i in range(3)]
+    firds_url = serve_firds_files({f'{firds_id}.zip': firds_zip_factory(firds_id) for firds_id in firds_ids})
+
+    firds_extractor = FIRDSExtractor(
+        firds_url=firds_url,
+        data_dir=tmp_path,
+        max_workers=max_workers,
+        output_format='parquet',
+    )
+    firds_extractor.run()
+
+    assert sorted(path.name for path in firds_extractor.firds_parquet_dir.iterdir()) == [
+        f'DLTINS_{firds_id}.parquet' for firds_id in firds_ids
+    ]
+    firds_table = pq.read_table(firds_extractor.firds_parquet_dir)
+    assert sorted(firds_table.column('FinInstrmGnlAttrbts.Id').to_pylist()) == firds_ids
+
+    # the rows are still checkpointed in the manifest, while the csv only keeps its header
+    firds_manifest = FIRDSManifest.model_validate_json(firds_extractor.firds_manifest_path.read_text())
+    assert [firds_file.row_count for firds_file in firds_manifest.files] == [1, 1, 1]
+    assert len(firds_extractor.firds_csv_path.read_text().splitlines()) == 1
+    assert not firds_extractor.firds_shards_dir.exists()
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+@pytest.mark.extract
+def test_run_parquet_incremental(
+    max_workers: int,
+    tmp_path: Path,
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test run method removes the Parquet files of a changed FIRDS file in the incremental mode, even if its XML file is
+    renamed.
+    """
+    pq = pytest.importorskip('pyarrow.parquet')
+
+    from etl_processor.extract import FIRDSExtractor
+
+    firds_zips = {'A.zip': firds_zip_factory('ID0000000000'), 'B.zip': firds_zip_factory('ID0000000001')}
+    firds_url = serve_firds_files(firds_zips)
+
+    firds_extractor = FIRDSExtractor(
+        firds_url=firds_url,
+        data_dir=tmp_path,
+        max_workers=max_workers,
+        output_format='parquet',
+        incremental=True,
+    )
+    firds_extractor.run()
+
+    # the changed zip file holds an xml file with another name
+    serve_firds_files(firds_zips | {'A.zip': firds_zip_factory('ID0000000002')})
+    firds_extractor.run()
+
+    assert sorted(path.name for path in firds_extractor.firds_parquet_dir.iterdir()) == [
+        'DLTINS_ID0000000001.parquet',
+        'DLTINS_ID0000000002.parquet',
+    ]
+    firds_table = pq.read_table(firds_extractor.firds_parquet_dir)
+    assert sorted(firds_table.column('FinInstrmGnlAttrbts.Id').to_pylist()) == ['ID0000000001', 'ID0000000002']
+
+
+@pytest.mark.parametrize('engine', ['pandas', 'pyarrow'])
+@pytest.mark.extract
+@pytest.mark.transform
+def test_transform_parquet(
+    engine: str,
+    tmp_path: Path,
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test FIRDSTransformer run transforms the Parquet dataset of a Parquet extraction like the FIRDS CSV.
+    """
+    pytest.importorskip('pyarrow')
+
+    from etl_processor.exceptions import TransformationError
+    from etl_processor.extract import FIRDSExtractor
+    from etl_processor.transform import FIRDSTransformer
+
+    firds_ids = [f'ID{i:010d}' for i in range(3)]
+    firds_url = serve_firds_files({f'{firds_id}.zip': firds_zip_factory(firds_id) for firds_id in firds_ids})
+
+    for output_format in ('csv', 'parquet'):
+        FIRDSExtractor(
+            firds_url=firds_url,
+            data_dir=tmp_path / output_format,
+            output_format=output_format,  # type: ignore[arg-type]
+        ).run()
+        FIRDSTransformer(data_dir=tmp_path / output_format, chunk_size=2, engine=engine).run()  # type: ignore[arg-type]
+
+    transformed_csv = (tmp_path / 'parquet' / 'firds_transformed.csv').read_text(encoding='utf-8')
+    assert transformed_csv == (tmp_path / 'csv' / 'firds_transformed.csv').read_text(encoding='utf-8')
+    assert len(transformed_csv.splitlines()) == 1 + 3
+
+    # the watermark of the incremental transformation locates the rows of the firds csv, which has none
+    with pytest.raises(TransformationError, match='Parquet extraction'):
+        FIRDSTransformer(data_dir=tmp_path / 'parquet', incremental=True).run()
@@ -0,0 +1,236 @@
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from tests.conftest import StubHTTPServer
+
+
+@pytest.mark.parametrize(('asynchronous', 'max_workers'), [(False, 1), (False, 2), (True, 1), (True, 2)])
+@pytest.mark.extract
+def test_run_partitioned(
+    asynchronous: bool,
+    max_workers: int,
+    tmp_path: Path,
+    http_server: 'StubHTTPServer',
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test run and arun methods extract every FIRDS file to its own partition and only replace the changed partitions.
+    """
+    import asyncio
+
+    from etl_processor.extract import FIRDSExtractor
+    from etl_processor.models import FIRDSDataset
+
+    firds_extractor = FIRDSExtractor(
+        firds_url=http_server.url('/solr/select'),
+        data_dir=tmp_path,
+        max_workers=max_workers,
+        incremental=True,
+        partitioned=True,
+    )
+
+    def run(firds_files: dict[str, tuple[str, str]]) -> FIRDSDataset:
+        serve_firds_files(
+            {file_name: firds_zip_factory(firds_id) for file_name, (_, firds_id) in firds_files.items()},
+            {file_name: publication_date for file_name, (publication_date, _) in firds_files.items()},
+        )
+        if asynchronous:
+            asyncio.run(firds_extractor.arun())
+        else:
+            firds_extractor.run()
+
+        return FIRDSDataset.model_validate_json(firds_extractor.firds_dataset_path.read_text())
+
+    def fetched_paths() -> list[str]:
+        return [path.split('?')[0] for _, path, status in http_server.requests if '.zip' in path and status == 200]
+
+    firds_dataset = run(
+        {
+            'DLTINS_20210117_01of01.zip': ('2021-01-17T00:00:00Z', 'AAAA00000001'),
+            'DLTINS_20210118_01of02.zip': ('2021-01-18T00:00:00Z', 'BBBB00000001'),
+            'DLTINS_20210118_02of02.zip': ('2021-01-18T00:00:00Z', 'CCCC00000001'),
+        },
+    )
+    assert firds_dataset.complete
+    assert firds_dataset.row_count == 3
+    assert [partition.path for partition in firds_dataset.partitions] == [
+        'publication_date=2021-01-17/file_name=DLTINS_20210117_01of01',
+        'publication_date=2021-01-18/file_name=DLTINS_20210118_01of02',
+        'publication_date=2021-01-18/file_name=DLTINS_20210118_02of02',
+    ]
+
+    # every partition is a csv with a header, and neither the firds csv nor the staged partitions are left
+    for partition, firds_id in zip(firds_dataset.partitions, ['AAAA00000001', 'BBBB00000001', 'CCCC00000001']):
+        rows = (firds_extractor.firds_dataset_dir / partition.path / 'firds.csv').read_text().splitlines()
+        assert rows[0].startswith('FinInstrmGnlAttrbts.Id,')
+        assert [row.split(',', 1)[0] for row in rows[1:]] == [firds_id]
+
+    assert not firds_extractor.firds_csv_path.exists()
+    assert not firds_extractor.firds_staging_dir.exists()
+
+    # the second file changed, while the others are untouched
+    fetched_before = len(fetched_paths())
+    firds_dataset = run(
+        {
+            'DLTINS_20210117_01of01.zip': ('2021-01-17T00:00:00Z', 'AAAA00000001'),
+            'DLTINS_20210118_01of02.zip': ('2021-01-18T00:00:00Z', 'BBBB00000002'),
+            'DLTINS_20210118_02of02.zip': ('2021-01-18T00:00:00Z', 'CCCC00000001'),
+        },
+    )
+    assert fetched_paths()[fetched_before:] == ['/DLTINS_20210118_01of02.zip']
+    assert sorted(partition.path for partition in firds_dataset.partitions) == [
+        'publication_date=2021-01-17/file_name=DLTINS_20210117_01of01',
+        'publication_date=2021-01-18/file_name=DLTINS_20210118_01of02',
+        'publication_date=2021-01-18/file_name=DLTINS_20210118_02of02',
+    ]
+    changed_partition = firds_extractor.firds_dataset_dir / firds_dataset.partitions[-1].path
+    assert (changed_partition / 'firds.csv').read_text().splitlines()[1].startswith('BBBB00000002,')
+
+
+@pytest.mark.extract
+def test_run_partitioned_parquet(
+    tmp_path: Path,
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test run method extracts a hive-partitioned Parquet dataset.
+    """
+    ds = pytest.importorskip('pyarrow.dataset')
+
+    from etl_processor.extract import FIRDSExtractor
+
+    firds_url = serve_firds_files(
+        {
+            'DLTINS_20210117_01of01.zip': firds_zip_factory('AAAA00000001'),
+            'DLTINS_20210118_01of01.zip': firds_zip_factory('BBBB00000001'),
+        },
+        {
+            'DLTINS_20210117_01of01.zip': '2021-01-17T00:00:00Z',
+            'DLTINS_20210118_01of01.zip': '2021-01-18T00:00:00Z',
+        },
+    )
+    firds_extractor = FIRDSExtractor(
+        firds_url=firds_url,
+        data_dir=tmp_path,
+        output_format='parquet',
+        partitioned=True,
+    )
+    firds_extractor.run()
+
+    # the partitions are pruned by their keys, and the manifest is ignored by the hive-style discovery
+    firds_dataset = ds.dataset(firds_extractor.firds_dataset_dir, format='parquet', partitioning='hive')
+    firds_table = firds_dataset.to_table(filter=ds.field('publication_date') == '2021-01-18')
+    assert firds_table.column('FinInstrmGnlAttrbts.Id').to_pylist() == ['BBBB00000001']
+    assert firds_table.column('file_name').to_pylist() == ['DLTINS_20210118_01of01']
+
+
+@pytest.mark.transform
+def test_transform_partitioned(
+    tmp_path: Path,
+    http_server: 'StubHTTPServer',
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test FIRDSTransformer transforms the partitions independently and skips the untouched ones.
+    """
+    from etl_processor.extract import FIRDSExtractor
+    from etl_processor.transform import FIRDSTransformer
+
+    firds_extractor = FIRDSExtractor(
+        firds_url=http_server.url('/solr/select'),
+        data_dir=tmp_path,
+        incremental=True,
+        partitioned=True,
+    )
+    firds_transformer = FIRDSTransformer(data_dir=tmp_path, partitioned=True)
+
+    publication_dates = {
+        'DLTINS_20210117_01of01.zip': '2021-01-17T00:00:00Z',
+        'DLTINS_20210118_01of01.zip': '2021-01-18T00:00:00Z',
+    }
+    firds_zips = {
+        'DLTINS_20210117_01of01.zip': firds_zip_factory('AAAA00000001'),
+        'DLTINS_20210118_01of01.zip': firds_zip_factory('BBBB00000001'),
+    }
+    serve_firds_files(firds_zips, publication_dates)
+    firds_extractor.run()
+    firds_transformer.run()
+
+    transformed_paths = {
+        file_name: tmp_path
+        / 'firds_transformed'
+        / f'publication_date={publication_date[:10]}'
+        / f'file_name={file_name[:-4]}'
+        / 'firds_transformed.csv'
+        for file_name, publication_date in publication_dates.items()
+    }
+    for transformed_path in transformed_paths.values():
+        header = transformed_path.read_text().splitlines()[0].split(',')
+        assert header[-2:] == ['a_count', 'contains_a']
+
+    # only the changed partition is transformed again
+    for transformed_path in transformed_paths.values():
+        transformed_path.write_text('untouched\n')
+
+    firds_zips['DLTINS_20210118_01of01.zip'] = firds_zip_factory('BBBB00000002')
+    serve_firds_files(firds_zips, publication_dates)
+    firds_extractor.run()
+    firds_transformer.run()
+
+    assert transformed_paths['DLTINS_20210117_01of01.zip'].read_text() == 'untouched\n'
+    assert transformed_paths['DLTINS_20210118_01of01.zip'].read_text().splitlines()[1].startswith('BBBB00000002,')
+
+
+@pytest.mark.transform
+def test_transform_partitioned_missing(tmp_path: Path) -> None:
+    """
+    Test FIRDSTransformer raises an error if the partitioned FIRDS dataset does not exist.
+    """
+    from etl_processor.exceptions import TransformationError
+    from etl_processor.transform import FIRDSTransformer
+
+    with pytest.raises(TransformationError):
+        FIRDSTransformer(data_dir=tmp_path, partitioned=True).run()
+
+
+@pytest.mark.transform
+def test_transform_partitioned_parquet(
+    tmp_path: Path,
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test FIRDSTransformer transforms the Parquet files of the partitions of a partitioned Parquet extraction.
+    """
+    pytest.importorskip('pyarrow')
+
+    from etl_processor.extract import FIRDSExtractor
+    from etl_processor.transform import FIRDSTransformer
+
+    firds_url = serve_firds_files({'DLTINS_20210117_01of01.zip': firds_zip_factory('AAAA00000001')})
+    FIRDSExtractor(
+        firds_url=firds_url,
+        data_dir=tmp_path,
+        output_format='parquet',
+        partitioned=True,
+    ).run()
+    FIRDSTransformer(data_dir=tmp_path, partitioned=True).run()
+
+    transformed_path = (
+        tmp_path
+        / 'firds_transformed'
+        / 'publication_date=2021-01-17'
+        / 'file_name=DLTINS_20210117_01of01'
+        / 'firds_transformed.csv'
+    )
+    header, row = transformed_path.read_text(encoding='utf-8').splitlines()
+    assert header.split(',')[-2:] == ['a_count', 'contains_a']
+    assert row.startswith('AAAA00000001,')
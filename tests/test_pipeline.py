@@ -0,0 +1,142 @@
+import pandas as pd
+import pytest
+
+FIRDS_COLUMNS = [
+    'FinInstrmGnlAttrbts.Id',
+    'FinInstrmGnlAttrbts.FullNm',
+    'FinInstrmGnlAttrbts.ClssfctnTp',
+    'FinInstrmGnlAttrbts.CmmdtyDerivInd',
+    'FinInstrmGnlAttrbts.NtnlCcy',
+    'Issr',
+]
+
+
+def name_length(full_name: pd.Series) -> pd.Series:
+    return full_name.str.len()
+
+
+def is_euro(currency: pd.Series) -> pd.Series:
+    return currency == 'EUR'
+
+
+def has_a(a_count: pd.Series) -> pd.Series:
+    return a_count > 0
+
+
+@pytest.mark.transform
+def test_compile() -> None:
+    """
+    Test TransformPipeline compile prunes the unused columns and derivations, and pushes the filters forward.
+    """
+    from etl_processor.pipeline import Derive, Filter, Select, SubstringCounts, TransformPipeline
+
+    substring_counts = SubstringCounts(substrings={'a': 'a'})
+    derive = Derive('name_length', ['FinInstrmGnlAttrbts.FullNm'], name_length)
+    unused_derive = Derive('issuer_length', ['Issr'], name_length)
+    a_filter = Filter(['a_count'], has_a)
+    euro_filter = Filter(['FinInstrmGnlAttrbts.NtnlCcy'], is_euro)
+
+    pipeline = TransformPipeline(
+        [
+            substring_counts,
+            derive,
+            unused_derive,
+            a_filter,
+            euro_filter,
+            Select(['FinInstrmGnlAttrbts.Id', 'name_length', 'contains_a']),
+        ],
+    )
+    compiled = pipeline.compile(FIRDS_COLUMNS)
+
+    assert compiled.columns == ['FinInstrmGnlAttrbts.Id', 'name_length', 'contains_a']
+    assert compiled.source_columns == [
+        'FinInstrmGnlAttrbts.Id',
+        'FinInstrmGnlAttrbts.FullNm',
+        'FinInstrmGnlAttrbts.NtnlCcy',
+    ]
+    # the filter of a source column runs first, the filter of a derived column right after its derivation
+    assert compiled.expressions == [euro_filter, substring_counts, a_filter, derive]
+
+
+@pytest.mark.transform
+def test_compile_missing_columns() -> None:
+    """
+    Test TransformPipeline compile rejects the expressions reading unavailable columns.
+    """
+    from etl_processor.pipeline import Derive, Select, TransformPipeline
+
+    with pytest.raises(ValueError, match='name_length'):
+        TransformPipeline([Select(['name_length'])]).compile(FIRDS_COLUMNS)
+
+    # the projection drops the columns of the later expressions
+    with pytest.raises(ValueError, match='FullNm'):
+        TransformPipeline(
+            [
+                Select(['FinInstrmGnlAttrbts.Id']),
+                Derive('name_length', ['FinInstrmGnlAttrbts.FullNm'], name_length),
+            ],
+        ).compile(FIRDS_COLUMNS)
+
+
+@pytest.mark.transform
+def test_apply() -> None:
+    """
+    Test CompiledPipeline apply transforms a chunk like the expressions applied in order of declaration.
+    """
+    from etl_processor.pipeline import Derive, Filter, Select, SubstringCounts, TransformPipeline
+
+    chunk = pd.DataFrame(
+        {
+            'FinInstrmGnlAttrbts.Id': ['ID1', 'ID2', 'ID3', 'ID4'],
+            'FinInstrmGnlAttrbts.FullNm': ['banana', 'KFW', None, 'Anl.v.2014'],
+            'FinInstrmGnlAttrbts.NtnlCcy': ['EUR', 'EUR', 'EUR', 'USD'],
+        },
+        index=[10, 11, 12, 13],
+    )
+    expressions = [
+        SubstringCounts(substrings={'a': 'a', 'an': 'an'}),
+        Derive('name_length', ['FinInstrmGnlAttrbts.FullNm'], name_length),
+        Filter(['a_count'], has_a),
+        Filter(['FinInstrmGnlAttrbts.NtnlCcy'], is_euro),
+        Select(['FinInstrmGnlAttrbts.Id', 'name_length', 'an_count']),
+    ]
+
+    expected = chunk.copy()
+    for expression in expressions:
+        expected = expression.apply(expected)
+
+    transformed = TransformPipeline(expressions).compile(list(chunk.columns)).apply(chunk)
+
+    # the derivations of the filtered rows only may infer narrower types
+    pd.testing.assert_frame_equal(transformed, expected, check_dtype=False)
+    assert transformed.to_dict('list') == {
+        'FinInstrmGnlAttrbts.Id': ['ID1'],
+        'name_length': [6],
+        'an_count': [2],
+    }
+
+
+@pytest.mark.transform
+def test_filter_missing_values() -> None:
+    """
+    Test Filter drops the rows whose predicate is missing.
+    """
+    from etl_processor.pipeline import Filter
+
+    chunk = pd.DataFrame({'FinInstrmGnlAttrbts.NtnlCcy': pd.array(['EUR', None, 'USD'], dtype='string')})
+
+    assert Filter(['FinInstrmGnlAttrbts.NtnlCcy'], is_euro).apply(chunk).index.tolist() == [0]
+
+
+@pytest.mark.transform
+def test_expression_options() -> None:
+    """
+    Test the expressions reject empty substrings and projections.
+    """
+    from etl_processor.pipeline import Select, SubstringCounts
+
+    with pytest.raises(ValueError, match='substrings'):
+        SubstringCounts(substrings={})
+
+    with pytest.raises(ValueError, match='projection'):
+        Select([])
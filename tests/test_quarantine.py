@@ -0,0 +1,140 @@
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from tests.conftest import StubHTTPServer
+
+
+def invalid_firds_xml(firds_xml_data: str, firds_id: str = 'EZV1JDJ1R5Q9') -> str:
+    # a valid financial instrument followed by an invalid one
+    firds_xml_data = firds_xml_data.replace('EZV1JDJ1R5Q9', firds_id)
+    firds_instrument = firds_xml_data[firds_xml_data.index('<FinInstrm>') : firds_xml_data.index('</FinInstrm>') + 12]
+    invalid_firds_instrument = (
+        firds_instrument.replace(firds_id, 'INVALID00001')
+        .replace('<CmmdtyDerivInd>false', '<CmmdtyDerivInd>abc')
+        .replace('<FullNm>Foreign_Exchange Forward JPY SEK 20210116</FullNm>', '')
+    )
+    return firds_xml_data.replace(firds_instrument, firds_instrument + invalid_firds_instrument)
+
+
+@pytest.mark.parametrize('strict', [False, True])
+@pytest.mark.extract
+def test_parse_firds_xml_file_quarantine(tmp_path: Path, firds_xml_data: str, strict: bool) -> None:
+    """
+    Test _parse_firds_xml_file quarantines the invalid financial instruments with their error codes.
+    """
+    import json
+    from io import BytesIO
+
+    from etl_processor.extract import FIRDSExtractor
+
+    firds_extractor = FIRDSExtractor(firds_url='https://example.com', data_dir=tmp_path, strict=strict)
+
+    # the valid financial instruments are not quarantined
+    firds_extractor._parse_firds_xml_file(firds_xml=BytesIO(firds_xml_data.encode('utf-8')))
+    assert not firds_extractor.firds_quarantine_path.exists()
+
+    row_count = firds_extractor._parse_firds_xml_file(
+        firds_xml=BytesIO(invalid_firds_xml(firds_xml_data).encode('utf-8')),
+        firds_xml_name='DLTINS.xml',
+    )
+    assert row_count == 1
+
+    quarantined = [json.loads(line) for line in firds_extractor.firds_quarantine_path.read_text().splitlines()]
+    assert len(quarantined) == 1
+    assert quarantined[0]['source'] == 'DLTINS.xml'
+    assert quarantined[0]['record']['Id'] == 'INVALID00001'
+    assert sorted(quarantined[0]['errors']) == ['CmmdtyDerivInd:bool_parsing', 'FullNm:missing']
+
+
+@pytest.mark.extract
+def test_quarantine_logging(tmp_path: Path) -> None:
+    """
+    Test FIRDSQuarantine rate-limits the summaries of the rejected records.
+    """
+    from etl_processor.quarantine import FIRDSQuarantine
+
+    with (
+        patch('etl_processor.quarantine.logger') as mock_logger,
+        patch('etl_processor.quarantine.time.monotonic') as mock_monotonic,
+    ):
+        mock_monotonic.return_value = 0.0
+        quarantine = FIRDSQuarantine(tmp_path / 'quarantine.jsonl', source='DLTINS.xml', log_interval=10.0)
+
+        with quarantine:
+            for index in range(1500):
+                # the clock advances by a second every 100 records
+                mock_monotonic.return_value = index / 100
+                quarantine.reject({'Id': str(index)}, ['FullNm:missing'])
+
+        assert quarantine.reject_count == 1500
+        assert quarantine.error_counts == {'FullNm:missing': 1500}
+
+        # a summary after 10 seconds and a last summary on close
+        assert mock_logger.warning.call_count == 2
+        assert 'Quarantined 1500 invalid FIRDS records of DLTINS.xml' in mock_logger.warning.call_args.args[0]
+
+    assert len((tmp_path / 'quarantine.jsonl').read_text().splitlines()) == 1500
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+@pytest.mark.extract
+def test_run_quarantine(
+    max_workers: int,
+    tmp_path: Path,
+    http_server: 'StubHTTPServer',
+    firds_xml_data: str,
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test run method counts the quarantined financial instruments of every FIRDS file in the manifest.
+    """
+    import json
+    from io import BytesIO
+    from zipfile import ZipFile
+
+    from etl_processor.exceptions import NetworkError
+    from etl_processor.extract import FIRDSExtractor
+    from etl_processor.models import FIRDSManifest
+
+    firds_xmls = {
+        'DLTINS_A.zip': invalid_firds_xml(firds_xml_data, 'AAAA00000001'),
+        'DLTINS_B.zip': firds_xml_data.replace('EZV1JDJ1R5Q9', 'BBBB00000001'),
+        'DLTINS_C.zip': invalid_firds_xml(firds_xml_data, 'CCCC00000001'),
+    }
+    firds_zips = {}
+    for file_name, firds_xml in firds_xmls.items():
+        firds_zip_io = BytesIO()
+        with ZipFile(firds_zip_io, 'w') as firds_zip_file:
+            firds_zip_file.writestr(file_name.replace('.zip', '.xml'), firds_xml)
+
+        firds_zips[file_name] = firds_zip_io.getvalue()
+
+    firds_url = serve_firds_files(firds_zips)
+
+    firds_extractor = FIRDSExtractor(
+        firds_url=firds_url,
+        data_dir=tmp_path,
+        max_workers=max_workers,
+    )
+    firds_extractor.run()
+
+    firds_manifest = FIRDSManifest.model_validate_json(firds_extractor.firds_manifest_path.read_text())
+    assert [firds_file.row_count for firds_file in firds_manifest.files] == [1, 1, 1]
+    assert [firds_file.reject_count for firds_file in firds_manifest.files] == [1, 0, 1]
+    assert firds_manifest.quarantine_size == firds_extractor.firds_quarantine_path.stat().st_size
+
+    quarantined = [json.loads(line) for line in firds_extractor.firds_quarantine_path.read_text().splitlines()]
+    assert [record['source'] for record in quarantined] == ['DLTINS_A.xml', 'DLTINS_C.xml']
+
+    # a new extraction starts over with an empty quarantine
+    http_server.failures['/DLTINS_A.zip'] = [(404, {})]
+    with pytest.raises(NetworkError):
+        firds_extractor.run()
+
+    assert not firds_extractor.firds_quarantine_path.exists()
@@ -0,0 +1,194 @@
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from etl_processor.models import FIRDSDoc
+    from tests.conftest import StubHTTPServer
+
+
+@pytest.fixture
+def firds_remote_zip(firds_xml_data: str, large_firds_xml: Path) -> bytes:
+    """
+    Fixture of a FIRDS zip file with a large XML file and a large incompressible file besides the XML files.
+    """
+    import random
+    from io import BytesIO
+    from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile
+
+    firds_zip_io = BytesIO()
+    with ZipFile(firds_zip_io, 'w', compression=ZIP_DEFLATED) as firds_zip:
+        firds_zip.writestr('DLTINS_1of3.xml', firds_xml_data.replace('EZV1JDJ1R5Q9', 'ID0000000001'))
+        firds_zip.writestr('README.bin', random.Random(0).randbytes(512 * 1024), compress_type=ZIP_STORED)
+        firds_zip.write(large_firds_xml, 'DLTINS_2of3.xml')
+        firds_zip.writestr('DLTINS_3of3.xml', firds_xml_data.replace('EZV1JDJ1R5Q9', 'ID0000000003'))
+
+    return firds_zip_io.getvalue()
+
+
+@pytest.mark.extract
+def test_http_range_file(http_server: 'StubHTTPServer') -> None:
+    """
+    Test HTTPRangeFile reads any range of the remote resource, serving the tail and the fetched windows from memory.
+    """
+    import httpx
+
+    from etl_processor.ranges import open_http_range_file
+
+    content = bytes(range(256)) * 1000
+    http_server.contents['/resource'] = content
+
+    with httpx.Client() as client:
+        http_range_file = open_http_range_file(client, http_server.url('/resource'), block_size=1000, tail_size=100)
+        assert http_range_file is not None
+        assert http_range_file.size == len(content)
+        assert http_server.requests == [('GET', '/resource', 206)]
+
+        # the tail is read from memory
+        http_range_file.seek(-50, 2)
+        assert http_range_file.read() == content[-50:]
+        assert len(http_server.requests) == 1
+
+        # a read beyond the windows fetches at least block_size bytes with a single range request
+        http_range_file.seek(500)
+        assert http_range_file.read(1200) == content[500:1700]
+        assert http_range_file.tell() == 1700
+        assert len(http_server.requests) == 2
+
+        http_range_file.seek(600)
+        assert http_range_file.read(100) == content[600:700]
+        assert len(http_server.requests) == 2
+
+        # a fork shares the tail, but not the windows
+        http_range_file_fork = http_range_file.fork()
+        assert http_range_file_fork.tell() == 0
+        assert http_range_file_fork.read() == content
+        assert http_server.bytes_sent['/resource'] == 100 + 1200 + len(content) - 100
+
+
+@pytest.mark.extract
+def test_open_http_range_file_unsupported(http_server: 'StubHTTPServer') -> None:
+    """
+    Test open_http_range_file returns None if the server does not support range requests.
+    """
+    import httpx
+
+    from etl_processor.ranges import open_http_range_file
+
+    http_server.contents['/resource'] = b'content'
+    http_server.accept_ranges = False
+
+    with httpx.Client() as client:
+        assert open_http_range_file(client, http_server.url('/resource')) is None
+
+    assert http_server.requests == [('GET', '/resource', 200)]
+
+
+@pytest.mark.parametrize('accept_ranges', [True, False])
+@pytest.mark.extract
+def test_list_firds_members(
+    accept_ranges: bool,
+    tmp_path: Path,
+    http_server: 'StubHTTPServer',
+    firds_doc: 'FIRDSDoc',
+    firds_remote_zip: bytes,
+) -> None:
+    """
+    Test list_firds_members lists the members of a FIRDS zip file from its tail, or from a full download.
+    """
+    import hashlib
+
+    from etl_processor.extract import FIRDSExtractor
+    from etl_processor.ranges import ZIP_TAIL_SIZE
+
+    http_server.contents['/DLTINS.zip'] = firds_remote_zip
+    http_server.accept_ranges = accept_ranges
+    firds_doc = firds_doc.model_copy(
+        update={
+            'download_link': http_server.url('/DLTINS.zip'),
+            'checksum': hashlib.md5(firds_remote_zip).hexdigest(),
+        },
+    )
+
+    firds_extractor = FIRDSExtractor(firds_url=http_server.url('/solr/select'), data_dir=tmp_path)
+    firds_members = firds_extractor.list_firds_members(firds_doc)
+
+    assert [firds_member.name for firds_member in firds_members] == [
+        'DLTINS_1of3.xml',
+        'README.bin',
+        'DLTINS_2of3.xml',
+        'DLTINS_3of3.xml',
+    ]
+    assert firds_members[1].file_size == firds_members[1].compress_size == 512 * 1024
+    assert firds_members[2].file_size > firds_members[2].compress_size
+
+    if accept_ranges:
+        assert http_server.requests == [('GET', '/DLTINS.zip', 206)]
+        assert http_server.bytes_sent['/DLTINS.zip'] == ZIP_TAIL_SIZE
+    else:
+        assert http_server.requests == [('GET', '/DLTINS.zip', 200), ('GET', '/DLTINS.zip', 200)]
+
+
+@pytest.mark.parametrize('accept_ranges', [True, False])
+@pytest.mark.parametrize('asynchronous', [False, True])
+@pytest.mark.extract
+def test_run_range_requests(
+    asynchronous: bool,
+    accept_ranges: bool,
+    tmp_path: Path,
+    http_server: 'StubHTTPServer',
+    firds_remote_zip: bytes,
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test run and arun methods only fetch the XML files of the FIRDS zip files with range requests,
+    and download the FIRDS zip files in full if the server does not support range requests.
+    """
+    import asyncio
+
+    from etl_processor.extract import FIRDSExtractor
+
+    http_server.accept_ranges = accept_ranges
+    firds_url = serve_firds_files({'DLTINS.zip': firds_remote_zip})
+
+    firds_extractor = FIRDSExtractor(
+        firds_url=firds_url,
+        data_dir=tmp_path,
+        range_requests=True,
+        range_block_size=16 * 1024,
+        decompress_workers=2,
+    )
+    if asynchronous:
+        asyncio.run(firds_extractor.arun())
+    else:
+        firds_extractor.run()
+
+    with firds_extractor.firds_csv_path.open(encoding='utf-8') as f:
+        ids = [line.split(',', 1)[0] for line in f][1:]
+
+    assert ids == ['ID0000000001', *(f'EZ{index:010d}' for index in range(20000)), 'ID0000000003']
+
+    statuses = {status for _, path, status in http_server.requests if path == '/DLTINS.zip'}
+    if accept_ranges:
+        # the incompressible file besides the xml files is never fetched
+        assert statuses == {206}
+        assert http_server.bytes_sent['/DLTINS.zip'] < len(firds_remote_zip) // 2
+    else:
+        assert statuses == {200}
+
+
+@pytest.mark.extract
+def test_range_requests_options(tmp_path: Path) -> None:
+    """
+    Test FIRDSExtractor rejects the unsupported options of the range requests.
+    """
+    from etl_processor.extract import FIRDSExtractor
+
+    with pytest.raises(ValueError, match='single worker'):
+        FIRDSExtractor(firds_url='https://example.com', data_dir=tmp_path, range_requests=True, max_workers=2)
+
+    with pytest.raises(ValueError, match='block size'):
+        FIRDSExtractor(firds_url='https://example.com', data_dir=tmp_path, range_block_size=0)
@@ -0,0 +1,186 @@
+from pathlib import Path
+from typing import TYPE_CHECKING
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from tests.conftest import StubHTTPServer
+
+
+@pytest.mark.extract
+def test_backoff() -> None:
+    """
+    Test RetryPolicy backs off exponentially and honours the Retry-After header.
+    """
+    from email.utils import formatdate
+
+    import httpx
+
+    from etl_processor.retry import RetryPolicy
+
+    retry_policy = RetryPolicy(backoff_factor=0.5, max_backoff=3.0, jitter=False)
+    assert [retry_policy.backoff(attempt) for attempt in range(1, 6)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+    response = httpx.Response(503, headers={'Retry-After': '2'})
+    assert retry_policy.backoff(1, response) == 2.0
+
+    response = httpx.Response(503, headers={'Retry-After': '120'})
+    assert retry_policy.backoff(1, response) == 3.0
+
+    response = httpx.Response(503, headers={'Retry-After': formatdate(0, usegmt=True)})
+    assert retry_policy.backoff(1, response) == 0.0
+
+    response = httpx.Response(503, headers={'Retry-After': 'soon'})
+    assert retry_policy.backoff(1, response) == 0.5
+
+    retry_policy = RetryPolicy(backoff_factor=0.5, jitter=True)
+    assert all(0 <= retry_policy.backoff(3) <= 2.0 for _ in range(100))
+
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+
+@patch('etl_processor.retry.time.sleep')
+@pytest.mark.extract
+def test_retry_transport(mock_sleep: MagicMock) -> None:
+    """
+    Test RetryTransport retries the transport errors and the retryable status codes, recording every attempt.
+    """
+    import httpx
+
+    from etl_processor.retry import RetryPolicy, RetryTransport
+
+    outcomes: list[httpx.Response | Exception] = [
+        httpx.ConnectError('Connection refused'),
+        httpx.Response(503, headers={'Retry-After': '1.5'}),
+        httpx.Response(200, content=b'content'),
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+
+        return outcome
+
+    retry_policy = RetryPolicy(backoff_factor=0.5, jitter=False)
+    transport = RetryTransport(httpx.MockTransport(handler), retry_policy)
+    with httpx.Client(transport=transport) as client:
+        response = client.get('https://example.com/DLTINS.zip')
+
+    assert response.status_code == 200
+    assert response.content == b'content'
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [0.5, 1.5]
+
+    assert [attempt.attempt for attempt in transport.attempts] == [1, 2, 3]
+    assert [attempt.status_code for attempt in transport.attempts] == [None, 503, 200]
+    assert transport.attempts[0].error is not None
+    assert all(attempt.elapsed >= 0 for attempt in transport.attempts)
+
+
+@patch('etl_processor.retry.time.sleep')
+@pytest.mark.extract
+def test_retry_transport_exhausted(mock_sleep: MagicMock) -> None:
+    """
+    Test RetryTransport gives up after the maximum number of attempts and does not retry non-idempotent requests.
+    """
+    import httpx
+
+    from etl_processor.retry import RetryPolicy, RetryTransport
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == '/error':
+            raise httpx.ReadTimeout('Timed out')
+
+        return httpx.Response(503)
+
+    transport = RetryTransport(httpx.MockTransport(handler), RetryPolicy(max_attempts=3))
+    with httpx.Client(transport=transport) as client:
+        assert client.get('https://example.com/').status_code == 503
+        assert len(transport.attempts) == 3
+
+        with pytest.raises(httpx.ReadTimeout):
+            client.get('https://example.com/error')
+
+        assert len(transport.attempts) == 6
+
+        assert client.post('https://example.com/').status_code == 503
+        assert len(transport.attempts) == 7
+
+
+@patch('etl_processor.retry.time.sleep')
+@pytest.mark.extract
+def test_run_retries(
+    mock_sleep: MagicMock,
+    tmp_path: Path,
+    http_server: 'StubHTTPServer',
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test run method survives the transient errors of the FIRDS server.
+    """
+    from etl_processor.extract import FIRDSExtractor
+
+    firds_url = serve_firds_files({'DLTINS.zip': firds_zip_factory('EZV1JDJ1R5Q9')})
+    http_server.failures['/solr/select'] = [(502, {})]
+    http_server.failures['/DLTINS.zip'] = [(503, {'Retry-After': '1'}), (429, {'Retry-After': '2'})]
+
+    firds_extractor = FIRDSExtractor(firds_url=firds_url, data_dir=tmp_path)
+    firds_extractor.run()
+
+    with firds_extractor.firds_csv_path.open(encoding='utf-8') as f:
+        ids = [line.split(',', 1)[0] for line in f]
+
+    assert ids == ['FinInstrmGnlAttrbts.Id', 'EZV1JDJ1R5Q9']
+    assert [attempt.status_code for attempt in firds_extractor.http_attempts] == [502, 200, 503, 429, 200]
+    assert [call.args[0] for call in mock_sleep.call_args_list][1:] == [1.0, 2.0]
+
+
+@pytest.mark.parametrize('accept_ranges', [True, False])
+@patch('etl_processor.retry.time.sleep')
+@pytest.mark.extract
+def test_run_resumes_downloads(
+    mock_sleep: MagicMock,
+    accept_ranges: bool,
+    tmp_path: Path,
+    http_server: 'StubHTTPServer',
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test run method retries the FIRDS zip files whose connection is lost while their content is read,
+    resuming them from the bytes received, or downloading them again if the server does not support range requests.
+    """
+    from etl_processor.exceptions import NetworkError
+    from etl_processor.extract import FIRDSExtractor
+
+    firds_zip = firds_zip_factory('EZV1JDJ1R5Q9')
+    firds_url = serve_firds_files({'DLTINS.zip': firds_zip})
+    http_server.accept_ranges = accept_ranges
+    http_server.resets['/DLTINS.zip'] = [100, 200]
+
+    firds_extractor = FIRDSExtractor(firds_url=firds_url, data_dir=tmp_path)
+    firds_extractor.run()
+
+    with firds_extractor.firds_csv_path.open(encoding='utf-8') as f:
+        ids = [line.split(',', 1)[0] for line in f]
+
+    assert ids == ['FinInstrmGnlAttrbts.Id', 'EZV1JDJ1R5Q9']
+    assert mock_sleep.call_count == 2
+
+    firds_zip_statuses = [status for _, path, status in http_server.requests if path == '/DLTINS.zip']
+    if accept_ranges:
+        assert firds_zip_statuses == [200, 206, 206]
+        assert http_server.bytes_sent['/DLTINS.zip'] == len(firds_zip)
+    else:
+        assert firds_zip_statuses == [200, 200, 200]
+        assert http_server.bytes_sent['/DLTINS.zip'] == 100 + 200 + len(firds_zip)
+
+    # the connections lost while the content is read give up after the attempts of the retry policy
+    http_server.resets['/DLTINS.zip'] = [100] * firds_extractor.retry_policy.max_attempts
+    with pytest.raises(NetworkError):
+        FIRDSExtractor(firds_url=firds_url, data_dir=tmp_path / 'failed').run()
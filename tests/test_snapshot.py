@@ -0,0 +1,173 @@
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from etl_processor.models import FIRDSManifest
+
+
+def write_firds_csv(firds_csv_path: Path, files: dict[str, tuple[str, list[list[str]]]]) -> 'FIRDSManifest':
+    import csv
+    from datetime import datetime
+
+    from etl_processor.models import FIRDSFileRows, FIRDSManifest
+
+    # write the rows of every file to the csv, recording their byte ranges in the manifest
+    with firds_csv_path.open('w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['FinInstrmGnlAttrbts.Id', 'FinInstrmGnlAttrbts.FullNm'])
+        firds_manifest = FIRDSManifest(columns=['FinInstrmGnlAttrbts.Id', 'FinInstrmGnlAttrbts.FullNm'], header_size=0)
+        firds_manifest.header_size = f.tell()
+
+        for file_name, (publication_date, rows) in files.items():
+            byte_start = f.tell()
+            writer.writerows(rows)
+            firds_manifest.files.append(
+                FIRDSFileRows(
+                    file_name=file_name,
+                    checksum=file_name,
+                    version=1,
+                    publication_date=datetime.fromisoformat(publication_date),
+                    row_start=firds_manifest.row_end,
+                    row_count=len(rows),
+                    byte_start=byte_start,
+                    byte_end=f.tell(),
+                ),
+            )
+
+    return firds_manifest
+
+
+@pytest.mark.parametrize('on_disk', [False, True])
+@pytest.mark.extract
+def test_snapshot(tmp_path: Path, on_disk: bool) -> None:
+    """
+    Test FIRDSSnapshot keeps the latest row of every financial instrument by publication date.
+    """
+    import csv
+
+    from etl_processor.snapshot import FIRDSSnapshot
+
+    firds_csv_path = tmp_path / 'firds.csv'
+    firds_manifest = write_firds_csv(
+        firds_csv_path,
+        {
+            # the latest file comes first in the csv
+            'DLTINS_3.zip': ('2021-01-19T00:00:00+00:00', [['A', 'a3'], ['C', 'c3']]),
+            'DLTINS_1.zip': ('2021-01-17T00:00:00+00:00', [['A', 'a1'], ['B', 'b1'], ['D', 'multi\nline,"d1"']]),
+            # the files published at once keep the order of the csv
+            'DLTINS_2a.zip': ('2021-01-18T00:00:00+00:00', [['B', 'b2a']]),
+            'DLTINS_2b.zip': ('2021-01-18T00:00:00+00:00', [['B', 'b2b'], ['B', 'b2c']]),
+        },
+    )
+
+    index_path = tmp_path / 'firds_snapshot.sqlite' if on_disk else None
+    with FIRDSSnapshot(firds_csv_path, index_path=index_path, batch_size=2) as firds_snapshot:
+        assert firds_snapshot.index(firds_manifest) == 8
+        assert len(firds_snapshot) == 4
+        assert firds_snapshot.write(tmp_path / 'firds_snapshot.csv') == 4
+
+    if index_path is not None:
+        assert not index_path.exists()
+
+    with (tmp_path / 'firds_snapshot.csv').open(encoding='utf-8', newline='') as f:
+        rows = list(csv.reader(f))
+
+    # the rows keep the order of the csv
+    assert rows == [
+        ['FinInstrmGnlAttrbts.Id', 'FinInstrmGnlAttrbts.FullNm'],
+        ['A', 'a3'],
+        ['C', 'c3'],
+        ['D', 'multi\nline,"d1"'],
+        ['B', 'b2c'],
+    ]
+
+
+@pytest.mark.parametrize('asynchronous', [False, True])
+@pytest.mark.parametrize('snapshot', ['memory', 'disk'])
+@pytest.mark.extract
+def test_run_snapshot(
+    asynchronous: bool,
+    snapshot: str,
+    tmp_path: Path,
+    firds_xml_data: str,
+    serve_firds_files: 'Callable[..., str]',
+) -> None:
+    """
+    Test run and arun methods write the latest-wins snapshot of the FIRDS CSV in the snapshot mode.
+    """
+    import asyncio
+    from io import BytesIO
+    from zipfile import ZipFile
+
+    from etl_processor.extract import FIRDSExtractor
+
+    def firds_zip(firds_id: str, full_name: str) -> bytes:
+        firds_zip_io = BytesIO()
+        with ZipFile(firds_zip_io, 'w') as firds_zip_file:
+            firds_zip_file.writestr(
+                'DLTINS.xml',
+                firds_xml_data.replace('EZV1JDJ1R5Q9', firds_id).replace(
+                    'Foreign_Exchange Forward JPY SEK 20210116',
+                    full_name,
+                ),
+            )
+
+        return firds_zip_io.getvalue()
+
+    firds_url = serve_firds_files(
+        {
+            'DLTINS_NEW.zip': firds_zip('SHARED000001', 'new'),
+            'DLTINS_OLD.zip': firds_zip('SHARED000001', 'old'),
+            'DLTINS_OTHER.zip': firds_zip('OTHER0000001', 'other'),
+        },
+        {
+            'DLTINS_NEW.zip': '2021-01-19T00:00:00Z',
+            'DLTINS_OLD.zip': '2021-01-18T00:00:00Z',
+            'DLTINS_OTHER.zip': '2021-01-18T00:00:00Z',
+        },
+    )
+
+    firds_extractor = FIRDSExtractor(
+        firds_url=firds_url,
+        data_dir=tmp_path,
+        snapshot=snapshot,  # type: ignore[arg-type]
+    )
+    if asynchronous:
+        asyncio.run(firds_extractor.arun())
+    else:
+        firds_extractor.run()
+
+    # every file is extracted, while the snapshot only keeps the latest row of every financial instrument
+    firds_rows = firds_extractor.firds_csv_path.read_text(encoding='utf-8').splitlines()
+    assert [row.split(',', 2)[:2] for row in firds_rows[1:]] == [
+        ['SHARED000001', 'new'],
+        ['SHARED000001', 'old'],
+        ['OTHER0000001', 'other'],
+    ]
+
+    snapshot_rows = firds_extractor.firds_snapshot_path.read_text(encoding='utf-8').splitlines()
+    assert snapshot_rows[0] == firds_rows[0]
+    assert [row.split(',', 2)[:2] for row in snapshot_rows[1:]] == [
+        ['SHARED000001', 'new'],
+        ['OTHER0000001', 'other'],
+    ]
+    assert not firds_extractor.firds_snapshot_index_path.exists()
+
+
+@pytest.mark.extract
+def test_run_without_snapshot(tmp_path: Path) -> None:
+    """
+    Test FIRDSExtractor rejects an unknown snapshot mode and writes no snapshot by default.
+    """
+    from etl_processor.extract import FIRDSExtractor
+
+    with pytest.raises(ValueError, match='snapshot'):
+        FIRDSExtractor(firds_url='https://example.com', data_dir=tmp_path, snapshot='redis')  # type: ignore[arg-type]
+
+    firds_extractor = FIRDSExtractor(firds_url='https://example.com', data_dir=tmp_path)
+    firds_extractor._write_firds_snapshot()
+    assert not firds_extractor.firds_snapshot_path.exists()
@@ -0,0 +1,181 @@
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from tests.conftest import StubHTTPServer
+
+
+@pytest.fixture
+def firds_stream_url(
+    firds_zip_factory: 'Callable[[str], bytes]',
+    serve_firds_files: 'Callable[..., str]',
+    large_firds_xml: Path,
+) -> str:
+    """
+    Fixture of the URL of a FIRDS database with a large FIRDS zip file between two small ones.
+    """
+    from io import BytesIO
+    from zipfile import ZIP_DEFLATED, ZipFile
+
+    large_firds_zip_io = BytesIO()
+    with ZipFile(large_firds_zip_io, 'w', compression=ZIP_DEFLATED) as large_firds_zip:
+        large_firds_zip.write(large_firds_xml, 'DLTINS_large.xml')
+
+    return serve_firds_files(
+        {
+            'ID0000000001.zip': firds_zip_factory('ID0000000001'),
+            'large.zip': large_firds_zip_io.getvalue(),
+            'ID0000000003.zip': firds_zip_factory('ID0000000003'),
+        },
+    )
+
+
+@pytest.mark.parametrize('raw_csv', [True, False])
+@pytest.mark.parametrize('asynchronous', [False, True])
+@pytest.mark.extract
+@pytest.mark.transform
+def test_run_streaming(asynchronous: bool, raw_csv: bool, tmp_path: Path, firds_stream_url: str) -> None:
+    """
+    Test run and arun methods transform the validated financial instruments in memory,
+    like the transformation of the FIRDS CSV, with or without writing the FIRDS CSV.
+    """
+    import asyncio
+
+    from etl_processor.extract import FIRDSExtractor
+    from etl_processor.transform import FIRDSTransformer
+
+    # the two steps extraction and transformation
+    FIRDSExtractor(firds_url=firds_stream_url, data_dir=tmp_path / 'steps').run()
+    FIRDSTransformer(data_dir=tmp_path / 'steps', chunk_size=3000).run()
+
+    firds_transformer = FIRDSTransformer(data_dir=tmp_path / 'streaming', chunk_size=3000)
+    firds_extractor = FIRDSExtractor(
+        firds_url=firds_stream_url,
+        data_dir=tmp_path / 'streaming',
+        transformer=firds_transformer,
+        raw_csv=raw_csv,
+    )
+    if asynchronous:
+        asyncio.run(firds_extractor.arun())
+    else:
+        firds_extractor.run()
+
+    transformed_csv = (tmp_path / 'streaming' / 'firds_transformed.csv').read_text(encoding='utf-8')
+    assert transformed_csv == (tmp_path / 'steps' / 'firds_transformed.csv').read_text(encoding='utf-8')
+    assert len(transformed_csv.splitlines()) == 1 + 20002
+
+    assert firds_extractor.firds_csv_path.exists() == raw_csv
+    assert firds_extractor.firds_manifest_path.exists() == raw_csv
+    if raw_csv:
+        assert firds_extractor.firds_csv_path.read_bytes() == (tmp_path / 'steps' / 'firds.csv').read_bytes()
+
+    assert not list((tmp_path / 'streaming').glob('*.tmp'))
+
+
+@pytest.mark.extract
+@pytest.mark.transform
+def test_run_streaming_pyarrow(tmp_path: Path, firds_stream_url: str) -> None:
+    """
+    Test run method transforms the financial instruments in memory with the pyarrow engine to Parquet.
+    """
+    pytest.importorskip('pyarrow')
+
+    import pyarrow.parquet as pq
+
+    from etl_processor.extract import FIRDSExtractor
+    from etl_processor.transform import FIRDSTransformer
+
+    firds_transformer = FIRDSTransformer(data_dir=tmp_path, chunk_size=3000, engine='pyarrow', output_format='parquet')
+    FIRDSExtractor(firds_url=firds_stream_url, data_dir=tmp_path, transformer=firds_transformer, raw_csv=False).run()
+
+    transformed = pq.read_table(tmp_path / 'firds_transformed.parquet')
+    assert transformed.num_rows == 20002
+    assert transformed.column('FinInstrmGnlAttrbts.Id')[1].as_py() == 'EZ0000000000'
+    assert transformed.column('a_count').to_pylist()[1:3] == [2, 2]
+    assert transformed.column('FinInstrmGnlAttrbts.CmmdtyDerivInd').type == 'bool'
+
+
+@pytest.mark.parametrize('asynchronous', [False, True])
+@pytest.mark.extract
+@pytest.mark.transform
+def test_run_streaming_failure(
+    asynchronous: bool,
+    tmp_path: Path,
+    http_server: 'StubHTTPServer',
+    firds_stream_url: str,
+) -> None:
+    """
+    Test run and arun methods discard the transformed file of a failed streaming extraction, and start over.
+    """
+    import asyncio
+
+    from etl_processor.exceptions import NetworkError
+    from etl_processor.extract import FIRDSExtractor
+    from etl_processor.transform import FIRDSTransformer
+
+    firds_extractor = FIRDSExtractor(
+        firds_url=firds_stream_url,
+        data_dir=tmp_path,
+        max_concurrency=1,
+        transformer=FIRDSTransformer(data_dir=tmp_path, chunk_size=3000),
+    )
+
+    def run() -> None:
+        if asynchronous:
+            asyncio.run(firds_extractor.arun())
+        else:
+            firds_extractor.run()
+
+    http_server.failures['/ID0000000003.zip'] = [(404, {})]
+    with pytest.raises(NetworkError):
+        run()
+
+    assert not (tmp_path / 'firds_transformed.csv').exists()
+    assert not list(tmp_path.glob('*.tmp'))
+
+    # the streaming extraction is not resumed, since the transformed rows of the failed extraction were discarded
+    run()
+    with (tmp_path / 'firds_transformed.csv').open(encoding='utf-8') as f:
+        ids = [line.split(',', 1)[0] for line in f]
+
+    assert len(ids) == 1 + 20002
+    assert ids[1] == 'ID0000000001'
+    assert ids[-1] == 'ID0000000003'
+
+
+@pytest.mark.extract
+@pytest.mark.transform
+def test_streaming_options(tmp_path: Path) -> None:
+    """
+    Test FIRDSExtractor rejects the unsupported options of the streaming transformation.
+    """
+    from etl_processor.extract import FIRDSExtractor
+    from etl_processor.transform import FIRDSTransformer
+
+    firds_transformer = FIRDSTransformer(data_dir=tmp_path)
+    options = {'firds_url': 'https://example.com', 'data_dir': tmp_path, 'transformer': firds_transformer}
+
+    with pytest.raises(ValueError, match='streaming transformation'):
+        FIRDSExtractor(firds_url='https://example.com', data_dir=tmp_path, raw_csv=False)
+
+    with pytest.raises(ValueError, match='single worker'):
+        FIRDSExtractor(**options, max_workers=2)
+
+    with pytest.raises(ValueError, match='csv output format'):
+        FIRDSExtractor(**options, output_format='parquet')
+
+    with pytest.raises(ValueError, match='partitioned'):
+        FIRDSExtractor(**options, partitioned=True)
+
+    with pytest.raises(ValueError, match='partitioned'):
+        FIRDSExtractor(**options | {'transformer': FIRDSTransformer(data_dir=tmp_path, partitioned=True)})
+
+    with pytest.raises(ValueError, match='incremental'):
+        FIRDSExtractor(**options, incremental=True)
+
+    with pytest.raises(ValueError, match='snapshot'):
+        FIRDSExtractor(**options, raw_csv=False, snapshot='memory')
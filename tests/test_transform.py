@@ -1,7 +1,11 @@
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import pytest
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 @pytest.mark.transform
 def test_init(firds_csv: Path) -> None:
@@ -67,3 +71,591 @@ async def test_arun(firds_csv: Path) -> None:
         assert 'a_count' in header
         assert 'contains_a' in header
         return
+
+
+@pytest.mark.parametrize('max_pending_chunks', [1, 3])
+@pytest.mark.transform
+def test_run_parallel(tmp_path: Path, firds_csv: Path, max_pending_chunks: int) -> None:
+    """
+    Test FIRDSTransformer run with worker processes writes the same transformed CSV as in-process.
+    """
+    from etl_processor.transform import FIRDSTransformer
+
+    # the rows of the firds csv are repeated with distinct identifiers, so any reordering of the chunks shows up
+    header, *rows = firds_csv.read_text().strip().splitlines()
+    (tmp_path / 'serial').mkdir()
+    (tmp_path / 'parallel').mkdir()
+    for data_dir in ('serial', 'parallel'):
+        with (tmp_path / data_dir / 'firds.csv').open('w') as f:
+            f.write(header + '\n')
+            for index in range(250):
+                for row in rows:
+                    f.write(row.replace('DE000A1R07V3', f'ID{index:010d}') + '\n')
+
+    FIRDSTransformer(data_dir=tmp_path / 'serial', chunk_size=7).run()
+    FIRDSTransformer(
+        data_dir=tmp_path / 'parallel',
+        chunk_size=7,
+        max_workers=2,
+        max_pending_chunks=max_pending_chunks,
+    ).run()
+
+    serial_csv = (tmp_path / 'serial' / 'firds_transformed.csv').read_text()
+    parallel_csv = (tmp_path / 'parallel' / 'firds_transformed.csv').read_text()
+    assert parallel_csv == serial_csv
+    assert len(parallel_csv.splitlines()) == 1001
+
+
+@pytest.mark.transform
+def test_parallel_options(tmp_path: Path) -> None:
+    """
+    Test FIRDSTransformer rejects invalid numbers of workers and pending chunks.
+    """
+    from etl_processor.transform import FIRDSTransformer
+
+    with pytest.raises(ValueError, match='workers'):
+        FIRDSTransformer(data_dir=tmp_path, max_workers=0)
+
+    with pytest.raises(ValueError, match='pending chunks'):
+        FIRDSTransformer(data_dir=tmp_path, max_workers=2, max_pending_chunks=0)
+
+    assert FIRDSTransformer(data_dir=tmp_path, max_workers=3).max_pending_chunks == 6
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 10**6])
+@pytest.mark.transform
+def test_run_pyarrow(tmp_path: Path, firds_csv: Path, chunk_size: int) -> None:
+    """
+    Test FIRDSTransformer run with the pyarrow engine writes the same transformed data as the pandas engine.
+    """
+    pytest.importorskip('pyarrow')
+
+    import shutil
+
+    import pandas as pd
+
+    from etl_processor.transform import FIRDSTransformer
+
+    shutil.copy(firds_csv, tmp_path / 'firds.csv')
+    FIRDSTransformer(data_dir=firds_csv.parent).run()
+    FIRDSTransformer(data_dir=tmp_path, chunk_size=chunk_size, engine='pyarrow').run()
+
+    expected = pd.read_csv(firds_csv.parent / 'firds_transformed.csv')
+    transformed = pd.read_csv(tmp_path / 'firds_transformed.csv')
+    pd.testing.assert_frame_equal(transformed, expected)
+
+
+@pytest.mark.transform
+def test_run_pyarrow_parquet(tmp_path: Path, firds_csv: Path) -> None:
+    """
+    Test FIRDSTransformer run with the pyarrow engine writes a Parquet file typed by the FIRDS model.
+    """
+    pa = pytest.importorskip('pyarrow')
+    pq = pytest.importorskip('pyarrow.parquet')
+
+    import shutil
+
+    from etl_processor.transform import FIRDSTransformer
+
+    shutil.copy(firds_csv, tmp_path / 'firds.csv')
+    FIRDSTransformer(data_dir=tmp_path, chunk_size=2, engine='pyarrow', output_format='parquet').run()
+
+    transformed_table = pq.read_table(tmp_path / 'firds_transformed.parquet')
+    schema = transformed_table.schema
+    assert pa.types.is_dictionary(schema.field('FinInstrmGnlAttrbts.NtnlCcy').type)
+    assert pa.types.is_dictionary(schema.field('FinInstrmGnlAttrbts.ClssfctnTp').type)
+    assert schema.field('FinInstrmGnlAttrbts.CmmdtyDerivInd').type == pa.bool_()
+    assert schema.field('a_count').type == pa.int64()
+    assert schema.field('contains_a').type == pa.bool_()
+    assert transformed_table.column('a_count').to_pylist() == [3, 0, 3, 3]
+    assert transformed_table.column('contains_a').to_pylist() == [True, False, True, True]
+
+
+@pytest.mark.transform
+def test_run_pyarrow_empty(tmp_path: Path, firds_csv: Path) -> None:
+    """
+    Test FIRDSTransformer run with the pyarrow engine writes the header of an empty FIRDS CSV.
+    """
+    pytest.importorskip('pyarrow')
+
+    import pandas as pd
+
+    from etl_processor.transform import FIRDSTransformer
+
+    (tmp_path / 'firds.csv').write_text(firds_csv.read_text().strip().splitlines()[0] + '\n')
+    FIRDSTransformer(data_dir=tmp_path, engine='pyarrow').run()
+
+    transformed = pd.read_csv(tmp_path / 'firds_transformed.csv')
+    assert transformed.empty
+    assert list(transformed.columns[-2:]) == ['a_count', 'contains_a']
+
+
+@pytest.mark.transform
+def test_engine_options(tmp_path: Path) -> None:
+    """
+    Test FIRDSTransformer rejects the unsupported combinations of the engines and the output formats.
+    """
+    from etl_processor.transform import FIRDSTransformer
+
+    with pytest.raises(ValueError, match='engine'):
+        FIRDSTransformer(data_dir=tmp_path, engine='polars')  # type: ignore[arg-type]
+
+    with pytest.raises(ValueError, match='output format'):
+        FIRDSTransformer(data_dir=tmp_path, output_format='orc')  # type: ignore[arg-type]
+
+    with pytest.raises(ValueError, match='pyarrow engine'):
+        FIRDSTransformer(data_dir=tmp_path, output_format='parquet')
+
+    with pytest.raises(ValueError, match='pandas engine'):
+        FIRDSTransformer(data_dir=tmp_path, engine='pyarrow', max_workers=2)
+
+
+@pytest.mark.parametrize('engine', ['pandas', 'pyarrow'])
+@pytest.mark.transform
+def test_run_substrings(tmp_path: Path, firds_csv: Path, engine: str) -> None:
+    """
+    Test FIRDSTransformer run derives the count and presence columns of every substring.
+    """
+    if engine == 'pyarrow':
+        pytest.importorskip('pyarrow')
+
+    import shutil
+
+    import pandas as pd
+
+    from etl_processor.transform import FIRDSTransformer
+
+    shutil.copy(firds_csv, tmp_path / 'firds.csv')
+    firds_transformer = FIRDSTransformer(
+        data_dir=tmp_path,
+        engine=engine,  # type: ignore[arg-type]
+        substrings={'a': 'a', 'an': 'an', 'space': ' ', 'year': '(2021)'},
+    )
+    assert firds_transformer.derived_columns == [
+        'a_count',
+        'contains_a',
+        'an_count',
+        'contains_an',
+        'space_count',
+        'contains_space',
+        'year_count',
+        'contains_year',
+    ]
+    firds_transformer.run()
+
+    transformed = pd.read_csv(tmp_path / 'firds_transformed.csv')
+    assert list(transformed.columns[-8:]) == firds_transformer.derived_columns
+    assert transformed['a_count'].tolist() == [3, 0, 3, 3]
+    assert transformed['an_count'].tolist() == [1, 0, 1, 1]
+    assert transformed['space_count'].tolist() == [6, 3, 2, 2]
+    assert transformed['contains_year'].tolist() == [True, False, True, True]
+
+
+@pytest.mark.transform
+def test_substrings_options(tmp_path: Path) -> None:
+    """
+    Test FIRDSTransformer rejects empty substrings.
+    """
+    from etl_processor.transform import FIRDSTransformer
+
+    with pytest.raises(ValueError, match='substrings'):
+        FIRDSTransformer(data_dir=tmp_path, substrings={})
+
+    with pytest.raises(ValueError, match='substrings'):
+        FIRDSTransformer(data_dir=tmp_path, substrings={'empty': ''})
+
+
+def _is_kfw(full_name: 'pd.Series') -> 'pd.Series':
+    return full_name.str.startswith('KFW')
+
+
+def _is_not_kfw(full_name: 'pd.Series') -> 'pd.Series':
+    return ~full_name.str.startswith('KFW')
+
+
+def _name_length(full_name: 'pd.Series') -> 'pd.Series':
+    return full_name.str.len()
+
+
+@pytest.mark.parametrize(
+    ('engine', 'max_workers'),
+    [('pandas', 1), ('pandas', 2), ('pyarrow', 1)],
+)
+@pytest.mark.transform
+def test_run_pipeline(tmp_path: Path, firds_csv: Path, engine: str, max_workers: int) -> None:
+    """
+    Test FIRDSTransformer run applies a declarative pipeline of derivations, filters and projections.
+    """
+    if engine == 'pyarrow':
+        pytest.importorskip('pyarrow')
+
+    import shutil
+
+    import pandas as pd
+
+    from etl_processor.pipeline import Derive, Filter, Select, SubstringCounts, TransformPipeline
+    from etl_processor.transform import FIRDSTransformer
+
+    shutil.copy(firds_csv, tmp_path / 'firds.csv')
+    firds_transformer = FIRDSTransformer(
+        data_dir=tmp_path,
+        chunk_size=2,
+        engine=engine,  # type: ignore[arg-type]
+        max_workers=max_workers,
+        pipeline=TransformPipeline(
+            [
+                SubstringCounts(substrings={'a': 'a', 'space': ' '}),
+                Derive('name_length', ['FinInstrmGnlAttrbts.FullNm'], _name_length),
+                Filter(['FinInstrmGnlAttrbts.FullNm'], _is_not_kfw),
+                Select(['FinInstrmGnlAttrbts.Id', 'name_length', 'a_count']),
+            ],
+        ),
+    )
+    assert firds_transformer.derived_columns == [
+        'a_count',
+        'contains_a',
+        'space_count',
+        'contains_space',
+        'name_length',
+    ]
+    firds_transformer.run()
+
+    transformed = pd.read_csv(tmp_path / 'firds_transformed.csv')
+    assert transformed.columns.tolist() == ['FinInstrmGnlAttrbts.Id', 'name_length', 'a_count']
+    assert transformed['name_length'].tolist() == [47, 43, 43]
+    assert transformed['a_count'].tolist() == [3, 3, 3]
+
+
+@pytest.mark.transform
+def test_run_pipeline_empty_chunks(tmp_path: Path, firds_csv: Path) -> None:
+    """
+    Test FIRDSTransformer run writes the header of the transformed data if the filters drop the first chunk.
+    """
+    import shutil
+
+    import pandas as pd
+
+    from etl_processor.pipeline import Filter, TransformPipeline
+    from etl_processor.transform import FIRDSTransformer
+
+    shutil.copy(firds_csv, tmp_path / 'firds.csv')
+    FIRDSTransformer(
+        data_dir=tmp_path,
+        chunk_size=1,
+        pipeline=TransformPipeline([Filter(['FinInstrmGnlAttrbts.FullNm'], _is_kfw)]),
+    ).run()
+
+    transformed = pd.read_csv(tmp_path / 'firds_transformed.csv')
+    assert transformed.columns.tolist() == pd.read_csv(firds_csv, nrows=0).columns.tolist()
+    assert transformed['FinInstrmGnlAttrbts.FullNm'].tolist() == ['KFW 1 5/8 01/15/21']
+
+
+@pytest.mark.transform
+def test_pipeline_options(tmp_path: Path, firds_csv: Path) -> None:
+    """
+    Test FIRDSTransformer rejects the substrings of a custom pipeline and the pipelines reading unknown columns.
+    """
+    import shutil
+
+    from etl_processor.exceptions import TransformationError
+    from etl_processor.pipeline import Select, TransformPipeline
+    from etl_processor.transform import FIRDSTransformer
+
+    with pytest.raises(ValueError, match='default pipeline'):
+        FIRDSTransformer(data_dir=tmp_path, substrings={'a': 'a'}, pipeline=TransformPipeline([]))
+
+    shutil.copy(firds_csv, tmp_path / 'firds.csv')
+    firds_transformer = FIRDSTransformer(data_dir=tmp_path, pipeline=TransformPipeline([Select(['unknown'])]))
+    with pytest.raises(TransformationError):
+        firds_transformer.run()
+
+
+@pytest.mark.transform
+def test_open_writer(tmp_path: Path, firds_csv: Path) -> None:
+    """
+    Test FIRDSTransformer open_writer transforms the FIRDS records in memory like the FIRDS CSV, and moves the
+    transformed file in place on close only.
+    """
+    import csv
+
+    from etl_processor.transform import FIRDSTransformer
+
+    # the rows of the firds csv, with the flags validated as booleans
+    with firds_csv.open(encoding='utf-8') as f:
+        header, *rows = (
+            [value == 'True' if value in ('True', 'False') else value for value in row] for row in csv.reader(f) if row
+        )
+    FIRDSTransformer(data_dir=firds_csv.parent, chunk_size=3).run()
+
+    firds_transformer = FIRDSTransformer(data_dir=tmp_path, chunk_size=3)
+    with firds_transformer.open_writer() as writer:
+        writer.writerows(rows[:2])
+        writer.writerow(dict(zip(header, rows[2], strict=True)))
+        writer.writerows(rows[3:])
+        assert not (tmp_path / 'firds_transformed.csv').exists()
+
+    transformed_csv = (tmp_path / 'firds_transformed.csv').read_text(encoding='utf-8')
+    assert transformed_csv == (firds_csv.parent / 'firds_transformed.csv').read_text(encoding='utf-8')
+
+    # an empty transformation writes the header
+    with firds_transformer.open_writer():
+        pass
+
+    assert (tmp_path / 'firds_transformed.csv').read_text(encoding='utf-8').splitlines() == [
+        ','.join([*header, 'a_count', 'contains_a']),
+    ]
+
+
+@pytest.mark.parametrize('engine', ['pandas', 'pyarrow'])
+@pytest.mark.transform
+def test_run_incremental(tmp_path: Path, firds_csv: Path, engine: str) -> None:
+    """
+    Test FIRDSTransformer run transforms and appends only the rows appended to the FIRDS CSV since the watermark,
+    and transforms all rows of a rewritten FIRDS CSV.
+    """
+    if engine == 'pyarrow':
+        pytest.importorskip('pyarrow')
+
+    from etl_processor.models import FIRDSWatermark
+    from etl_processor.transform import FIRDSTransformer
+
+    # the firds csv without the leading blank line, so its rows and the appended rows are the same
+    header, *rows = firds_csv.read_text(encoding='utf-8').strip().splitlines()
+    firds_csv_path = tmp_path / 'incremental' / 'firds.csv'
+    firds_csv_path.parent.mkdir()
+    firds_csv_path.write_text('\n'.join([header, *rows[:2]]) + '\n', encoding='utf-8')
+
+    firds_transformer = FIRDSTransformer(data_dir=firds_csv_path.parent, chunk_size=1, engine=engine, incremental=True)
+    firds_transformer.run()
+
+    watermark = FIRDSWatermark.model_validate_json(firds_transformer.watermark_path.read_bytes())
+    assert watermark.row_count == 2
+    assert watermark.byte_offset == firds_csv_path.stat().st_size
+
+    # the transformed rows before the watermark are not transformed again
+    transformed_csv_path = firds_csv_path.parent / 'firds_transformed.csv'
+    transformed_head = transformed_csv_path.read_bytes()
+    with firds_csv_path.open('a', encoding='utf-8') as f:
+        f.write('\n'.join(rows[2:]) + '\n')
+
+    firds_transformer.run()
+    assert transformed_csv_path.read_bytes().startswith(transformed_head)
+    assert FIRDSWatermark.model_validate_json(firds_transformer.watermark_path.read_bytes()).row_count == 4
+
+    # the incremental transformation matches the transformation of all rows
+    full_csv_path = tmp_path / 'full' / 'firds.csv'
+    full_csv_path.parent.mkdir()
+    full_csv_path.write_bytes(firds_csv_path.read_bytes())
+    FIRDSTransformer(data_dir=full_csv_path.parent, engine=engine).run()
+    assert transformed_csv_path.read_bytes() == (full_csv_path.parent / 'firds_transformed.csv').read_bytes()
+
+    # no rows appended
+    firds_transformer.run()
+    assert transformed_csv_path.read_bytes() == (full_csv_path.parent / 'firds_transformed.csv').read_bytes()
+
+    # the rewritten firds csv is transformed in full
+    firds_csv_path.write_text('\n'.join([header, rows[1], rows[1], rows[1], rows[1], rows[0]]) + '\n', encoding='utf-8')
+    firds_transformer.run()
+
+    transformed_lines = transformed_csv_path.read_text(encoding='utf-8').splitlines()
+    assert len(transformed_lines) == 1 + 5
+    assert transformed_lines[1] == transformed_lines[4]
+    assert FIRDSWatermark.model_validate_json(firds_transformer.watermark_path.read_bytes()).row_count == 5
+
+
+@pytest.mark.parametrize('engine', ['pandas', 'pyarrow'])
+@pytest.mark.transform
+def test_run_incremental_appending(tmp_path: Path, firds_csv: Path, engine: str) -> None:
+    """
+    Test FIRDSTransformer run leaves the rows appended to the FIRDS CSV during the transformation,
+    and a half-written last row, to the next transformation.
+    """
+    if engine == 'pyarrow':
+        pytest.importorskip('pyarrow')
+
+    from etl_processor.models import FIRDSWatermark
+    from etl_processor.pipeline import Derive, TransformPipeline
+    from etl_processor.transform import FIRDSTransformer
+
+    header, *rows = firds_csv.read_text(encoding='utf-8').strip().splitlines()
+    rows = [row.replace('DE000A1R07V3', f'ID{index}') for index, row in enumerate(rows)]
+    firds_csv_path = tmp_path / 'firds.csv'
+    firds_csv_path.write_text('\n'.join([header, *rows[:2]]) + '\n' + rows[2][:10], encoding='utf-8')
+
+    # the row appended while the first chunk is transformed, after the size of the firds csv was taken
+    def name_length(full_name: 'pd.Series') -> 'pd.Series':
+        if not appended:
+            appended.append(True)
+            with firds_csv_path.open('a', encoding='utf-8') as f:
+                f.write(rows[2][10:] + '\n')
+
+        return full_name.str.len()
+
+    appended: list[bool] = []
+    firds_transformer = FIRDSTransformer(
+        data_dir=tmp_path,
+        chunk_size=1,
+        engine=engine,
+        pipeline=TransformPipeline([Derive('name_length', ['FinInstrmGnlAttrbts.FullNm'], name_length)]),
+        incremental=True,
+    )
+    firds_transformer.run()
+
+    def transformed_ids() -> list[str]:
+        with (tmp_path / 'firds_transformed.csv').open(encoding='utf-8') as f:
+            return [line.split(',', 1)[0].strip('"') for line in f][1:]
+
+    assert transformed_ids() == ['ID0', 'ID1']
+    assert FIRDSWatermark.model_validate_json(firds_transformer.watermark_path.read_bytes()).row_count == 2
+
+    with firds_csv_path.open('a', encoding='utf-8') as f:
+        f.write(rows[3] + '\n')
+
+    firds_transformer.run()
+    assert transformed_ids() == ['ID0', 'ID1', 'ID2', 'ID3']
+    assert FIRDSWatermark.model_validate_json(firds_transformer.watermark_path.read_bytes()).row_count == 4
+
+
+@pytest.mark.transform
+def test_incremental_options(tmp_path: Path, firds_csv: Path) -> None:
+    """
+    Test FIRDSTransformer rejects the unsupported options of the incremental transformation,
+    and the transformation of all rows discards the watermark.
+    """
+    from etl_processor.transform import FIRDSTransformer
+
+    with pytest.raises(ValueError, match='csv output format'):
+        FIRDSTransformer(data_dir=tmp_path, output_format='parquet', incremental=True)
+
+    with pytest.raises(ValueError, match='partitioned'):
+        FIRDSTransformer(data_dir=tmp_path, partitioned=True, incremental=True)
+
+    data_dir = tmp_path / 'data'
+    data_dir.mkdir()
+    (data_dir / 'firds.csv').write_bytes(firds_csv.read_bytes())
+
+    firds_transformer = FIRDSTransformer(data_dir=data_dir, incremental=True)
+    firds_transformer.run()
+    assert firds_transformer.watermark_path.exists()
+
+    FIRDSTransformer(data_dir=data_dir).run()
+    assert not firds_transformer.watermark_path.exists()
+
+    # an invalid watermark is discarded
+    firds_transformer.watermark_path.write_text('{}', encoding='utf-8')
+    firds_transformer.run()
+    assert len((data_dir / 'firds_transformed.csv').read_text(encoding='utf-8').splitlines()) == 1 + 4
+
+
+@pytest.mark.transform
+def test_chunk_sizer() -> None:
+    """
+    Test ChunkSizer sizes the chunks from the bytes per row measured for the previous chunks,
+    and reports the peak memory of the chunks held in memory at once.
+    """
+    from etl_processor.transform import ChunkSizer
+
+    # without a memory budget, the chunks have the maximum size and their memory is not measured
+    chunk_sizer = ChunkSizer(max_chunk_size=100)
+    assert chunk_sizer.measure('FinInstrmGnlAttrbts.FullNm') is None
+
+    chunk_sizer.observe(100)
+    assert chunk_sizer.chunk_size == 100
+    assert chunk_sizer.peak_memory is None
+
+    # the first chunk is sized for 1 KiB per row, and the next chunks for the measured bytes per row
+    chunk_sizer = ChunkSizer(max_chunk_size=10**6, memory_budget=1024**2, max_pending_chunks=2)
+    assert chunk_sizer.chunk_size == 512
+
+    chunk_sizer.observe(512, 512 * 256)
+    assert chunk_sizer.chunk_size == 2048
+
+    # the larger rows of the last chunk shrink the next chunk at once
+    chunk_sizer.observe(2048, 2048 * 1024)
+    assert chunk_sizer.chunk_size == 512
+
+    # the smaller rows of the last chunk grow the next chunk by the bytes per row of all chunks
+    chunk_sizer.observe(512, 512 * 128)
+    assert chunk_sizer.chunk_size == 1024 * 1024 // (2 * (512 * 256 + 2048 * 1024 + 512 * 128) // 3072)
+
+    assert [chunk.row_count for chunk in chunk_sizer.chunks] == [512, 2048, 512]
+    assert chunk_sizer.peak_memory == 512 * 256 + 2048 * 1024
+
+    # the maximum chunk size bounds the chunks
+    chunk_sizer = ChunkSizer(max_chunk_size=10, memory_budget=1024**2)
+    assert chunk_sizer.chunk_size == 10
+
+    with pytest.raises(ValueError, match='memory budget'):
+        ChunkSizer(memory_budget=0)
+
+
+@pytest.mark.parametrize(
+    ('engine', 'max_workers'),
+    [('pandas', 1), ('pandas', 2), ('pyarrow', 1)],
+)
+@pytest.mark.transform
+def test_run_memory_budget(tmp_path: Path, firds_csv: Path, engine: str, max_workers: int) -> None:
+    """
+    Test FIRDSTransformer run sizes the chunks adaptively within a memory budget,
+    shrinking them for the rows with longer full names, like the transformation of fixed chunks.
+    """
+    if engine == 'pyarrow':
+        pytest.importorskip('pyarrow')
+
+    from etl_processor.transform import FIRDSTransformer
+
+    # the rows with short full names are followed by the rows with long full names
+    header, row, *_ = firds_csv.read_text(encoding='utf-8').strip().splitlines()
+    long_row = row.replace('Kreditanst.f.Wiederaufbau', 'Kreditanst.f.Wiederaufbau' * 80)
+    for data_dir in ('budget', 'fixed'):
+        (tmp_path / data_dir).mkdir()
+        (tmp_path / data_dir / 'firds.csv').write_text(
+            '\n'.join([header, *[row] * 20000, *[long_row] * 5000]) + '\n',
+            encoding='utf-8',
+        )
+
+    memory_budget = 1024**2
+    firds_transformer = FIRDSTransformer(
+        data_dir=tmp_path / 'budget',
+        engine=engine,
+        max_workers=max_workers,
+        memory_budget=memory_budget,
+    )
+    firds_transformer.run()
+    FIRDSTransformer(data_dir=tmp_path / 'fixed', engine=engine).run()
+
+    transformed_csv = (tmp_path / 'budget' / 'firds_transformed.csv').read_bytes()
+    assert transformed_csv == (tmp_path / 'fixed' / 'firds_transformed.csv').read_bytes()
+
+    chunks = firds_transformer.chunk_sizer.chunks
+    assert sum(chunk.row_count for chunk in chunks) == 25000
+    assert all(chunk.memory for chunk in chunks)
+
+    # the chunks of long full names are smaller, and they fit in the budget once their rows are measured
+    assert chunks[-1].row_count < max(chunk.row_count for chunk in chunks)
+    assert firds_transformer.chunk_sizer.peak_memory is not None
+    max_pending_chunks = firds_transformer.chunk_sizer.max_pending_chunks
+    assert sum(chunk.memory or 0 for chunk in chunks[-max_pending_chunks:]) <= memory_budget
+
+
+@pytest.mark.transform
+def test_memory_budget_options(tmp_path: Path, firds_csv: Path) -> None:
+    """
+    Test FIRDSTransformer rejects an empty memory budget, and the chunks of a streaming transformation are recorded.
+    """
+    import csv
+
+    from etl_processor.transform import FIRDSTransformer
+
+    with pytest.raises(ValueError, match='memory budget'):
+        FIRDSTransformer(data_dir=tmp_path, memory_budget=0)
+
+    with firds_csv.open(encoding='utf-8') as f:
+        _, *rows = (row for row in csv.reader(f) if row)
+
+    firds_transformer = FIRDSTransformer(data_dir=tmp_path, memory_budget=1024**2)
+    with firds_transformer.open_writer() as writer:
+        writer.writerows(rows)
+
+    assert [chunk.row_count for chunk in firds_transformer.chunk_sizer.chunks] == [4]
+    assert firds_transformer.chunk_sizer.peak_memory